@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import AggregationWatermark, DailyActivity, GoalTypeSnapshot, PlanAdoption, ExercisePopularity
+# Register your models here.
+
+admin.site.register(AggregationWatermark)
+admin.site.register(DailyActivity)
+admin.site.register(GoalTypeSnapshot)
+admin.site.register(PlanAdoption)
+admin.site.register(ExercisePopularity)
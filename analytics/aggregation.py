@@ -0,0 +1,205 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from users.models import FitnessGoal
+from workout_sessions.models import WorkoutSession, SetLog
+from .models import AggregationWatermark, UserActiveDay, DailyActivity, GoalTypeSnapshot, PlanAdoption, ExercisePopularity
+
+CHUNK_SIZE = 5000
+
+# Rows younger than this are left for the next run, so an ingest transaction that took an id
+# but has not committed yet can't be skipped by a watermark that moved past it
+SETTLE_DELAY = timedelta(minutes=2)
+
+
+def _day(moment):
+    return timezone.localtime(moment).date()
+
+
+def _merge(model, key_fields, buckets):
+    """
+    Add {key tuple: {field: amount}} onto the rollup rows: one SELECT for the existing rows,
+    then bulk_update and bulk_create. Callers hold the watermark lock, so nothing else writes the rollups meanwhile.
+    """
+    if not buckets:
+        return
+
+    lookup = {f"{field}__in": {key[index] for key in buckets} for index, field in enumerate(key_fields)}
+    existing = {
+        tuple(getattr(row, field) for field in key_fields): row
+        for row in model.objects.filter(**lookup)
+    }
+
+    fields = sorted({field for amounts in buckets.values() for field in amounts})
+    changed, created = [], []
+    for key, amounts in buckets.items():
+        row = existing.get(key)
+        if row is None:
+            created.append(model(**dict(zip(key_fields, key)), **amounts))
+            continue
+        for field, amount in amounts.items():
+            setattr(row, field, getattr(row, field) + amount)
+        changed.append(row)
+
+    model.objects.bulk_update(changed, fields, batch_size=CHUNK_SIZE)
+    model.objects.bulk_create(created, batch_size=CHUNK_SIZE)
+
+
+def _mark_active(user_days):
+    """
+    Record (user_id, day) pairs and refresh the distinct active user count of the touched days.
+    """
+    if not user_days:
+        return
+    UserActiveDay.objects.bulk_create(
+        [UserActiveDay(user_id=user_id, day=day) for user_id, day in user_days],
+        ignore_conflicts=True,
+        batch_size=CHUNK_SIZE,
+    )
+    days = {day for _, day in user_days}
+    counts = dict(UserActiveDay.objects.filter(day__in=days).values('day').annotate(total=Count('id')).values_list('day', 'total'))
+    # The activity of the chunk was merged just before, so every touched day has its row
+    rows = list(DailyActivity.objects.filter(day__in=days))
+    for row in rows:
+        row.active_users = counts.get(row.day, 0)
+    DailyActivity.objects.bulk_update(rows, ['active_users'])
+
+
+def _settled_max_id(model):
+    return model.objects.filter(created_at__lt=timezone.now() - SETTLE_DELAY).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def _fold_set_logs(rows):
+    days, exercises, user_days = defaultdict(lambda: defaultdict(int)), defaultdict(lambda: defaultdict(int)), set()
+    for user_id, exercise_id, performed_at, repetitions, weight in rows:
+        day = _day(performed_at)
+        volume = Decimal(weight) * repetitions
+        for amounts in (days[(day,)], exercises[(exercise_id, day)]):
+            amounts['sets'] += 1
+            amounts['repetitions'] += repetitions
+            amounts['volume'] += volume
+        user_days.add((user_id, day))
+    return days, exercises, user_days
+
+
+def _fold_sessions(rows, last_id):
+    days, plans, user_days = defaultdict(lambda: defaultdict(int)), defaultdict(lambda: defaultdict(int)), set()
+
+    pairs = {(plan_id, user_id) for _, user_id, plan_id, _ in rows if plan_id}
+    seen = set(
+        WorkoutSession.objects.filter(
+            id__lte=last_id,
+            workout_plan_id__in={plan_id for plan_id, _ in pairs},
+            user_id__in={user_id for _, user_id in pairs},
+        ).values_list('workout_plan_id', 'user_id').distinct()
+    ) if pairs else set()
+
+    for _, user_id, plan_id, started_at in rows:
+        day = _day(started_at)
+        days[(day,)]['sessions'] += 1
+        user_days.add((user_id, day))
+        if plan_id:
+            plans[(plan_id, day)]['sessions'] += 1
+            # Rows come in id order, the first session of the pair is the adoption
+            if (plan_id, user_id) not in seen:
+                seen.add((plan_id, user_id))
+                plans[(plan_id, day)]['new_users'] += 1
+    return days, plans, user_days
+
+
+def _advance(name, fetch, fold):
+    """
+    Fold the source rows past the watermark into the rollups, chunk by chunk. Each chunk and
+    its watermark move are one transaction, so a crash or a second concurrent run
+    (it waits on the watermark row) never counts a row twice.
+    """
+    AggregationWatermark.objects.get_or_create(name=name)
+    processed = 0
+    while True:
+        with transaction.atomic():
+            watermark = AggregationWatermark.objects.select_for_update().get(name=name)
+            rows = fetch(watermark.last_id)
+            if not rows:
+                return processed
+            fold(rows, watermark.last_id)
+            watermark.last_id = rows[-1][0]
+            watermark.save(update_fields=['last_id', 'updated_at'])
+        processed += len(rows)
+
+
+def aggregate_set_logs():
+    upper = _settled_max_id(SetLog)
+
+    def fetch(last_id):
+        return list(
+            SetLog.objects.filter(id__gt=last_id, id__lte=upper).order_by('id')
+            .values_list('id', 'user_id', 'exercise_id', 'performed_at', 'repetitions', 'weight')[:CHUNK_SIZE]
+        )
+
+    def fold(rows, last_id):
+        days, exercises, user_days = _fold_set_logs([row[1:] for row in rows])
+        _merge(DailyActivity, ['day'], days)
+        _merge(ExercisePopularity, ['exercise_id', 'day'], exercises)
+        _mark_active(user_days)
+
+    return _advance('set_logs', fetch, fold)
+
+
+def aggregate_sessions():
+    upper = _settled_max_id(WorkoutSession)
+
+    def fetch(last_id):
+        return list(
+            WorkoutSession.objects.filter(id__gt=last_id, id__lte=upper).order_by('id')
+            .values_list('id', 'user_id', 'workout_plan_id', 'started_at')[:CHUNK_SIZE]
+        )
+
+    def fold(rows, last_id):
+        days, plans, user_days = _fold_sessions(rows, last_id)
+        _merge(DailyActivity, ['day'], days)
+        _merge(PlanAdoption, ['workout_plan_id', 'day'], plans)
+        _mark_active(user_days)
+
+    return _advance('workout_sessions', fetch, fold)
+
+
+@transaction.atomic
+def snapshot_goal_types(day=None, force=False):
+    """
+    Daily distribution of active goals. Taken once per day, a second run the same day is a no-op unless forced.
+    """
+    day = day or timezone.localdate()
+    if not force and GoalTypeSnapshot.objects.filter(day=day).exists():
+        return False
+
+    rows = (
+        FitnessGoal.objects.filter(is_active=True)
+        .values('goal_type')
+        .annotate(active_goals=Count('id'), users=Count('user', distinct=True))
+    )
+    GoalTypeSnapshot.objects.filter(day=day).delete()
+    GoalTypeSnapshot.objects.bulk_create([GoalTypeSnapshot(day=day, **row) for row in rows])
+    return True
+
+
+def run():
+    """
+    One pass of the aggregation job, safe to run as often as wanted.
+    """
+    return {
+        "set_logs": aggregate_set_logs(),
+        "workout_sessions": aggregate_sessions(),
+        "goal_snapshot": snapshot_goal_types(),
+    }
+
+
+@transaction.atomic
+def reset():
+    """
+    Empty the rollups and watermarks so the next run rebuilds them from scratch.
+    """
+    for model in (UserActiveDay, DailyActivity, GoalTypeSnapshot, PlanAdoption, ExercisePopularity, AggregationWatermark):
+        model.objects.all().delete()
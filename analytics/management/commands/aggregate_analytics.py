@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from analytics import aggregation
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold the workout sessions and sets logged since the last run into the trainer analytics rollups "
+        "and take the daily goal type snapshot. Idempotent: schedule it every few minutes, the nightly run "
+        "is the first one after midnight. --rebuild starts over from an empty rollup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Drop the rollups and watermarks and aggregate everything again.")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            aggregation.reset()
+
+        result = aggregation.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"Aggregated {result['set_logs']} sets and {result['workout_sessions']} sessions, "
+            f"goal snapshot {'taken' if result['goal_snapshot'] else 'already taken today'}."
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from analytics.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Export users and logged sets into a new columnar snapshot (memory-mapped NumPy arrays) "
+        "and switch the query API over to it. Schedule it periodically, e.g. hourly or nightly."
+    )
+
+    def handle(self, *args, **options):
+        version = build_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Analytics snapshot {version} is live."))
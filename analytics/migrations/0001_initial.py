@@ -0,0 +1,97 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('exercises', '0003_exercise_updated_at_and_more'),
+        ('workout_management', '0007_workoutexercise_updated_at_alter_workoutplan_tags_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AggregationWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('active_users', models.PositiveIntegerField(default=0)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('sets', models.PositiveIntegerField(default=0)),
+                ('repetitions', models.PositiveBigIntegerField(default=0)),
+                ('volume', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily Activity',
+            },
+        ),
+        migrations.CreateModel(
+            name='GoalTypeSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('goal_type', models.CharField(choices=[('Weight Loss', 'Weight Loss'), ('Strength Building', 'Strength Building'), ('Cardiovascular Fitness', 'Cardiovascular Fitness'), ('Flexibility', 'Flexibility'), ('BodyBuilding', 'BodyBuilding')], max_length=35)),
+                ('active_goals', models.PositiveIntegerField(default=0)),
+                ('users', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'goal_type'), name='unique_goal_type_snapshot')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExercisePopularity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('sets', models.PositiveIntegerField(default=0)),
+                ('repetitions', models.PositiveBigIntegerField(default=0)),
+                ('volume', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='popularity', to='exercises.exercise')),
+            ],
+            options={
+                'verbose_name_plural': 'Exercise Popularity',
+                'indexes': [models.Index(fields=['day'], name='analytics_e_day_d069e6_idx')],
+                'constraints': [models.UniqueConstraint(fields=('exercise', 'day'), name='unique_exercise_popularity_day')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlanAdoption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('new_users', models.PositiveIntegerField(default=0)),
+                ('workout_plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adoption', to='workout_management.workoutplan')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='analytics_p_day_ee6080_idx')],
+                'constraints': [models.UniqueConstraint(fields=('workout_plan', 'day'), name='unique_plan_adoption_day')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserActiveDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='active_days', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'user'), name='unique_user_active_day')],
+            },
+        ),
+    ]
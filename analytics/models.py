@@ -0,0 +1,98 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from users.models import User, FitnessGoal
+from exercises.models import Exercise
+from workout_management.models import WorkoutPlan
+
+
+class AggregationWatermark(models.Model):
+    """
+    Last source row id folded into the rollups, one row per source table.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_id}"
+
+
+class UserActiveDay(models.Model):
+    """
+    One row per user and day with any logged activity, used to count distinct daily active users incrementally.
+    """
+    day = models.DateField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='active_days')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'user'], name='unique_user_active_day'),
+        ]
+
+
+class DailyActivity(models.Model):
+    day = models.DateField(unique=True)
+    active_users = models.PositiveIntegerField(default=0)
+    sessions = models.PositiveIntegerField(default=0)
+    sets = models.PositiveIntegerField(default=0)
+    repetitions = models.PositiveBigIntegerField(default=0)
+    volume = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name_plural = _("Daily Activity")
+
+    def __str__(self):
+        return f"{self.day}: {self.active_users} active users"
+
+
+class GoalTypeSnapshot(models.Model):
+    """
+    Distribution of active fitness goals, snapshotted once a day.
+    """
+    day = models.DateField()
+    goal_type = models.CharField(max_length=35, choices=FitnessGoal.GOAL_CHOICES)
+    active_goals = models.PositiveIntegerField(default=0)
+    users = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'goal_type'], name='unique_goal_type_snapshot'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.goal_type}: {self.active_goals}"
+
+
+class PlanAdoption(models.Model):
+    """
+    Sessions logged against a workout plan per day, and how many users used the plan for the first time that day.
+    """
+    workout_plan = models.ForeignKey(WorkoutPlan, on_delete=models.CASCADE, related_name='adoption')
+    day = models.DateField()
+    sessions = models.PositiveIntegerField(default=0)
+    new_users = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['workout_plan', 'day'], name='unique_plan_adoption_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+
+class ExercisePopularity(models.Model):
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='popularity')
+    day = models.DateField()
+    sets = models.PositiveIntegerField(default=0)
+    repetitions = models.PositiveBigIntegerField(default=0)
+    volume = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name_plural = _("Exercise Popularity")
+        constraints = [
+            models.UniqueConstraint(fields=['exercise', 'day'], name='unique_exercise_popularity_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
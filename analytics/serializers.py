@@ -0,0 +1,34 @@
+from rest_framework import serializers
+from .snapshot import TABLES, AGGREGATES
+
+
+class SnapshotQuerySerializer(serializers.Serializer):
+    """
+    Body of an ad-hoc query against the columnar snapshot.
+    """
+    table = serializers.ChoiceField(choices=list(TABLES))
+    filters = serializers.DictField(child=serializers.JSONField(), required=False, default=dict)
+    group_by = serializers.ListField(child=serializers.CharField(), required=False, default=list, max_length=4)
+    aggregates = serializers.ListField(
+        child=serializers.ListField(child=serializers.CharField(allow_null=True), min_length=1, max_length=2),
+        required=False, default=list, max_length=10,
+        help_text="Pairs like ['sum', 'volume'], or ['count']."
+    )
+    since = serializers.DateField(required=False, allow_null=True, default=None)
+    until = serializers.DateField(required=False, allow_null=True, default=None)
+
+    def validate_aggregates(self, aggregates):
+        pairs = []
+        for aggregate in aggregates:
+            function, column = aggregate[0], aggregate[1] if len(aggregate) > 1 else None
+            if function not in AGGREGATES:
+                raise serializers.ValidationError(f"Unknown aggregate '{function}'. Choose one of: {', '.join(AGGREGATES)}.")
+            pairs.append([function, column])
+        return pairs
+
+    def validate_filters(self, filters):
+        for column, values in filters.items():
+            values = values if isinstance(values, list) else [values]
+            if not all(isinstance(value, str) for value in values):
+                raise serializers.ValidationError(f"Values of '{column}' must be strings.")
+        return filters
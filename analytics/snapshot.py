@@ -0,0 +1,373 @@
+import json
+import os
+import shutil
+import threading
+import uuid
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from users.models import User, FitnessGoal
+from workout_sessions.models import SetLog
+
+CHUNK_SIZE = 20000
+
+# The previous version stays on disk for workers that read CURRENT just before the switch
+KEEP_VERSIONS = 2
+
+MISSING = 'unknown'
+
+AGE_BANDS = ((18, '<18'), (25, '18-24'), (35, '25-34'), (45, '35-44'), (55, '45-54'), (65, '55-64'), (None, '65+'))
+
+# table -> column -> 'category' (dictionary encoded) or 'measure'
+TABLES = {
+    'users': {
+        'gender': 'category',
+        'age_band': 'category',
+        'goal_type': 'category',
+        'weight': 'measure',
+        'height': 'measure',
+    },
+    'sets': {
+        'gender': 'category',
+        'age_band': 'category',
+        'goal_type': 'category',
+        'difficulty_level': 'category',
+        'muscle_group': 'category',
+        'category': 'category',
+        'day': 'measure',
+        'repetitions': 'measure',
+        'weight': 'measure',
+        'volume': 'measure',
+    },
+}
+
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class SnapshotMissing(SnapshotError):
+    pass
+
+
+def age_band(date_of_birth, today):
+    if date_of_birth is None:
+        return MISSING
+    age = today.year - date_of_birth.year - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+    for upper, label in AGE_BANDS:
+        if upper is None or age < upper:
+            return label
+
+
+class Dictionary:
+    """
+    Value <-> code mapping of a categorical column, codes are assigned in order of appearance.
+    """
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value):
+        value = MISSING if value in (None, '') else value
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _root():
+    return os.fspath(settings.ANALYTICS_SNAPSHOT_DIR)
+
+
+def _current_file():
+    return os.path.join(_root(), 'CURRENT')
+
+
+class TableWriter:
+    """
+    Writes one table column by column straight into .npy files, so the export never holds more than a chunk in memory.
+    """
+
+    def __init__(self, directory, name, rows):
+        self.directory = os.path.join(directory, name)
+        os.makedirs(self.directory)
+        self.name = name
+        self.rows = rows
+        self.position = 0
+        self.dictionaries = {column: Dictionary() for column, kind in TABLES[name].items() if kind == 'category'}
+        self.columns = {
+            column: np.lib.format.open_memmap(
+                os.path.join(self.directory, f"{column}.npy"), mode='w+',
+                dtype=np.int32 if kind == 'category' or column == 'day' else np.float64, shape=(rows,),
+            )
+            for column, kind in TABLES[name].items()
+        }
+
+    def append(self, chunk):
+        """
+        `chunk` maps every column to a sequence of values (raw values for categoricals).
+        """
+        size = len(next(iter(chunk.values())))
+        end = self.position + size
+        for column, values in chunk.items():
+            dictionary = self.dictionaries.get(column)
+            if dictionary is not None:
+                values = [dictionary.encode(value) for value in values]
+            self.columns[column][self.position:end] = values
+        self.position = end
+
+    def close(self):
+        for array in self.columns.values():
+            array.flush()
+        meta = {
+            "rows": self.position,
+            "columns": TABLES[self.name],
+            "dictionaries": {column: dictionary.values for column, dictionary in self.dictionaries.items()},
+        }
+        with open(os.path.join(self.directory, 'meta.json'), 'w') as file:
+            json.dump(meta, file)
+
+
+def _user_attributes(today):
+    """
+    Per user categoricals, keyed by user id. The goal type is the most recently updated active goal.
+    """
+    goals = {}
+    for user_id, goal_type in (
+        FitnessGoal.objects.filter(is_active=True).order_by('user_id', 'updated_at', 'id').values_list('user_id', 'goal_type').iterator()
+    ):
+        goals[user_id] = goal_type
+
+    attributes = {}
+    for user_id, gender, date_of_birth, weight, height in (
+        User.objects.order_by('id').values_list('id', 'gender', 'date_of_birth', 'weight', 'height').iterator(chunk_size=CHUNK_SIZE)
+    ):
+        attributes[user_id] = (gender, age_band(date_of_birth, today), goals.get(user_id), weight, height)
+    return attributes
+
+
+def build_snapshot():
+    """
+    Export users and sets into a new versioned snapshot directory, then point CURRENT at it with an atomic rename.
+    Readers keep using the previous version until they notice the switch. Returns the version name.
+    """
+    today = timezone.localdate()
+    version = f"{timezone.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    directory = os.path.join(_root(), version)
+    os.makedirs(directory)
+
+    attributes = _user_attributes(today)
+    user_ids = np.array(sorted(attributes), dtype=np.int64)
+
+    users = TableWriter(directory, 'users', len(user_ids))
+    for start in range(0, len(user_ids), CHUNK_SIZE):
+        rows = [attributes[user_id] for user_id in user_ids[start:start + CHUNK_SIZE].tolist()]
+        gender, band, goal_type, weight, height = zip(*rows)
+        users.append({'gender': gender, 'age_band': band, 'goal_type': goal_type, 'weight': weight, 'height': height})
+    users.close()
+
+    set_logs = SetLog.objects.order_by('id').values_list(
+        'user_id', 'performed_at', 'repetitions', 'weight',
+        'session__workout_plan__difficulty_level', 'exercise__muscle_group', 'exercise__category',
+    )
+    # Rows logged while exporting land in the next snapshot
+    total = set_logs.count()
+    sets = TableWriter(directory, 'sets', total)
+    chunk = []
+    for row in set_logs[:total].iterator(chunk_size=CHUNK_SIZE):
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            _append_sets(sets, chunk, attributes)
+            chunk = []
+    if chunk:
+        _append_sets(sets, chunk, attributes)
+    sets.close()
+
+    pointer = os.path.join(_root(), f"CURRENT.{version}")
+    with open(pointer, 'w') as file:
+        file.write(version)
+    os.replace(pointer, _current_file())
+    _prune()
+    return version
+
+
+def _append_sets(writer, rows, attributes):
+    user_id, performed_at, repetitions, weight, difficulty, muscle_group, category = zip(*rows)
+    user_rows = [attributes.get(value, (None, MISSING, None, None, None)) for value in user_id]
+    repetitions = np.array(repetitions, dtype=np.float64)
+    weight = np.array(weight, dtype=np.float64)
+    writer.append({
+        'gender': [row[0] for row in user_rows],
+        'age_band': [row[1] for row in user_rows],
+        'goal_type': [row[2] for row in user_rows],
+        'difficulty_level': difficulty,
+        'muscle_group': [(value or '').strip().lower() for value in muscle_group],
+        'category': category,
+        'day': [timezone.localtime(value).date().toordinal() for value in performed_at],
+        'repetitions': repetitions,
+        'weight': weight,
+        'volume': repetitions * weight,
+    })
+
+
+def _prune(keep=KEEP_VERSIONS):
+    """
+    Drop all but the newest versions. Workers that still map a dropped one keep its pages until they reload,
+    unlinking mapped files is safe on POSIX.
+    """
+    versions = sorted(name for name in os.listdir(_root()) if os.path.isdir(os.path.join(_root(), name)))
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(_root(), name), ignore_errors=True)
+
+
+class Table:
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'meta.json')) as file:
+            meta = json.load(file)
+        self.rows = meta['rows']
+        self.kinds = meta['columns']
+        self.dictionaries = {column: Dictionary(values) for column, values in meta['dictionaries'].items()}
+        # mmap_mode='r' maps the files read-only: no copy, and the pages are shared by every worker through the page cache
+        self.columns = {
+            column: np.load(os.path.join(directory, f"{column}.npy"), mmap_mode='r')[:self.rows]
+            for column in self.kinds
+        }
+
+
+class Snapshot:
+
+    def __init__(self, version):
+        self.version = version
+        directory = os.path.join(_root(), version)
+        self.tables = {name: Table(os.path.join(directory, name)) for name in TABLES}
+
+
+_loaded = None
+_lock = threading.Lock()
+
+
+def get_snapshot():
+    """
+    The current snapshot of this process, remapped when CURRENT points at a newer version.
+    """
+    global _loaded
+    try:
+        with open(_current_file()) as file:
+            version = file.read().strip()
+    except FileNotFoundError:
+        raise SnapshotMissing("No analytics snapshot has been built yet.")
+
+    if _loaded is None or _loaded.version != version:
+        with _lock:
+            if _loaded is None or _loaded.version != version:
+                _loaded = Snapshot(version)
+    return _loaded
+
+
+def _mask(table, filters, since, until):
+    mask = np.ones(table.rows, dtype=bool)
+    for column, values in (filters or {}).items():
+        if table.kinds.get(column) != 'category':
+            raise SnapshotError(f"Can only filter on categorical columns, '{column}' is not one.")
+        values = values if isinstance(values, list) else [values]
+        dictionary = table.dictionaries[column]
+        codes = [dictionary.codes[value] for value in values if value in dictionary.codes]
+        mask &= np.isin(table.columns[column], codes)
+    if since or until:
+        if 'day' not in table.columns:
+            raise SnapshotError("This table has no day column.")
+        day = table.columns['day']
+        if since:
+            mask &= day >= since.toordinal()
+        if until:
+            mask &= day <= until.toordinal()
+    return mask
+
+
+def query(table, filters=None, group_by=None, aggregates=None, since=None, until=None):
+    """
+    Filter, group and aggregate one snapshot table with vectorized NumPy ops.
+
+    - filters: {categorical column: value or list of values}.
+    - group_by: categorical columns.
+    - aggregates: list of [function, measure column] pairs, function one of AGGREGATES;
+      'count' takes no column. Defaults to a row count.
+    - since / until: dates bounding the day column, for tables that have one.
+    """
+    snapshot = get_snapshot()
+    table_name, table = table, snapshot.tables.get(table)
+    if table is None:
+        raise SnapshotError(f"Unknown table. Choose one of: {', '.join(TABLES)}.")
+
+    group_by = group_by or []
+    aggregates = aggregates or [['count', None]]
+    for column in group_by:
+        if table.kinds.get(column) != 'category':
+            raise SnapshotError(f"Can only group by categorical columns, '{column}' is not one.")
+    for function, column in aggregates:
+        if function not in AGGREGATES:
+            raise SnapshotError(f"Unknown aggregate '{function}'. Choose one of: {', '.join(AGGREGATES)}.")
+        if function != 'count' and table.kinds.get(column) != 'measure':
+            raise SnapshotError(f"'{function}' needs a measure column, '{column}' is not one.")
+
+    mask = _mask(table, filters, since, until)
+
+    # Mixed radix key over the group codes, then one np.unique to find the groups
+    key = np.zeros(int(mask.sum()), dtype=np.int64)
+    for column in group_by:
+        key = key * len(table.dictionaries[column].values) + table.columns[column][mask]
+    groups, inverse = np.unique(key, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(groups))
+
+    results = {}
+    for function, column in aggregates:
+        name = 'count' if function == 'count' else f"{function}_{column}"
+        if function == 'count':
+            results[name] = counts
+            continue
+        values = np.asarray(table.columns[column][mask], dtype=np.float64)
+        if function in ('sum', 'mean'):
+            totals = np.bincount(inverse, weights=values, minlength=len(groups))
+            results[name] = totals if function == 'sum' else totals / np.maximum(counts, 1)
+        else:
+            extreme = np.full(len(groups), np.inf if function == 'min' else -np.inf)
+            (np.minimum if function == 'min' else np.maximum).at(extreme, inverse, values)
+            results[name] = extreme
+
+    rows = []
+    for index, group in enumerate(groups.tolist()):
+        row = {}
+        for column in reversed(group_by):
+            size = len(table.dictionaries[column].values)
+            group, code = divmod(group, size)
+            row[column] = table.dictionaries[column].values[code]
+        row = {column: row[column] for column in group_by}
+        for name, values in results.items():
+            value = values[index]
+            row[name] = int(value) if name == 'count' else round(float(value), 2)
+        rows.append(row)
+
+    return {"version": snapshot.version, "table": table_name, "rows": rows}
+
+
+def describe():
+    """
+    Tables, columns and the values of every categorical column of the current snapshot.
+    """
+    snapshot = get_snapshot()
+    return {
+        "version": snapshot.version,
+        "tables": {
+            name: {
+                "rows": table.rows,
+                "measures": [column for column, kind in table.kinds.items() if kind == 'measure'],
+                "categories": {column: dictionary.values for column, dictionary in table.dictionaries.items()},
+            }
+            for name, table in snapshot.tables.items()
+        },
+    }
@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import DailyActiveUsersView, GoalTypeDistributionView, PlanAdoptionView, ExercisePopularityView, SnapshotQueryView
+
+urlpatterns = [
+    path('daily_active_users/', DailyActiveUsersView.as_view(), name='analytics_daily_active_users'),
+    path('goal_types/', GoalTypeDistributionView.as_view(), name='analytics_goal_types'),
+    path('plan_adoption/', PlanAdoptionView.as_view(), name='analytics_plan_adoption'),
+    path('exercise_popularity/', ExercisePopularityView.as_view(), name='analytics_exercise_popularity'),
+    path('query/', SnapshotQueryView.as_view(), name='analytics_query'),
+]
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from django.db.models import Sum, F
+from django.utils import timezone
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from exercises.permissions import IsTrainer
+from .models import AggregationWatermark, DailyActivity, GoalTypeSnapshot, PlanAdoption, ExercisePopularity
+from .serializers import SnapshotQuerySerializer
+from .snapshot import SnapshotError, SnapshotMissing, query, describe
+
+
+class AnalyticsMixin:
+    """
+    Shared `days` / `limit` parsing. Analytics views only ever read the rollup tables
+    maintained by `aggregate_analytics`, never the raw logs.
+    """
+    permission_classes = [IsAuthenticated, IsTrainer]
+    serializer_class = None
+
+    def parse_window(self, request, default_days=30):
+        """
+        Returns (first day, limit, error response).
+        """
+        try:
+            days = min(max(int(request.query_params.get('days', default_days)), 1), 365)
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            return None, None, Response({"detail": "days and limit must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        return timezone.localdate() - timedelta(days=days - 1), limit, None
+
+    def as_of(self):
+        return dict(AggregationWatermark.objects.values_list('name', 'updated_at'))
+
+
+class DailyActiveUsersView(AnalyticsMixin, APIView):
+    """
+    Daily active users, sessions, sets and volume across all users.
+
+    Query params:
+    - days: window ending today (default 30, max 365).
+    """
+
+    def get(self, request):
+        since, _, error = self.parse_window(request)
+        if error:
+            return error
+
+        days = list(
+            DailyActivity.objects.filter(day__gte=since).order_by('day')
+            .values('day', 'active_users', 'sessions', 'sets', 'repetitions', 'volume')
+        )
+        return Response({"as_of": self.as_of(), "days": days}, status=status.HTTP_200_OK)
+
+
+class GoalTypeDistributionView(AnalyticsMixin, APIView):
+    """
+    Active fitness goals per goal type, from the latest daily snapshot.
+    """
+
+    def get(self, request):
+        latest = GoalTypeSnapshot.objects.order_by('-day').values_list('day', flat=True).first()
+        goal_types = list(
+            GoalTypeSnapshot.objects.filter(day=latest).order_by('-active_goals')
+            .values('goal_type', 'active_goals', 'users')
+        ) if latest else []
+        return Response({"day": latest, "goal_types": goal_types}, status=status.HTTP_200_OK)
+
+
+class PlanAdoptionView(AnalyticsMixin, APIView):
+    """
+    Most used workout plans in the window: sessions logged with the plan and users who started it.
+
+    Query params:
+    - days: window ending today (default 30, max 365).
+    - limit: number of plans (default 10, max 100).
+    """
+
+    def get(self, request):
+        since, limit, error = self.parse_window(request)
+        if error:
+            return error
+
+        plans = list(
+            PlanAdoption.objects.filter(day__gte=since)
+            .values(unique_id=F('workout_plan__unique_id'), title=F('workout_plan__title'))
+            .annotate(sessions=Sum('sessions'), new_users=Sum('new_users'))
+            .order_by('-sessions', '-new_users')[:limit]
+        )
+        return Response({"as_of": self.as_of(), "since": since, "workout_plans": plans}, status=status.HTTP_200_OK)
+
+
+class ExercisePopularityView(AnalyticsMixin, APIView):
+    """
+    Most logged exercises in the window by number of sets.
+
+    Query params:
+    - days: window ending today (default 30, max 365).
+    - limit: number of exercises (default 10, max 100).
+    """
+
+    def get(self, request):
+        since, limit, error = self.parse_window(request)
+        if error:
+            return error
+
+        exercises = list(
+            ExercisePopularity.objects.filter(day__gte=since)
+            .values(unique_id=F('exercise__unique_id'), name=F('exercise__name'), muscle_group=F('exercise__muscle_group'))
+            .annotate(sets=Sum('sets'), repetitions=Sum('repetitions'), volume=Sum('volume'))
+            .order_by('-sets', '-volume')[:limit]
+        )
+        return Response({"as_of": self.as_of(), "since": since, "exercises": exercises}, status=status.HTTP_200_OK)
+
+
+class SnapshotQueryView(AnalyticsMixin, APIView):
+    """
+    Ad-hoc slicing of the columnar snapshot, evaluated in process with NumPy, never against the database.
+
+    GET describes the tables, measures and categorical values. POST runs a query, e.g.
+    {"table": "sets", "filters": {"gender": "Woman"}, "group_by": ["age_band"], "aggregates": [["sum", "volume"], ["count"]]}
+    """
+    serializer_class = SnapshotQuerySerializer
+
+    def get(self, request):
+        try:
+            return Response(describe(), status=status.HTTP_200_OK)
+        except SnapshotError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def post(self, request):
+        serializer = SnapshotQuerySerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            result = query(**serializer.validated_data)
+        except SnapshotMissing as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except SnapshotError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
@@ -0,0 +1,82 @@
+"""
+User journeys replayed by the loadtest command. Each journey is an async function of a
+benchmarks.loadtest.VirtualUser; its requests are recorded per endpoint name.
+"""
+from .seeding import EXERCISE_NAMES, MUSCLE_GROUPS
+
+RECOMMENDATION_PAGES = 4
+
+
+async def sign_in(user):
+    """
+    A fresh session: log in, then load the profile like the app's start screen.
+    """
+    user.access_token = None
+    await user.login()
+    await user.request('current_user', 'GET', '/users/current_user/')
+
+
+async def recommendations(user):
+    """
+    Open the profile, then page through the recommended plans.
+    """
+    await user.request('current_user', 'GET', '/users/current_user/')
+    for page in range(1, user.rng.randint(1, RECOMMENDATION_PAGES) + 1):
+        # 404 is the answer for users without active goals
+        status, body = await user.request(
+            'recommendations', 'GET', '/user_recommendations/recommendations/', expected=(200, 404), params={'page': page},
+        )
+        if status != 200 or not body.get('next'):
+            break
+
+
+async def exercise_search(user):
+    """
+    Search the exercise catalogue and open one of the results.
+    """
+    if user.rng.random() < 0.7:
+        params = {'search': user.rng.choice(EXERCISE_NAMES)}
+    else:
+        params = {'muscle_group': user.rng.choice(MUSCLE_GROUPS)}
+    _, body = await user.request('exercise search', 'GET', '/exercises/', params=params)
+    if body['results']:
+        exercise = user.rng.choice(body['results'])
+        await user.request('exercise detail', 'GET', f"/exercises/{exercise['unique_id']}/")
+
+
+async def trainer_plan_edit(user):
+    """
+    A trainer opens one of their plans, reorders its exercises with bulk-update and edits the description.
+    """
+    await user.ensure_login()
+    _, body = await user.request(
+        'trainer plans', 'GET', '/workout_management/workout_plan/', params={'created_by': user.user_id, 'page_size': 20},
+    )
+    if not body['results']:
+        return
+    plan = user.rng.choice(body['results'])
+    _, plan = await user.request('plan detail', 'GET', f"/workout_management/workout_plan/{plan['unique_id']}/")
+
+    workout_exercises = plan['workout_exercises']
+    if len(workout_exercises) > 1:
+        orders = [workout_exercise['order'] for workout_exercise in workout_exercises]
+        user.rng.shuffle(orders)
+        payload = {'workout_exercises': [
+            {'id': workout_exercise['id'], 'order': order, 'sets': user.rng.randint(2, 5)}
+            for workout_exercise, order in zip(workout_exercises, orders)
+        ]}
+        await user.request('exercise bulk-update', 'PATCH', '/workout_management/workout_exercises/bulk-update/', json=payload)
+
+    await user.request(
+        'plan update', 'PATCH', f"/workout_management/workout_plan/{plan['unique_id']}/update/",
+        json={'description': f"Edited by {user.email}"},
+    )
+
+
+# (name, default weight, journey, trainers only)
+JOURNEYS = [
+    ('sign_in', 1, sign_in, False),
+    ('recommendations', 5, recommendations, False),
+    ('exercise_search', 4, exercise_search, False),
+    ('trainer_plan_edit', 2, trainer_plan_edit, True),
+]
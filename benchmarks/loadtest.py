@@ -0,0 +1,228 @@
+import asyncio
+import base64
+import json
+import math
+import random
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+import aiohttp
+
+# Responses slower than this are reported as timeouts (errors)
+REQUEST_TIMEOUT = 30
+
+
+class EndpointStats:
+    """
+    Latencies and status codes of one endpoint, e.g. "GET recommendations".
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+
+    def add(self, latency_ms, status, error):
+        self.latencies.append(latency_ms)
+        self.statuses[str(status)] += 1
+        if error:
+            self.errors += 1
+
+    def summary(self, duration):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            'requests': count,
+            'throughput': round(count / duration, 2) if duration else 0,
+            'errors': self.errors,
+            'error_rate': round(self.errors / count, 4) if count else 0,
+            'mean_ms': round(sum(latencies) / count, 2) if count else None,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'max_ms': round(latencies[-1], 2) if count else None,
+            'statuses': dict(sorted(self.statuses.items())),
+        }
+
+
+def percentile(latencies, percent):
+    """
+    Nearest-rank percentile of sorted latencies.
+    """
+    if not latencies:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(latencies)))
+    return round(latencies[rank - 1], 2)
+
+
+class JourneyFailed(Exception):
+    """
+    A step of a journey got an unexpected response, the rest of the journey is skipped.
+    `retry_after` is set when the server throttled the request.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class VirtualUser:
+    """
+    One simulated client: an account, its tokens and its own random generator. Journeys call
+    request(), which times the call and records it under `name`.
+    """
+
+    def __init__(self, session, base_url, stats, email, password, is_trainer, rng):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.stats = stats
+        self.email = email
+        self.password = password
+        self.is_trainer = is_trainer
+        self.rng = rng
+        self.access_token = None
+
+    @property
+    def user_id(self):
+        # simplejwt puts the user id in the access token payload, call ensure_login() first
+        payload = self.access_token.split('.')[1]
+        return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))['user_id']
+
+    async def request(self, name, method, path, expected=(200,), authenticated=True, **kwargs):
+        headers = kwargs.pop('headers', {})
+        if authenticated:
+            await self.ensure_login()
+            headers['Authorization'] = f"Bearer {self.access_token}"
+
+        started = time.perf_counter()
+        status, body, retry_after = 'exception', None, None
+        try:
+            async with self.session.request(method, self.base_url + path, headers=headers, **kwargs) as response:
+                status = response.status
+                content = await response.read()
+                if status == 429:
+                    retry_after = float(response.headers.get('Retry-After', 1))
+            if content and response.content_type == 'application/json':
+                body = json.loads(content)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+            status = type(exc).__name__
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.stats.setdefault(f"{method} {name}", EndpointStats()).add(latency_ms, status, status not in expected)
+
+        if status == 401 and authenticated:
+            # Expired access token, log in again on the next request
+            self.access_token = None
+        if status not in expected:
+            raise JourneyFailed(f"{method} {path}: {status}", retry_after)
+        return status, body
+
+    async def ensure_login(self):
+        if self.access_token is None:
+            await self.login()
+
+    async def login(self):
+        _, body = await self.request(
+            'login', 'POST', '/users/login/', authenticated=False, json={'email': self.email, 'password': self.password},
+        )
+        self.access_token = body['user']['access_token']
+
+
+async def _virtual_user_loop(user, journeys, deadline, think_time, journey_counts):
+    names = [name for name, _, _, _ in journeys]
+    weights = [weight for _, weight, _, _ in journeys]
+    functions = {name: function for name, _, function, _ in journeys}
+    while time.monotonic() < deadline:
+        name = user.rng.choices(names, weights=weights)[0]
+        try:
+            await functions[name](user)
+            journey_counts[name]['completed'] += 1
+        except JourneyFailed as exc:
+            journey_counts[name]['failed'] += 1
+            if exc.retry_after:
+                # Like a real client, wait instead of hammering a throttled endpoint
+                await asyncio.sleep(min(exc.retry_after, max(0, deadline - time.monotonic())))
+        if think_time:
+            await asyncio.sleep(user.rng.uniform(0, 2 * think_time))
+
+
+async def run(base_url, accounts, journeys, duration, ramp_up=0, think_time=0, seed=0):
+    """
+    Replay `journeys` for `duration` seconds with one virtual user per account, started evenly over
+    `ramp_up` seconds. `accounts` are (email, password, is_trainer). `journeys` are (name, weight,
+    async function(user), trainer_only). Returns {endpoint: EndpointStats}, journey counts and the
+    measured duration.
+    """
+    stats = {}
+    journey_counts = {name: Counter() for name, _, _, _ in journeys}
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=len(accounts))
+
+    # One session for every virtual user: no cookie jar, or the JWT cookies set by each login would
+    # be shared and TokenRefreshMiddleware could serve a request as whoever logged in last.
+    # Virtual users authenticate with their own Bearer header only.
+    cookie_jar = aiohttp.DummyCookieJar()
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector, cookie_jar=cookie_jar) as session:
+        started = time.monotonic()
+        deadline = started + ramp_up + duration
+        tasks = []
+        for index, (email, password, is_trainer) in enumerate(accounts):
+            user = VirtualUser(session, base_url, stats, email, password, is_trainer, random.Random(f"{seed}:{index}"))
+            allowed = [journey for journey in journeys if is_trainer or not journey[3]]
+
+            async def start(user=user, allowed=allowed, delay=ramp_up * index / len(accounts)):
+                await asyncio.sleep(delay)
+                await _virtual_user_loop(user, allowed, deadline, think_time, journey_counts)
+
+            tasks.append(asyncio.create_task(start()))
+        await asyncio.gather(*tasks)
+        measured = time.monotonic() - started
+
+    return stats, journey_counts, measured
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(stats, journey_counts, duration, settings):
+    """
+    The JSON document saved per run. Stable keys, so runs of different commits can be compared.
+    """
+    everything = EndpointStats()
+    for endpoint in stats.values():
+        everything.latencies.extend(endpoint.latencies)
+        everything.statuses.update(endpoint.statuses)
+        everything.errors += endpoint.errors
+    return {
+        'finished_at': datetime.now(dt_timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'settings': settings,
+        'duration': round(duration, 2),
+        'total': everything.summary(duration),
+        'endpoints': {name: stats[name].summary(duration) for name in sorted(stats)},
+        'journeys': {name: dict(counts) for name, counts in journey_counts.items()},
+    }
+
+
+def compare(previous, current, keys=('throughput', 'p50_ms', 'p95_ms', 'p99_ms', 'error_rate')):
+    """
+    Rows of (endpoint, key, previous, current, change in percent) for two reports.
+    """
+    rows = []
+    endpoints = {'total': (previous['total'], current['total'])}
+    for name, summary in current['endpoints'].items():
+        if name in previous['endpoints']:
+            endpoints[name] = (previous['endpoints'][name], summary)
+    for name, (before, after) in endpoints.items():
+        for key in keys:
+            old, new = before.get(key), after.get(key)
+            change = round((new - old) / old * 100, 1) if old and new is not None else None
+            rows.append((name, key, old, new, change))
+    return rows
@@ -0,0 +1,121 @@
+import io
+import json
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from encoding.middleware import CompressionMiddleware, brotli
+from encoding.parsers import ORJSONParser, orjson
+from encoding.renderers import ORJSONRenderer
+from users.models import User
+from workout_management.views import WorkoutPlanViewSet
+
+PLAN_LIST_URL = '/workout_management/workout_plan/'
+
+
+def cpu_ms(function, repeat):
+    """
+    CPU milliseconds of one call of `function`, averaged over `repeat` calls.
+    """
+    started = time.process_time()
+    for _ in range(repeat):
+        function()
+    return (time.process_time() - started) * 1000 / repeat
+
+
+class Command(BaseCommand):
+    help = (
+        "Bytes and CPU time per response of the workout plan list: JSON rendering and parsing with the "
+        "stdlib json and orjson, and gzip and brotli compression of the rendered body. Pages are loaded "
+        "once from the database (seed it with seed_scale), only the encoding is timed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', help="User the list is requested as, by default the first user.")
+        parser.add_argument('--page-size', type=int, default=100, help="Plans per page (the API allows up to 100).")
+        parser.add_argument('--pages', type=int, default=5, help="Pages measured.")
+        parser.add_argument('--repeat', type=int, default=50, help="Timed runs per page and variant.")
+        parser.add_argument('--host', default='localhost', help="Host of the requests (in ALLOWED_HOSTS), used in the page links.")
+        parser.add_argument('--output', help="Also save the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        pages = self.load_pages(options)
+        if not pages:
+            raise CommandError("No workout plans to measure, seed the database first (seed_scale).")
+        plans = sum(len(page['results']) for page in pages)
+        self.stdout.write(f"{len(pages)} pages, {plans} plans, {options['repeat']} runs per page and variant")
+
+        results = self.measure(pages, options['repeat'])
+        self.print_results(results)
+        if options['output']:
+            output = Path(options['output'])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            report = {key: options[key] for key in ('email', 'page_size', 'pages', 'repeat')}
+            output.write_text(json.dumps({**report, 'plans': plans, 'results': results}, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Results saved to {output}"))
+
+    def load_pages(self, options):
+        users = User.objects.order_by('id')
+        user = users.filter(email=options['email']).first() if options['email'] else users.first()
+        if user is None:
+            raise CommandError("User not found.")
+
+        view = WorkoutPlanViewSet.as_view({'get': 'list'})
+        factory = APIRequestFactory(SERVER_NAME=options['host'])
+        pages = []
+        for page in range(1, options['pages'] + 1):
+            request = factory.get(PLAN_LIST_URL, {'page': page, 'page_size': options['page_size']})
+            force_authenticate(request, user=user)
+            response = view(request)
+            if response.status_code != 200:
+                break
+            pages.append(response.data)
+            if not response.data.get('next'):
+                break
+        return pages
+
+    def measure(self, pages, repeat):
+        """
+        {variant: {'bytes': per response, 'cpu_ms': per response}}
+        """
+        results = {}
+        renderers = {'render json': JSONRenderer(), 'render orjson': ORJSONRenderer()}
+        parsers = {'parse json': JSONParser(), 'parse orjson': ORJSONParser()}
+        bodies = [renderers['render json'].render(page) for page in pages]
+
+        for page, body in zip(pages, bodies):
+            if json.loads(renderers['render orjson'].render(page)) != json.loads(body):
+                self.stderr.write(self.style.WARNING("orjson output differs from JSONRenderer's"))
+                break
+
+        def add(variant, size, ms):
+            totals = results.setdefault(variant, {'bytes': 0, 'cpu_ms': 0})
+            totals['bytes'] += size
+            totals['cpu_ms'] += ms
+
+        for page, body in zip(pages, bodies):
+            for variant, renderer in renderers.items():
+                add(variant, len(body), cpu_ms(lambda: renderer.render(page), repeat))
+            for variant, parser in parsers.items():
+                add(variant, len(body), cpu_ms(lambda: parser.parse(io.BytesIO(body)), repeat))
+
+            compression = CompressionMiddleware(lambda request: None)
+            for coding in compression.available:
+                compressed = compression.compress(body, coding)
+                add(f"compress {coding}", len(compressed), cpu_ms(lambda: compression.compress(body, coding), repeat))
+
+        return {
+            variant: {'bytes': round(totals['bytes'] / len(pages)), 'cpu_ms': round(totals['cpu_ms'] / len(pages), 3)}
+            for variant, totals in results.items()
+        }
+
+    def print_results(self, results):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed, its variants are the stdlib json ones"))
+        if brotli is None:
+            self.stdout.write(self.style.WARNING("brotli is not installed, only gzip is measured"))
+        self.stdout.write(f"\n{'per response':<18}{'bytes':>12}{'CPU ms':>10}")
+        for variant, result in results.items():
+            self.stdout.write(f"{variant:<18}{result['bytes']:>12}{result['cpu_ms']:>10.3f}")
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import random
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks import loadtest
+from benchmarks.journeys import JOURNEYS
+from benchmarks.seeding import TRAINER_EVERY, seeded_email
+
+RESULTS_DIR = Path(settings.BASE_DIR) / 'benchmarks' / 'results'
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay weighted user journeys against a running instance with concurrent virtual users, "
+        "using accounts created by seed_scale. Reports throughput, p50/p95/p99 and error rates per "
+        "endpoint and saves the results as JSON for comparison across commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help="Root URL of the instance, e.g. http://localhost:8000")
+        parser.add_argument('--users', type=int, default=50, help="Concurrent virtual users.")
+        parser.add_argument('--duration', type=float, default=60, help="Seconds of load after the ramp up.")
+        parser.add_argument('--ramp-up', type=float, default=10, help="Seconds over which the virtual users start.")
+        parser.add_argument('--think-time', type=float, default=0, help="Average pause between journeys, in seconds.")
+        parser.add_argument('--trainer-share', type=float, default=0.2, help="Share of virtual users that are trainers.")
+        parser.add_argument(
+            '--weights', default='',
+            help="Journey weights, e.g. recommendations=5,trainer_plan_edit=0. Defaults: "
+            + ", ".join(f"{name}={weight}" for name, weight, _, _ in JOURNEYS),
+        )
+        parser.add_argument('--seed', type=int, default=42, help="The seed_scale --seed the accounts were generated with.")
+        parser.add_argument('--accounts', type=int, default=10_000, help="How many seeded users to draw the virtual users from.")
+        parser.add_argument('--password', default="Benchmark-pass-123", help="The seed_scale --password.")
+        parser.add_argument('--output', help="Results file, by default benchmarks/results/<time>-<revision>.json")
+        parser.add_argument('--compare', help="A previous results file to compare this run with.")
+
+    def handle(self, *args, **options):
+        journeys = self.weighted_journeys(options['weights'])
+        accounts = self.pick_accounts(options)
+        previous = self.load(options['compare']) if options['compare'] else None
+
+        self.stdout.write(
+            f"{len(accounts)} virtual users against {options['base_url']} for "
+            f"{options['ramp_up']:g}s ramp up + {options['duration']:g}s..."
+        )
+        stats, journey_counts, duration = asyncio.run(loadtest.run(
+            options['base_url'], accounts, journeys, options['duration'],
+            ramp_up=options['ramp_up'], think_time=options['think_time'], seed=options['seed'],
+        ))
+
+        report = loadtest.build_report(stats, journey_counts, duration, settings={
+            key: options[key] for key in ('base_url', 'users', 'duration', 'ramp_up', 'think_time', 'trainer_share', 'seed', 'accounts')
+        } | {'weights': {name: weight for name, weight, _, _ in journeys}})
+
+        self.print_report(report)
+        output = Path(options['output']) if options['output'] else self.default_output(report)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {output}"))
+
+        if previous:
+            self.print_comparison(loadtest.compare(previous, report))
+
+    def weighted_journeys(self, weights):
+        overrides = {}
+        for item in filter(None, weights.split(',')):
+            name, _, weight = item.partition('=')
+            try:
+                overrides[name.strip()] = float(weight)
+            except ValueError:
+                raise CommandError(f"Invalid journey weight: {item}")
+        unknown = set(overrides) - {name for name, _, _, _ in JOURNEYS}
+        if unknown:
+            raise CommandError(f"Unknown journeys: {', '.join(sorted(unknown))}")
+
+        journeys = [
+            (name, overrides.get(name, weight), function, trainer_only)
+            for name, weight, function, trainer_only in JOURNEYS
+        ]
+        journeys = [journey for journey in journeys if journey[1] > 0]
+        if not any(not trainer_only for _, _, _, trainer_only in journeys):
+            raise CommandError("At least one journey open to every user needs a weight.")
+        return journeys
+
+    def pick_accounts(self, options):
+        """
+        Seeded accounts for the virtual users: every TRAINER_EVERY-th seeded user is a trainer.
+        """
+        population = options['accounts']
+        if population <= TRAINER_EVERY:
+            raise CommandError(f"--accounts must be larger than {TRAINER_EVERY}.")
+        if options['users'] < 1:
+            raise CommandError("--users must be positive.")
+
+        rng = random.Random(options['seed'])
+        trainers = round(options['users'] * options['trainer_share'])
+        accounts = []
+        for index in range(options['users']):
+            if index < trainers:
+                seeded = rng.randrange(0, population, TRAINER_EVERY)
+            else:
+                seeded = rng.randrange(population)
+                while seeded % TRAINER_EVERY == 0:
+                    seeded = rng.randrange(population)
+            accounts.append((seeded_email(options['seed'], seeded), options['password'], index < trainers))
+        return accounts
+
+    def load(self, path):
+        try:
+            with open(path) as results:
+                return json.load(results)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+
+    def default_output(self, report):
+        stamp = datetime.now(dt_timezone.utc).strftime('%Y%m%dT%H%M%S')
+        return RESULTS_DIR / f"{stamp}-{report['revision'] or 'unknown'}.json"
+
+    def print_report(self, report):
+        header = f"{'endpoint':<36}{'requests':>10}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>10}"
+        self.stdout.write(header)
+        rows = list(report['endpoints'].items()) + [('total', report['total'])]
+        for name, summary in rows:
+            self.stdout.write(
+                f"{name:<36}{summary['requests']:>10}{summary['throughput']:>10}"
+                f"{self.ms(summary['p50_ms']):>10}{self.ms(summary['p95_ms']):>10}{self.ms(summary['p99_ms']):>10}"
+                f"{summary['error_rate']:>10.2%}"
+            )
+        for name, counts in report['journeys'].items():
+            self.stdout.write(f"journey {name}: {counts.get('completed', 0)} completed, {counts.get('failed', 0)} failed")
+
+    def print_comparison(self, rows):
+        self.stdout.write("Compared with the previous run:")
+        for name, key, old, new, change in rows:
+            change = f"{change:+.1f}%" if change is not None else "n/a"
+            self.stdout.write(f"{name:<36}{key:<12}{old!s:>12}{new!s:>12}{change:>10}")
+
+    def ms(self, value):
+        return '-' if value is None else f"{value:.0f}ms"
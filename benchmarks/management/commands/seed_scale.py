@@ -0,0 +1,75 @@
+import os
+import time
+from datetime import date
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from users.models import User
+from benchmarks import seeding
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a production sized synthetic dataset (users, exercises, workout plans, plan exercises, "
+        "goal mappings and fitness goals) for benchmarks. The same --seed always produces the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000)
+        parser.add_argument('--exercises', type=int, default=50_000)
+        parser.add_argument('--plans', type=int, default=200_000)
+        parser.add_argument('--min-plan-exercises', type=int, default=5)
+        parser.add_argument('--max-plan-exercises', type=int, default=40)
+        parser.add_argument('--goals-per-user', type=float, default=3, help="Average number of fitness goals per user.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (PostgreSQL only).")
+        parser.add_argument('--chunk-size', type=int, default=20_000, help="Source rows generated and written per transaction. Changing it changes the generated rows.")
+        parser.add_argument('--password', default="Benchmark-pass-123", help="Password shared by every generated user.")
+        parser.add_argument('--until', type=date.fromisoformat, default=None, help="Latest generated date (YYYY-MM-DD), today by default.")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        seed = options['seed']
+        low, high = options['min_plan_exercises'], options['max_plan_exercises']
+        if not 1 <= low <= high:
+            raise CommandError("Expected 1 <= --min-plan-exercises <= --max-plan-exercises.")
+        if options['users'] < 1 or options['exercises'] < 1 or options['plans'] < 0 or options['chunk_size'] < 1:
+            raise CommandError("--users, --exercises and --chunk-size must be positive.")
+
+        # Rows are only unique per seed, a second run would clash on the emails
+        if User.objects.using(using).filter(email=seeding.seeded_email(seed, 0)).exists():
+            raise CommandError(f"Seed {seed} was already generated in this database, use another --seed.")
+
+        workers = options['workers']
+        if connections[using].vendor != 'postgresql':
+            # SQLite allows a single writer
+            workers = 1
+
+        # One PBKDF2 hash instead of one per user
+        spec = seeding.build_spec(
+            seed=seed,
+            users=options['users'],
+            exercises=options['exercises'],
+            plans=options['plans'],
+            plan_exercises=(low, high),
+            goals_per_user=options['goals_per_user'],
+            password_hash=make_password(options['password']),
+            until=options['until'] or date.today(),
+            using=using,
+        )
+
+        started = time.monotonic()
+        totals = {}
+
+        def progress(table, rows):
+            totals[table] = totals.get(table, 0) + rows
+            self.stdout.write(f"{table}: {totals[table]} rows ({time.monotonic() - started:.1f}s)")
+
+        written = seeding.run(spec, options['chunk_size'], workers, progress)
+
+        summary = ", ".join(f"{rows} {table}" for table, rows in written.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Seed {seed}: wrote {summary} in {time.monotonic() - started:.1f}s with {workers} worker(s). "
+            f"Every user logs in with the --password."
+        ))
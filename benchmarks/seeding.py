@@ -0,0 +1,296 @@
+import csv
+import io
+import json
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from functools import partial
+from multiprocessing import get_context
+import django
+from django.core.management.color import no_style
+from django.db import connections, transaction, models
+from django.db.models import Max
+from users.models import User, FitnessGoal
+from exercises.models import Exercise
+from workout_management.models import WorkoutPlan, WorkoutExercise
+from plan_recommendations.models import GoalWorkoutMapping
+
+BULK_BATCH_SIZE = 5000
+
+# One user in this many is a trainer
+TRAINER_EVERY = 50
+
+FIRST_NAMES = ['Nino', 'Giorgi', 'Ana', 'Luka', 'Mariam', 'David', 'Elene', 'Nika', 'Sophie', 'Alex', 'Maria', 'John', 'Emma', 'Noah']
+LAST_NAMES = ['Beridze', 'Kapanadze', 'Smith', 'Garcia', 'Muller', 'Rossi', 'Novak', 'Kowalski', 'Silva', 'Brown', 'Lee', 'Martin']
+TIME_ZONES = [('UTC', 30), ('Europe/Berlin', 20), ('America/New_York', 20), ('Asia/Tbilisi', 15), ('Asia/Tokyo', 10), ('Australia/Sydney', 5)]
+EXERCISE_NAMES = ['Squat', 'Deadlift', 'Bench Press', 'Row', 'Lunge', 'Plank', 'Burpee', 'Pull Up', 'Push Up', 'Sprint', 'Cycling', 'Stretch']
+EXERCISE_CATEGORIES = [('Strength', 40), ('Cardio', 20), ('Calisthenics', 15), ('Yoga', 10), ('Flexibility', 10), ('Aerobic', 5)]
+MUSCLE_GROUPS = ['legs', 'back', 'chest', 'shoulders', 'arms', 'core', 'full body']
+EQUIPMENT = ['Barbell', 'Dumbbell', 'Kettlebell', 'Band', 'Bench', 'Mat', 'Bike']
+DIFFICULTY_LEVELS = [('Beginner', 50), ('Intermediate', 35), ('Advanced', 15)]
+GOAL_TYPES = [('Weight Loss', 35), ('Strength Building', 25), ('Cardiovascular Fitness', 15), ('BodyBuilding', 15), ('Flexibility', 10)]
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _skewed_index(rng, size, power):
+    """
+    An index in [0, size) where low indices are much more likely: a few trainers write most
+    plans, a few exercises appear in most plans.
+    """
+    return min(size - 1, int(size * rng.random() ** power))
+
+
+def _moment(rng, until, max_days, power=1.0):
+    # power > 1 puts more rows close to `until` (a growing user base)
+    days_ago = max_days * rng.random() ** power
+    return datetime.combine(until, time(), tzinfo=dt_timezone.utc) - timedelta(days=days_ago)
+
+
+def chunk_rng(spec, table, chunk_index):
+    """
+    Every chunk draws from its own generator, so the rows only depend on the seed and the chunk
+    size, not on how chunks are spread over workers.
+    """
+    return random.Random(f"{spec['seed']}:{table}:{chunk_index}")
+
+
+def seeded_email(seed, index):
+    return f"seed{seed}.user{index}@example.com"
+
+
+def trainer_id(spec, rng, power):
+    return spec['user_base'] + _skewed_index(rng, spec['trainers'], power) * TRAINER_EVERY
+
+
+def generate_users(spec, rng, start, stop):
+    for index in range(start, stop):
+        gender = 'Woman' if rng.random() < 0.45 else 'Men'
+        email = seeded_email(spec['seed'], index)
+        yield User, {
+            'id': spec['user_base'] + index,
+            'password': spec['password'],
+            'last_login': None,
+            'is_superuser': False,
+            'username': email,
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+            'email': email,
+            'is_staff': False,
+            'is_active': True,
+            'date_joined': _moment(rng, spec['until'], 3 * 365, power=2),
+            'unique_id': uuid.UUID(int=rng.getrandbits(128), version=4),
+            'is_trainer': index % TRAINER_EVERY == 0,
+            'gender': gender,
+            'date_of_birth': spec['until'] - timedelta(days=int(365 * min(70, max(16, rng.gauss(32, 9))))),
+            'avatar': 'avatars/default-girl-avatar.jpg' if gender == 'Woman' else 'avatars/default-boy-avatar.jpg',
+            'height': Decimal(f"{min(2.10, max(1.45, rng.gauss(1.72, 0.09))):.2f}"),
+            'weight': Decimal(f"{min(180.0, max(40.0, rng.gauss(75, 14))):.2f}"),
+            'time_zone': _weighted(rng, TIME_ZONES),
+        }
+
+
+def generate_exercises(spec, rng, start, stop):
+    for index in range(start, stop):
+        yield Exercise, {
+            'id': spec['exercise_base'] + index,
+            'created_by_id': trainer_id(spec, rng, power=3),
+            'name': f"{rng.choice(EXERCISE_NAMES)} {index}",
+            'unique_id': uuid.UUID(int=rng.getrandbits(128), version=4),
+            'description': "Generated by seed_scale",
+            'category': _weighted(rng, EXERCISE_CATEGORIES),
+            'equipment': rng.sample(EQUIPMENT, rng.randint(0, 2)),
+            'repetitions': rng.randint(5, 20),
+            'sets': rng.randint(2, 5),
+            'muscle_group': rng.choice(MUSCLE_GROUPS),
+            'updated_at': _moment(rng, spec['until'], 3 * 365),
+        }
+
+
+def generate_workout_plans(spec, rng, start, stop):
+    for index in range(start, stop):
+        plan_id = spec['plan_base'] + index
+        created_at = _moment(rng, spec['until'], 3 * 365, power=1.5)
+        difficulty_level = _weighted(rng, DIFFICULTY_LEVELS)
+        # Plan tags are the goal types, each one is also a recommendation mapping
+        tags = list(dict.fromkeys(_weighted(rng, GOAL_TYPES) for _ in range(rng.randint(1, 2))))
+        yield WorkoutPlan, {
+            'id': plan_id,
+            'unique_id': uuid.UUID(int=rng.getrandbits(128), version=4),
+            'created_by_id': trainer_id(spec, rng, power=2),
+            'title': f"{difficulty_level} {tags[0]} plan {index}",
+            'description': "Generated by seed_scale",
+            'difficulty_level': difficulty_level,
+            'sessions_per_week': rng.randint(2, 6),
+            'workout_banner': 'workout_banners/no-img-banner.jpg',
+            'tags': tags,
+            'created_at': created_at,
+            'updated_at': created_at + timedelta(days=rng.random() * 30),
+        }
+        for tag in tags:
+            yield GoalWorkoutMapping, {'goal_type': tag, 'workout_plan_id': plan_id}
+
+
+def generate_workout_exercises(spec, rng, start, stop):
+    low, high = spec['plan_exercises']
+    for index in range(start, stop):
+        # Most plans are short, a few are long
+        count = min(low + int((high - low + 1) * rng.random() ** 2), high, spec['exercises'])
+        exercise_indexes = {}
+        while len(exercise_indexes) < count:
+            exercise_indexes.setdefault(_skewed_index(rng, spec['exercises'], 2.5))
+        for order, exercise_index in enumerate(exercise_indexes, start=1):
+            yield WorkoutExercise, {
+                'workout_plan_id': spec['plan_base'] + index,
+                'exercise_id': spec['exercise_base'] + exercise_index,
+                'order': order,
+                'repetitions': rng.randint(5, 15),
+                'sets': rng.randint(2, 5),
+                'rest_time': timedelta(seconds=rng.randrange(30, 181, 15)),
+                'updated_at': _moment(rng, spec['until'], 365),
+            }
+
+
+def generate_fitness_goals(spec, rng, start, stop):
+    for index in range(start, stop):
+        count = min(12, int(rng.expovariate(1 / spec['goals_per_user']) + 0.5))
+        for _ in range(count):
+            start_date = spec['until'] - timedelta(days=rng.randint(0, 720))
+            end_date = start_date + timedelta(days=rng.randint(30, 180)) if rng.random() < 0.8 else None
+            yield FitnessGoal, {
+                'user_id': spec['user_base'] + index,
+                'unique_id': uuid.UUID(int=rng.getrandbits(128), version=4),
+                'goal_type': _weighted(rng, GOAL_TYPES),
+                'start_date': start_date,
+                'end_date': end_date,
+                'description': "",
+                'is_active': (end_date is None or end_date > spec['until']) and rng.random() < 0.85,
+                'updated_at': datetime.combine(start_date, time(), tzinfo=dt_timezone.utc),
+            }
+
+
+# (table, generator, number of source rows), in dependency order
+PHASES = [
+    ('users', generate_users, 'users'),
+    ('exercises', generate_exercises, 'exercises'),
+    ('workout_plans', generate_workout_plans, 'plans'),
+    ('workout_exercises', generate_workout_exercises, 'plans'),
+    ('fitness_goals', generate_fitness_goals, 'users'),
+]
+
+
+def _copy_value(field, value):
+    if value is None:
+        return r'\N'
+    if isinstance(field, models.JSONField):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, timedelta):
+        return f"{value.total_seconds()} seconds"
+    return str(value)
+
+
+def copy_rows(connection, model, rows):
+    """
+    Load rows with PostgreSQL COPY, by far the fastest way in. Columns are the keys of the rows
+    (attnames), so leaving out 'id' lets the sequence number the rows.
+    """
+    fields = [model._meta.get_field(name) for name in rows[0]]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(field, value) for field, value in zip(fields, row.values())])
+    buffer.seek(0)
+
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer,
+        )
+
+
+def write_chunk(spec, task):
+    """
+    Generate and store one chunk in its own transaction. Runs in a worker process.
+    """
+    table, chunk_index, start, stop = task
+    generator = dict((name, function) for name, function, _ in PHASES)[table]
+    rows = {}
+    for model, row in generator(spec, chunk_rng(spec, table, chunk_index), start, stop):
+        rows.setdefault(model, []).append(row)
+
+    connection = connections[spec['using']]
+    with transaction.atomic(using=spec['using']):
+        for model, model_rows in rows.items():
+            if connection.vendor == 'postgresql':
+                copy_rows(connection, model, model_rows)
+            else:
+                # auto_now fields are stamped with the current time on this path
+                model.objects.using(spec['using']).bulk_create([model(**row) for row in model_rows], batch_size=BULK_BATCH_SIZE)
+    return {model._meta.db_table: len(model_rows) for model, model_rows in rows.items()}
+
+
+def build_spec(seed, users, exercises, plans, plan_exercises, goals_per_user, password_hash, until, using):
+    """
+    Everything a worker needs to generate its chunks. Users, exercises and plans get explicit ids
+    after the current maximum, so references can be computed instead of looked up.
+    """
+    def next_id(model):
+        return (model.objects.using(using).aggregate(last=Max('id'))['last'] or 0) + 1
+
+    return {
+        'seed': seed,
+        'users': users,
+        'trainers': max(1, (users + TRAINER_EVERY - 1) // TRAINER_EVERY),
+        'exercises': exercises,
+        'plans': plans,
+        'plan_exercises': plan_exercises,
+        'goals_per_user': goals_per_user,
+        'password': password_hash,
+        'until': until,
+        'using': using,
+        'user_base': next_id(User),
+        'exercise_base': next_id(Exercise),
+        'plan_base': next_id(WorkoutPlan),
+    }
+
+
+def run(spec, chunk_size, workers, progress=None):
+    """
+    Generate every phase in order, the chunks of a phase in parallel when workers > 1.
+    `progress(table, rows)` is called as chunks finish. Returns {database table: rows written}.
+    """
+    written = {}
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'), initializer=django.setup)
+
+    try:
+        for table, _, size in PHASES:
+            total = spec[size]
+            tasks = [(table, index, start, min(start + chunk_size, total)) for index, start in enumerate(range(0, total, chunk_size))]
+            # The parent's connection must not be shared with (or hold locks against) the workers
+            connections.close_all()
+            results = pool.map(partial(write_chunk, spec), tasks) if pool else map(partial(write_chunk, spec), tasks)
+            for counts in results:
+                for db_table, rows in counts.items():
+                    written[db_table] = written.get(db_table, 0) + rows
+                    if progress:
+                        progress(db_table, rows)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    # Explicit ids leave the sequences behind
+    connection = connections[spec['using']]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [User, Exercise, WorkoutPlan]):
+            cursor.execute(sql)
+    return written
@@ -0,0 +1,6 @@
+from django.contrib import admin
+from .models import BodyMetric, BodyMetricRollup
+# Register your models here.
+
+admin.site.register(BodyMetric)
+admin.site.register(BodyMetricRollup)
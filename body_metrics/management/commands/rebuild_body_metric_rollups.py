@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from body_metrics.models import BodyMetric, BodyMetricRollup
+from body_metrics.rollups import PERIODS, period_start, rebuild_bucket
+
+
+class Command(BaseCommand):
+    help = "Recompute body metric rollups from the raw samples, for every user or one user."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Only rebuild the rollups of this user id.")
+
+    def handle(self, *args, **options):
+        samples = BodyMetric.objects.select_related('user').order_by('user_id', 'metric')
+        if options['user']:
+            samples = samples.filter(user_id=options['user'])
+
+        rebuilt = 0
+        current_key, buckets, user = None, set(), None
+        for sample in samples.only('user', 'metric', 'measured_at').iterator(chunk_size=5000):
+            key = (sample.user_id, sample.metric)
+            if key != current_key:
+                rebuilt += self._rebuild(user, current_key, buckets)
+                current_key, buckets, user = key, set(), sample.user
+            for period in PERIODS:
+                buckets.add((period, period_start(sample.measured_at, period)))
+        rebuilt += self._rebuild(user, current_key, buckets)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} rollups."))
+
+    @transaction.atomic
+    def _rebuild(self, user, key, buckets):
+        if key is None:
+            return 0
+        # Drop stale rollups whose samples are gone, then recompute the live ones
+        BodyMetricRollup.objects.filter(user=user, metric=key[1]).delete()
+        for period, start in buckets:
+            rebuild_bucket(user, key[1], period, start)
+        return len(buckets)
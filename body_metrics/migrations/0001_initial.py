@@ -0,0 +1,54 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:27
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BodyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unique_id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True)),
+                ('metric', models.CharField(choices=[('weight', 'Weight (kg)'), ('height', 'Height (m)'), ('body_fat', 'Body fat (%)'), ('resting_heart_rate', 'Resting heart rate (bpm)'), ('waist', 'Waist circumference (cm)'), ('muscle_mass', 'Muscle mass (kg)')], max_length=30)),
+                ('value', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('measured_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='body_metrics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Body Metrics',
+                'indexes': [models.Index(fields=['user', 'metric', 'measured_at'], name='body_metric_user_id_b582f5_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BodyMetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('weight', 'Weight (kg)'), ('height', 'Height (m)'), ('body_fat', 'Body fat (%)'), ('resting_heart_rate', 'Resting heart rate (bpm)'), ('waist', 'Waist circumference (cm)'), ('muscle_mass', 'Muscle mass (kg)')], max_length=30)),
+                ('period', models.CharField(choices=[('day', 'day'), ('week', 'week'), ('month', 'month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('min_value', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('max_value', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('sum_value', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('count', models.PositiveIntegerField()),
+                ('last_value', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('last_measured_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='body_metric_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Body Metric Rollups',
+                'constraints': [models.UniqueConstraint(fields=('user', 'metric', 'period', 'period_start'), name='unique_body_metric_rollup')],
+            },
+        ),
+    ]
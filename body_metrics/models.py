@@ -0,0 +1,72 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+import uuid
+from users.models import User
+
+
+class BodyMetric(models.Model):
+    """
+    One raw body measurement sample, e.g. a weigh-in.
+    """
+
+    METRIC_CHOICES = [
+        ('weight', 'Weight (kg)'),
+        ('height', 'Height (m)'),
+        ('body_fat', 'Body fat (%)'),
+        ('resting_heart_rate', 'Resting heart rate (bpm)'),
+        ('waist', 'Waist circumference (cm)'),
+        ('muscle_mass', 'Muscle mass (kg)'),
+    ]
+
+    unique_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, db_index=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='body_metrics')
+    metric = models.CharField(max_length=30, choices=METRIC_CHOICES)
+    value = models.DecimalField(max_digits=7, decimal_places=2)
+    measured_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = _("Body Metrics")
+        indexes = [
+            models.Index(fields=['user', 'metric', 'measured_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}: {self.value} at {self.measured_at}"
+
+
+class BodyMetricRollup(models.Model):
+    """
+    Pre-aggregated body metric values for one day, week (starting Monday) or month.
+    Average is stored as sum and count so it can be maintained incrementally.
+    """
+
+    PERIOD_CHOICES = [
+        ('day', 'day'),
+        ('week', 'week'),
+        ('month', 'month'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='body_metric_rollups')
+    metric = models.CharField(max_length=30, choices=BodyMetric.METRIC_CHOICES)
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    min_value = models.DecimalField(max_digits=7, decimal_places=2)
+    max_value = models.DecimalField(max_digits=7, decimal_places=2)
+    sum_value = models.DecimalField(max_digits=14, decimal_places=2)
+    count = models.PositiveIntegerField()
+    last_value = models.DecimalField(max_digits=7, decimal_places=2)
+    last_measured_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = _("Body Metric Rollups")
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'metric', 'period', 'period_start'], name='unique_body_metric_rollup'),
+        ]
+
+    @property
+    def avg_value(self):
+        return round(self.sum_value / self.count, 2) if self.count else None
+
+    def __str__(self):
+        return f"{self.metric} {self.period} rollup from {self.period_start}"
@@ -0,0 +1,157 @@
+from datetime import datetime, time, timedelta
+from django.db import transaction, IntegrityError
+from django.db.models import F, Value, Case, When, Min, Max, Sum, Count, DecimalField, DateTimeField
+from django.db.models.functions import Least, Greatest
+from django.utils import timezone
+from .models import BodyMetric, BodyMetricRollup
+
+PERIODS = ('day', 'week', 'month')
+
+# Metrics mirrored onto the User row, which keeps holding the current value
+PROFILE_METRICS = ('weight', 'height')
+
+
+def period_start(measured_at, period):
+    day = timezone.localtime(measured_at).date()
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def period_end(start, period):
+    if period == 'day':
+        return start + timedelta(days=1)
+    if period == 'week':
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _aggregate(samples):
+    """
+    Fold samples into one partial aggregate per (metric, period, period_start) bucket.
+    """
+    buckets = {}
+    for sample in samples:
+        for period in PERIODS:
+            key = (sample.metric, period, period_start(sample.measured_at, period))
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {
+                    "min": sample.value, "max": sample.value, "sum": sample.value, "count": 1,
+                    "last": sample.value, "last_at": sample.measured_at,
+                }
+                continue
+            bucket["min"] = min(bucket["min"], sample.value)
+            bucket["max"] = max(bucket["max"], sample.value)
+            bucket["sum"] += sample.value
+            bucket["count"] += 1
+            if sample.measured_at >= bucket["last_at"]:
+                bucket["last"] = sample.value
+                bucket["last_at"] = sample.measured_at
+    return buckets
+
+
+def _merge_bucket(user, metric, period, start, bucket):
+    """
+    Merge a partial aggregate into the stored rollup with a single UPDATE,
+    creating the rollup row the first time the bucket is seen.
+    """
+    decimal = DecimalField(max_digits=14, decimal_places=2)
+    rollups = BodyMetricRollup.objects.filter(user=user, metric=metric, period=period, period_start=start)
+    updates = {
+        "min_value": Least(F('min_value'), Value(bucket["min"], output_field=decimal)),
+        "max_value": Greatest(F('max_value'), Value(bucket["max"], output_field=decimal)),
+        "sum_value": F('sum_value') + Value(bucket["sum"], output_field=decimal),
+        "count": F('count') + bucket["count"],
+        "last_value": Case(
+            When(last_measured_at__lte=bucket["last_at"], then=Value(bucket["last"], output_field=decimal)),
+            default=F('last_value'),
+        ),
+        "last_measured_at": Greatest(F('last_measured_at'), Value(bucket["last_at"], output_field=DateTimeField())),
+    }
+
+    if rollups.update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            BodyMetricRollup.objects.create(
+                user=user, metric=metric, period=period, period_start=start,
+                min_value=bucket["min"], max_value=bucket["max"], sum_value=bucket["sum"], count=bucket["count"],
+                last_value=bucket["last"], last_measured_at=bucket["last_at"],
+            )
+    except IntegrityError:
+        # Created concurrently, the row exists now
+        rollups.update(**updates)
+
+
+def _sync_profile(user, metrics):
+    changed = []
+    for metric in metrics:
+        latest = (
+            BodyMetric.objects.filter(user=user, metric=metric)
+            .order_by('-measured_at', '-id')
+            .values_list('value', flat=True)
+            .first()
+        )
+        if latest is not None and getattr(user, metric) != latest:
+            setattr(user, metric, latest)
+            changed.append(metric)
+    if changed:
+        # save() rather than update() so the profile cache receivers run
+        user.save(update_fields=changed)
+
+
+@transaction.atomic
+def record_samples(user, samples, sync_profile=True):
+    """
+    Store raw samples and fold them into the day/week/month rollups.
+
+    `samples` is an iterable of dicts with metric, value and measured_at. Cost is one
+    bulk insert plus one UPDATE per touched bucket, independent of how much history exists.
+    When `sync_profile` is set, User.weight/User.height follow the latest sample.
+    """
+    body_metrics = BodyMetric.objects.bulk_create([
+        BodyMetric(user=user, metric=sample['metric'], value=sample['value'], measured_at=sample['measured_at'])
+        for sample in samples
+    ])
+
+    for (metric, period, start), bucket in sorted(_aggregate(body_metrics).items()):
+        _merge_bucket(user, metric, period, start, bucket)
+
+    if sync_profile:
+        _sync_profile(user, {sample.metric for sample in body_metrics if sample.metric in PROFILE_METRICS})
+
+    return body_metrics
+
+
+def rebuild_bucket(user, metric, period, start):
+    """
+    Recompute one rollup from the raw samples. Needed after deletes, since min/max/last can't be undone incrementally.
+    """
+    start_at = timezone.make_aware(datetime.combine(start, time.min))
+    end_at = timezone.make_aware(datetime.combine(period_end(start, period), time.min))
+    samples = BodyMetric.objects.filter(user=user, metric=metric, measured_at__gte=start_at, measured_at__lt=end_at)
+
+    totals = samples.aggregate(min_value=Min('value'), max_value=Max('value'), sum_value=Sum('value'), count=Count('id'))
+    if not totals['count']:
+        BodyMetricRollup.objects.filter(user=user, metric=metric, period=period, period_start=start).delete()
+        return
+
+    last = samples.order_by('-measured_at', '-id').values('value', 'measured_at').first()
+    BodyMetricRollup.objects.update_or_create(
+        user=user, metric=metric, period=period, period_start=start,
+        defaults={**totals, 'last_value': last['value'], 'last_measured_at': last['measured_at']},
+    )
+
+
+@transaction.atomic
+def delete_sample(body_metric):
+    user, metric, measured_at = body_metric.user, body_metric.metric, body_metric.measured_at
+    body_metric.delete()
+    for period in PERIODS:
+        rebuild_bucket(user, metric, period, period_start(measured_at, period))
+    if metric in PROFILE_METRICS:
+        _sync_profile(user, [metric])
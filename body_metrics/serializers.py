@@ -0,0 +1,44 @@
+from rest_framework import serializers
+from decimal import Decimal
+from .models import BodyMetric, BodyMetricRollup
+
+# Plausible ranges per metric, weight and height match the User model validators
+METRIC_RANGES = {
+    'weight': (Decimal('2.00'), Decimal('300.00')),
+    'height': (Decimal('0.50'), Decimal('2.50')),
+    'body_fat': (Decimal('1.00'), Decimal('75.00')),
+    'resting_heart_rate': (Decimal('20.00'), Decimal('250.00')),
+    'waist': (Decimal('30.00'), Decimal('250.00')),
+    'muscle_mass': (Decimal('1.00'), Decimal('200.00')),
+}
+
+
+class BodyMetricSampleSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = BodyMetric
+        fields = ('unique_id', 'metric', 'value', 'measured_at')
+        read_only_fields = ('unique_id',)
+
+    def validate(self, attrs):
+        low, high = METRIC_RANGES[attrs['metric']]
+        if not low <= attrs['value'] <= high:
+            raise serializers.ValidationError({"value": f"{attrs['metric']} must be between {low} and {high}."})
+        return attrs
+
+
+class RecordBodyMetricsSerializer(serializers.Serializer):
+    samples = BodyMetricSampleSerializer(many=True, max_length=1000)
+
+    def validate_samples(self, samples):
+        if not samples:
+            raise serializers.ValidationError("No samples provided.")
+        return samples
+
+
+class BodyMetricRollupSerializer(serializers.ModelSerializer):
+    avg_value = serializers.DecimalField(max_digits=7, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = BodyMetricRollup
+        fields = ('period_start', 'min_value', 'max_value', 'avg_value', 'last_value', 'last_measured_at', 'count')
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import BodyMetricView, BodyMetricDeleteView
+
+urlpatterns = [
+    path('', BodyMetricView.as_view(), name='body_metrics'),
+    path('<str:unique_id>/delete/', BodyMetricDeleteView.as_view(), name='body_metric_delete'),
+]
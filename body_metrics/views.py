@@ -0,0 +1,90 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from django.utils.dateparse import parse_date
+from uuid import UUID
+from .models import BodyMetric, BodyMetricRollup
+from .serializers import RecordBodyMetricsSerializer, BodyMetricSampleSerializer, BodyMetricRollupSerializer
+from .rollups import record_samples, delete_sample
+
+MAX_POINTS = 500
+
+
+class BodyMetricView(APIView):
+    """
+    GET: chart data for one metric of the current user.
+        - metric: one of the body metric names (default weight).
+        - period: day, week, month (pre-aggregated rollups) or raw samples (default day).
+        - start / end: optional YYYY-MM-DD bounds.
+        At most the latest 500 points are returned.
+    POST: record one or more samples, {"samples": [{"metric", "value", "measured_at"}]}.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = RecordBodyMetricsSerializer
+
+    def get(self, request):
+        metric = request.query_params.get('metric', 'weight')
+        if metric not in dict(BodyMetric.METRIC_CHOICES):
+            return Response({"detail": f"Unknown metric '{metric}'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        period = request.query_params.get('period', 'day')
+        if period not in ('raw', 'day', 'week', 'month'):
+            return Response({"detail": "period must be one of: raw, day, week, month."}, status=status.HTTP_400_BAD_REQUEST)
+
+        start = request.query_params.get('start')
+        end = request.query_params.get('end')
+        start_date = parse_date(start) if start else None
+        end_date = parse_date(end) if end else None
+        if (start and not start_date) or (end and not end_date):
+            return Response({"detail": "start and end must be dates in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if period == 'raw':
+            queryset = BodyMetric.objects.filter(user=request.user, metric=metric)
+            if start_date:
+                queryset = queryset.filter(measured_at__date__gte=start_date)
+            if end_date:
+                queryset = queryset.filter(measured_at__date__lte=end_date)
+            points = list(queryset.order_by('-measured_at')[:MAX_POINTS])[::-1]
+            data = BodyMetricSampleSerializer(points, many=True).data
+        else:
+            queryset = BodyMetricRollup.objects.filter(user=request.user, metric=metric, period=period)
+            if start_date:
+                queryset = queryset.filter(period_start__gte=start_date)
+            if end_date:
+                queryset = queryset.filter(period_start__lte=end_date)
+            points = list(queryset.order_by('-period_start')[:MAX_POINTS])[::-1]
+            data = BodyMetricRollupSerializer(points, many=True).data
+
+        return Response({"metric": metric, "period": period, "points": data}, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid():
+            body_metrics = record_samples(request.user, serializer.validated_data['samples'])
+            return Response({
+                "message": f"{len(body_metrics)} samples recorded successfully.",
+                "data": BodyMetricSampleSerializer(body_metrics, many=True).data,
+            }, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class BodyMetricDeleteView(APIView):
+    """
+    Delete a wrongly recorded sample, the rollups it belonged to are recomputed.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def delete(self, request, unique_id):
+        try:
+            UUID(unique_id, version=4)
+            body_metric = BodyMetric.objects.select_related('user').get(unique_id=unique_id, user=request.user)
+        except ValueError:
+            raise NotFound({"detail": "The provided unique ID is not in a valid format. Please check and try again."})
+        except BodyMetric.DoesNotExist:
+            raise NotFound({"detail": "The requested sample does not exist or you do not have permission to access it."})
+
+        delete_sample(body_metric)
+        return Response({"detail": "Sample deleted successfully."}, status=status.HTTP_200_OK)
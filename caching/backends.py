@@ -0,0 +1,369 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import RedisError
+from metrics.cache import RedisCache
+from metrics.registry import CACHE_REQUESTS, CACHE_ERRORS, CACHE_DEGRADED_CALLS, cache_namespace
+from .breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+_missing = object()
+
+# Connection failures, timeouts and protocol errors of redis-py and django-redis
+REDIS_ERRORS = (RedisError, ConnectionInterrupted, OSError)
+
+# Published instead of a key to drop every local entry (clear())
+CLEAR_ALL = '*'
+
+# Seconds between attempts to resubscribe after Redis went away
+RESUBSCRIBE_DELAY = 1.0
+
+# How long the listener waits for a message before checking the connection again
+LISTEN_POLL_INTERVAL = 1.0
+
+# Expiry of local entries written in degraded mode without a timeout
+LOCAL_FOREVER = 365 * 24 * 3600
+
+
+class LocalLRU:
+    """
+    Bounded, thread safe LRU of pickled values with a per entry expiry. Values are pickled like in
+    LocMemCache, so callers never share (and mutate) one object.
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, stale=False):
+        """
+        The value, or _missing. `stale` also returns expired entries (degraded mode), which are kept
+        for it until they are overwritten or evicted.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _missing
+            expires_at, pickled = entry
+            if expires_at <= time.monotonic() and not stale:
+                return _missing
+            self._entries.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout=None):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store(key, pickled, timeout)
+
+    def add(self, key, value, timeout=None):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            self._store(key, pickled, timeout)
+            return True
+
+    def _store(self, key, pickled, timeout):
+        self._entries[key] = (time.monotonic() + (self.timeout if timeout is None else timeout), pickled)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheUnavailable(Exception):
+    """
+    Redis failed or the circuit breaker is open, the caller falls back to the local tier.
+    """
+
+
+class TieredRedisCache(RedisCache):
+    """
+    django-redis cache with a small per-process LRU in front of it for keys starting with one of
+    OPTIONS['LOCAL_CACHE']['KEY_PREFIXES']. A local hit costs no network round trip.
+
+    Every write of such a key (set, delete, incr, ...) evicts the local copies in all processes by
+    publishing the key on a Redis channel; each process listens from a daemon thread. Delivery is
+    asynchronous, so another process can serve the old value for a moment, never longer than
+    'TIMEOUT' seconds. While the listener is not subscribed (Redis down, startup) local copies are
+    not used.
+
+    Redis calls go through a circuit breaker (OPTIONS['CIRCUIT_BREAKER']). With the socket timeouts
+    of the connection pool, a stalled Redis costs at most a timeout per call until the breaker
+    opens. While it is open (degraded mode) reads are served by the local tier, expired entries
+    included, and writes only reach the local tier, so throttles and get_or_compute() keep working
+    per process; keys of the local tier written then still expire within 'TIMEOUT'. The local tier is
+    dropped when the breaker closes again.
+    """
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        options = params.get('OPTIONS', {})
+        local = options.get('LOCAL_CACHE', {})
+        self.local_prefixes = tuple(local.get('KEY_PREFIXES', ()))
+        self.local = LocalLRU(local.get('MAX_ENTRIES', 1000), local.get('TIMEOUT', 5))
+        breaker = options.get('CIRCUIT_BREAKER', {})
+        self.breaker = CircuitBreaker(
+            failure_threshold=breaker.get('FAILURE_THRESHOLD', 5),
+            cooldown=breaker.get('COOLDOWN', 10),
+            on_close=self.local.clear,
+        )
+        self.channel = f"{self.key_prefix}:cache:invalidate"
+        self._listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        self._subscribed = threading.Event()
+
+    def _is_local(self, key):
+        return bool(self.local_prefixes) and str(key).startswith(self.local_prefixes)
+
+    def redis_call(self, operation, call, *args, **kwargs):
+        """
+        Run a Redis call through the circuit breaker, raising CacheUnavailable instead of Redis errors.
+        Other code using this Redis (e.g. throttling) calls it too, so they share the breaker.
+        """
+        if not self.breaker.allow():
+            CACHE_DEGRADED_CALLS.labels(operation).inc()
+            raise CacheUnavailable()
+        try:
+            result = call(*args, **kwargs)
+        except REDIS_ERRORS as exc:
+            self.breaker.record_failure()
+            CACHE_ERRORS.labels(operation).inc()
+            CACHE_DEGRADED_CALLS.labels(operation).inc()
+            logger.warning("Cache %s failed, using the local tier: %r", operation, exc)
+            raise CacheUnavailable() from exc
+        self.breaker.record_success()
+        return result
+
+    def _local_timeout(self, key, timeout):
+        # Expiry of an entry written to the local tier in degraded mode. Keys of the local tier are
+        # also served by get() as plain local hits while the listener is subscribed, which skips the
+        # breaker: they keep the local TIMEOUT bound, the stale fallback still finds them afterwards.
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        timeout = LOCAL_FOREVER if timeout is None else timeout
+        return min(timeout, self.local.timeout) if self._is_local(key) else timeout
+
+    # Invalidation
+
+    def _ensure_listener(self):
+        """
+        Start the listener lazily, so each worker process (forked after import) gets its own thread.
+        """
+        if self._listener is not None and self._listener.is_alive() and self._listener_pid == os.getpid():
+            return
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive() or self._listener_pid != os.getpid():
+                self._subscribed.clear()
+                self.local.clear()
+                self._listener_pid = os.getpid()
+                self._listener = threading.Thread(target=self._listen, name='cache-invalidation', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.client.get_client(write=False).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Entries cached while unsubscribed may have missed an eviction
+                self.local.clear()
+                self._subscribed.set()
+                while True:
+                    # Waits without the socket read timeout, which would drop an idle subscription
+                    message = pubsub.get_message(timeout=LISTEN_POLL_INTERVAL)
+                    if message is None:
+                        continue
+                    key = message['data'].decode()
+                    if key == CLEAR_ALL:
+                        self.local.clear()
+                    else:
+                        self.local.delete(key)
+            except REDIS_ERRORS:
+                if self._subscribed.is_set():
+                    logger.warning("Cache invalidation listener lost its Redis connection, retrying", exc_info=True)
+            finally:
+                self._subscribed.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except REDIS_ERRORS:
+                        pass
+            time.sleep(RESUBSCRIBE_DELAY)
+
+    def _local_ready(self):
+        self._ensure_listener()
+        return self._subscribed.is_set()
+
+    def _publish(self, messages):
+        def publish():
+            pipe = self.client.get_client(write=True).pipeline(transaction=False)
+            for message in messages:
+                pipe.publish(self.channel, message)
+            pipe.execute()
+
+        try:
+            self.redis_call('publish', publish)
+        except CacheUnavailable:
+            # Copies in the other processes expire within the local TIMEOUT
+            pass
+
+    def _changed(self, keys, version=None):
+        """
+        Evict `keys` here and announce it to the other processes.
+        """
+        full_keys = [self.make_key(key, version=version) for key in keys if self._is_local(key)]
+        if not full_keys:
+            return
+        for full_key in full_keys:
+            self.local.delete(full_key)
+        self._publish(full_keys)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None, **kwargs):
+        full_key = self.make_key(key, version=version)
+        local = self._is_local(key) and self._local_ready()
+        if local:
+            value = self.local.get(full_key)
+            if value is not _missing:
+                CACHE_REQUESTS.labels(cache_namespace(key), 'local_hit').inc()
+                return value
+
+        try:
+            value = self.redis_call('get', super().get, key, _missing, version=version, **kwargs)
+        except CacheUnavailable:
+            value = self.local.get(full_key, stale=True)
+            return default if value is _missing else value
+
+        if value is _missing:
+            return default
+        if local:
+            self.local.set(full_key, value)
+        return value
+
+    def get_many(self, keys, version=None, **kwargs):
+        keys = list(keys)
+        try:
+            return self.redis_call('get_many', super().get_many, keys, version=version, **kwargs)
+        except CacheUnavailable:
+            values = {key: self.local.get(self.make_key(key, version=version), stale=True) for key in keys}
+            return {key: value for key, value in values.items() if value is not _missing}
+
+    def has_key(self, key, version=None, **kwargs):
+        try:
+            return self.redis_call('has_key', super().has_key, key, version=version, **kwargs)
+        except CacheUnavailable:
+            return self.local.get(self.make_key(key, version=version), stale=True) is not _missing
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        try:
+            result = self.redis_call('set', super().set, key, value, timeout=timeout, version=version, **kwargs)
+        except CacheUnavailable:
+            self.local.set(self.make_key(key, version=version), value, self._local_timeout(key, timeout))
+            return True
+        # Not stored locally: our own invalidation message would evict it again
+        self._changed([key], version)
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        try:
+            result = self.redis_call('add', super().add, key, value, timeout=timeout, version=version, **kwargs)
+        except CacheUnavailable:
+            return self.local.add(self.make_key(key, version=version), value, self._local_timeout(key, timeout))
+        if result:
+            self._changed([key], version)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        try:
+            result = self.redis_call('set_many', super().set_many, data, timeout=timeout, version=version, **kwargs)
+        except CacheUnavailable:
+            for key, value in data.items():
+                self.local.set(self.make_key(key, version=version), value, self._local_timeout(key, timeout))
+            return []
+        self._changed(list(data), version)
+        return result
+
+    def delete(self, key, version=None, **kwargs):
+        try:
+            result = self.redis_call('delete', super().delete, key, version=version, **kwargs)
+        except CacheUnavailable:
+            return self.local.delete(self.make_key(key, version=version))
+        self._changed([key], version)
+        return result
+
+    def delete_many(self, keys, version=None, **kwargs):
+        keys = list(keys)
+        try:
+            result = self.redis_call('delete_many', super().delete_many, keys, version=version, **kwargs)
+        except CacheUnavailable:
+            for key in keys:
+                self.local.delete(self.make_key(key, version=version))
+            return None
+        self._changed(keys, version)
+        return result
+
+    def incr(self, key, delta=1, version=None, **kwargs):
+        try:
+            result = self.redis_call('incr', super().incr, key, delta, version=version, **kwargs)
+        except CacheUnavailable:
+            return self._local_incr(key, delta, version)
+        self._changed([key], version)
+        return result
+
+    def decr(self, key, delta=1, version=None, **kwargs):
+        try:
+            result = self.redis_call('decr', super().decr, key, delta, version=version, **kwargs)
+        except CacheUnavailable:
+            return self._local_incr(key, -delta, version)
+        self._changed([key], version)
+        return result
+
+    def _local_incr(self, key, delta, version):
+        full_key = self.make_key(key, version=version)
+        value = self.local.get(full_key, stale=True)
+        if value is _missing:
+            raise ValueError(f"Key '{key}' not found")
+        self.local.set(full_key, value + delta, self._local_timeout(key, None))
+        return value + delta
+
+    def delete_pattern(self, *args, **kwargs):
+        try:
+            result = self.redis_call('delete_pattern', super().delete_pattern, *args, **kwargs)
+        except CacheUnavailable:
+            # The local tier can't match Redis patterns, drop all of it
+            self.local.clear()
+            return 0
+        self._clear_everywhere()
+        return result
+
+    def clear(self):
+        try:
+            result = self.redis_call('clear', super().clear)
+        except CacheUnavailable:
+            self.local.clear()
+            return None
+        self._clear_everywhere()
+        return result
+
+    def _clear_everywhere(self):
+        self.local.clear()
+        self._publish([CLEAR_ALL])
@@ -0,0 +1,61 @@
+import threading
+import time
+from metrics.registry import CACHE_BREAKER_STATE, CACHE_BREAKER_TRANSITIONS
+
+CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Consecutive failure breaker. After `failure_threshold` failures in a row the circuit opens and
+    allow() refuses calls for `cooldown` seconds; then a single trial call is let through (half
+    open) and its outcome closes or reopens the circuit. `on_close` runs when the circuit closes
+    again.
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=10.0, on_close=None):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.on_close = on_close
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+        CACHE_BREAKER_STATE.set(STATE_VALUES[CLOSED])
+
+    def allow(self):
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            # This caller runs the trial call, everybody else keeps skipping Redis until it reports back
+            # (a trial that never does, e.g. a non Redis error, is retried after another cooldown)
+            if self.state != CLOSED and time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = time.monotonic()
+                self._move(HALF_OPEN)
+                return True
+            return self.state == CLOSED
+
+    def record_success(self):
+        if self.state == CLOSED and not self.failures:
+            return
+        with self._lock:
+            self.failures = 0
+            closed = self.state != CLOSED
+            if closed:
+                self._move(CLOSED)
+        if closed and self.on_close:
+            self.on_close()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._move(OPEN)
+
+    def _move(self, state):
+        self.state = state
+        CACHE_BREAKER_STATE.set(STATE_VALUES[state])
+        CACHE_BREAKER_TRANSITIONS.labels(state).inc()
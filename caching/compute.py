@@ -0,0 +1,77 @@
+import math
+import random
+import time
+from collections import namedtuple
+from django.core.cache import cache
+
+# What get_or_compute() stores: the value, when it expires (epoch seconds) and how long it took to compute
+Computed = namedtuple('Computed', ['value', 'expires_at', 'delta'])
+
+# How long a recomputation may hold the lock before others stop waiting for it
+LOCK_TIMEOUT = 10
+
+# Pause between checks while another process computes a missing value
+WAIT_INTERVAL = 0.05
+
+
+def lock_key(key):
+    return f"lock:{key}"
+
+
+def _should_refresh(entry, beta):
+    """
+    Probabilistic early expiration (XFetch): the closer to expiry and the slower the computation,
+    the likelier a reader refreshes ahead of time, so one request recomputes a hot key instead of
+    every request at the moment it expires.
+    """
+    now = time.time()
+    # 1 - random() is in (0, 1], log() of it is <= 0
+    return now - entry.delta * beta * math.log(1 - random.random()) >= entry.expires_at
+
+
+def _compute_and_store(key, compute, timeout, version):
+    started = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - started
+    cache.set(key, Computed(value, time.time() + timeout, delta), timeout=timeout, version=version)
+    return value
+
+
+def get_or_compute(key, compute, timeout, version=None, beta=1.0, lock_timeout=LOCK_TIMEOUT):
+    """
+    Return the cached value of `key`, calling `compute()` to fill it on a miss.
+
+    Single flight: only the caller that takes the lock (cache.add, atomic in Redis) computes; while
+    it does, others get the previous value if there is one, or wait for the new one up to
+    `lock_timeout` seconds and then compute it themselves. Hot keys are refreshed early (see
+    _should_refresh, `beta` > 1 favours earlier refreshes), so they don't expire for every
+    reader at the same moment.
+    """
+    entry = cache.get(key, version=version)
+    if not isinstance(entry, Computed):
+        # Missing, or written by plain cache.set()
+        entry = None
+    if entry is not None and not _should_refresh(entry, beta):
+        return entry.value
+
+    lock = lock_key(key)
+    if cache.add(lock, True, timeout=lock_timeout, version=version):
+        try:
+            return _compute_and_store(key, compute, timeout, version)
+        finally:
+            cache.delete(lock, version=version)
+
+    if entry is not None:
+        # Someone else is refreshing it
+        return entry.value
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key, version=version)
+        if isinstance(entry, Computed):
+            return entry.value
+        if cache.get(lock, version=version) is None:
+            # The holder failed (or its lock expired), take over
+            break
+    return _compute_and_store(key, compute, timeout, version)
@@ -0,0 +1,315 @@
+import logging
+import threading
+import time
+import fakeredis
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, override_settings
+from redis.exceptions import ConnectionError
+from .backends import LocalLRU, TieredRedisCache, CacheUnavailable, _missing
+from .breaker import CLOSED, HALF_OPEN, OPEN
+from .compute import Computed, get_or_compute, lock_key
+
+FAILURE_THRESHOLD = 3
+COOLDOWN = 10
+
+
+def tiered_cache_settings(local_timeout=5):
+    """
+    A TieredRedisCache on fakeredis, local tier for 'user_detail_' keys.
+    """
+    return {
+        'BACKEND': 'caching.backends.TieredRedisCache',
+        'LOCATION': 'redis://localhost:6379/3',
+        'KEY_PREFIX': 'test',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'CONNECTION_POOL_KWARGS': {'connection_class': fakeredis.FakeConnection},
+            'CIRCUIT_BREAKER': {'FAILURE_THRESHOLD': FAILURE_THRESHOLD, 'COOLDOWN': COOLDOWN},
+            'LOCAL_CACHE': {'KEY_PREFIXES': ('user_detail_',), 'MAX_ENTRIES': 100, 'TIMEOUT': local_timeout},
+        },
+    }
+
+
+def tiered_cache(local_timeout=5):
+    params = tiered_cache_settings(local_timeout)
+    return TieredRedisCache(params.pop('LOCATION'), params)
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def fail():
+    raise ConnectionError("Redis is down")
+
+
+class TieredCacheTestCase(SimpleTestCase):
+
+    local_timeout = 5
+
+    def setUp(self):
+        # The failed calls log warnings
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.cache = tiered_cache(self.local_timeout)
+        self.cache.client.get_client(write=True).flushdb()
+        self.assertTrue(self.cache._local_ready() or self.cache._subscribed.wait(2))
+
+    def local_copy(self, key):
+        return self.cache.local.get(self.cache.make_key(key), stale=True)
+
+
+class CircuitBreakerTests(TieredCacheTestCase):
+    """
+    The breaker of TieredRedisCache against a failing call, on a clock moved by hand.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.now = 1000.0
+        clock = mock.patch('caching.breaker.time')
+        clock.start().monotonic.side_effect = lambda: self.now
+        self.addCleanup(clock.stop)
+
+    def open_breaker(self):
+        for _ in range(FAILURE_THRESHOLD):
+            with self.assertRaises(CacheUnavailable):
+                self.cache.redis_call('test', fail)
+        self.assertEqual(self.cache.breaker.state, OPEN)
+
+    def test_opens_at_failure_threshold(self):
+        for _ in range(FAILURE_THRESHOLD - 1):
+            with self.assertRaises(CacheUnavailable):
+                self.cache.redis_call('test', fail)
+        self.assertEqual(self.cache.breaker.state, CLOSED)
+
+        self.open_breaker()
+        call = mock.Mock()
+        with self.assertRaises(CacheUnavailable):
+            self.cache.redis_call('test', call)
+        call.assert_not_called()
+
+    def test_one_trial_after_cooldown(self):
+        self.open_breaker()
+        self.now += COOLDOWN - 1
+        self.assertFalse(self.cache.breaker.allow())
+
+        self.now += 1
+        self.assertTrue(self.cache.breaker.allow())
+        self.assertEqual(self.cache.breaker.state, HALF_OPEN)
+        self.assertFalse(self.cache.breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        self.open_breaker()
+        self.now += COOLDOWN
+        with self.assertRaises(CacheUnavailable):
+            self.cache.redis_call('test', fail)
+        self.assertEqual(self.cache.breaker.state, OPEN)
+        self.assertFalse(self.cache.breaker.allow())
+
+    def test_close_clears_local_tier(self):
+        self.open_breaker()
+        self.cache.set('user_detail_1', 'degraded')
+        self.cache.set('throttle_1', 'degraded')
+
+        self.now += COOLDOWN
+        self.assertEqual(self.cache.redis_call('test', lambda: 'ok'), 'ok')
+        self.assertEqual(self.cache.breaker.state, CLOSED)
+        self.assertIs(self.local_copy('user_detail_1'), _missing)
+        self.assertIs(self.local_copy('throttle_1'), _missing)
+
+    def test_degraded_reads_and_writes_use_local_tier(self):
+        self.cache.set('throttle_1', 1)
+        self.open_breaker()
+        # Stale copies only exist for keys of the local tier
+        self.assertIsNone(self.cache.get('throttle_1'))
+
+        self.cache.set('throttle_1', 2)
+        self.assertEqual(self.cache.incr('throttle_1'), 3)
+        self.assertEqual(self.cache.get('throttle_1'), 3)
+        self.assertTrue(self.cache.add('throttle_2', 'a'))
+        self.assertFalse(self.cache.add('throttle_2', 'b'))
+        self.assertEqual(self.cache.get_many(['throttle_1', 'throttle_2', 'throttle_3']), {'throttle_1': 3, 'throttle_2': 'a'})
+        self.cache.delete('throttle_1')
+        self.assertIsNone(self.cache.get('throttle_1'))
+
+        self.assertEqual(self.cache.delete_pattern('throttle_*'), 0)
+        self.assertIs(self.local_copy('throttle_2'), _missing)
+
+    def test_degraded_writes_of_local_keys_keep_local_timeout(self):
+        self.open_breaker()
+        self.cache.set('user_detail_1', 'degraded', timeout=3600)
+        self.cache.set('throttle_1', 'degraded', timeout=3600)
+
+        expiries = {key: self.cache.local._entries[self.cache.make_key(key)][0] - time.monotonic() for key in ('user_detail_1', 'throttle_1')}
+        self.assertLessEqual(expiries['user_detail_1'], self.local_timeout)
+        self.assertGreater(expiries['throttle_1'], 3500)
+        self.assertEqual(self.cache.get('user_detail_1'), 'degraded')
+
+
+class DegradedLocalExpiryTests(TieredCacheTestCase):
+    """
+    A local key written in degraded mode stops being a local hit after the local TIMEOUT, so the
+    next read goes to the breaker (and Redis, once the cooldown is over).
+    """
+
+    local_timeout = 0.05
+
+    def test_expired_degraded_copy_goes_through_breaker(self):
+        for _ in range(FAILURE_THRESHOLD):
+            with self.assertRaises(CacheUnavailable):
+                self.cache.redis_call('test', fail)
+        self.cache.set('user_detail_1', 'degraded', timeout=3600)
+        self.assertEqual(self.cache.get('user_detail_1'), 'degraded')
+
+        time.sleep(self.local_timeout * 2)
+        # Still open: the stale copy is the fallback
+        self.assertEqual(self.cache.get('user_detail_1'), 'degraded')
+
+        self.cache.breaker.opened_at -= COOLDOWN
+        self.assertIsNone(self.cache.get('user_detail_1'))
+        self.assertEqual(self.cache.breaker.state, CLOSED)
+
+
+class LocalLRUTests(SimpleTestCase):
+
+    def test_expiry(self):
+        lru = LocalLRU(10, 60)
+        lru.set('a', [1], timeout=0.01)
+        lru.set('b', [2])
+        time.sleep(0.02)
+        self.assertIs(lru.get('a'), _missing)
+        self.assertEqual(lru.get('a', stale=True), [1])
+        self.assertEqual(lru.get('b'), [2])
+        self.assertTrue(lru.add('a', [3]))
+        self.assertFalse(lru.add('b', [4]))
+        self.assertEqual(lru.get('a'), [3])
+
+    def test_evicts_least_recently_used(self):
+        lru = LocalLRU(2, 60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertIs(lru.get('b', stale=True), _missing)
+        self.assertEqual((lru.get('a'), lru.get('c')), (1, 3))
+
+    def test_values_are_copies(self):
+        lru = LocalLRU(10, 60)
+        value = {'plans': []}
+        lru.set('a', value)
+        value['plans'].append(1)
+        lru.get('a')['plans'].append(2)
+        self.assertEqual(lru.get('a'), {'plans': []})
+
+
+class InvalidationTests(TieredCacheTestCase):
+    """
+    Writes in one process evict the local copies of the others through pub/sub.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other = tiered_cache(self.local_timeout)
+        self.assertTrue(self.other._local_ready() or self.other._subscribed.wait(2))
+
+    def other_copy(self, key):
+        return self.other.local.get(self.other.make_key(key))
+
+    def test_local_hit(self):
+        self.cache.set('user_detail_1', 'a')
+        self.assertEqual(self.other.get('user_detail_1'), 'a')
+        self.cache.client.get_client(write=True).delete(self.cache.make_key('user_detail_1'))
+        # Served locally, Redis is not read
+        self.assertEqual(self.other.get('user_detail_1'), 'a')
+
+    def test_set_evicts_other_copies(self):
+        self.cache.set('user_detail_1', 'old')
+        self.assertEqual(self.other.get('user_detail_1'), 'old')
+
+        self.cache.set('user_detail_1', 'new')
+        self.assertTrue(wait_for(lambda: self.other_copy('user_detail_1') is _missing))
+        self.assertEqual(self.other.get('user_detail_1'), 'new')
+
+    def test_delete_evicts_other_copies(self):
+        self.cache.set('user_detail_1', 'old')
+        self.assertEqual(self.other.get('user_detail_1'), 'old')
+
+        self.cache.delete('user_detail_1')
+        self.assertTrue(wait_for(lambda: self.other_copy('user_detail_1') is _missing))
+        self.assertIsNone(self.other.get('user_detail_1'))
+
+    def test_other_keys_not_stored_locally(self):
+        self.cache.set('throttle_1', 'a')
+        self.assertEqual(self.other.get('throttle_1'), 'a')
+        self.assertIs(self.other_copy('throttle_1'), _missing)
+
+
+@override_settings(CACHES={**settings.CACHES, 'default': tiered_cache_settings()})
+class GetOrComputeTests(SimpleTestCase):
+    """
+    Single flight and early refresh of get_or_compute() on TieredRedisCache.
+    """
+
+    key = 'computed'
+
+    def setUp(self):
+        self.assertIsInstance(caches['default'], TieredRedisCache)
+        cache.clear()
+        self.compute = mock.Mock(return_value='new')
+
+    def store(self, value, expires_in, delta=1.0):
+        cache.set(self.key, Computed(value, time.time() + expires_in, delta), timeout=60)
+
+    def test_miss_computes_and_stores(self):
+        self.assertEqual(get_or_compute(self.key, self.compute, timeout=60), 'new')
+        self.assertEqual(get_or_compute(self.key, self.compute, timeout=60), 'new')
+        self.compute.assert_called_once()
+        self.assertIsNone(cache.get(lock_key(self.key)))
+
+    def test_previous_value_while_lock_is_held(self):
+        # Expired, every reader wants to refresh it
+        self.store('old', expires_in=0)
+        cache.add(lock_key(self.key), True, timeout=10)
+        self.assertEqual(get_or_compute(self.key, self.compute, timeout=60), 'old')
+        self.compute.assert_not_called()
+
+    def test_waiter_gets_value_of_lock_holder(self):
+        cache.add(lock_key(self.key), True, timeout=10)
+
+        def holder():
+            time.sleep(0.1)
+            self.store('from holder', expires_in=60)
+            cache.delete(lock_key(self.key))
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        self.assertEqual(get_or_compute(self.key, self.compute, timeout=60), 'from holder')
+        thread.join()
+        self.compute.assert_not_called()
+
+    def test_waiter_takes_over_when_holder_fails(self):
+        cache.add(lock_key(self.key), True, timeout=10)
+        threading.Timer(0.1, cache.delete, [lock_key(self.key)]).start()
+        self.assertEqual(get_or_compute(self.key, self.compute, timeout=60), 'new')
+        self.compute.assert_called_once()
+
+    @mock.patch('caching.compute.random')
+    def test_refreshes_early_near_expiry(self, random):
+        # -log(1 - 0.9) * delta = 2.3 seconds ahead of expiry
+        random.random.return_value = 0.9
+        self.store('old', expires_in=3600)
+        self.assertEqual(get_or_compute(self.key, self.compute, timeout=60), 'old')
+        self.compute.assert_not_called()
+
+        self.store('old', expires_in=2)
+        self.assertEqual(get_or_compute(self.key, self.compute, timeout=60), 'new')
+        self.compute.assert_called_once()
+        self.assertEqual(cache.get(self.key).value, 'new')
@@ -0,0 +1,6 @@
+from django.contrib import admin
+from .models import Challenge, ChallengeParticipation
+# Register your models here.
+
+admin.site.register(Challenge)
+admin.site.register(ChallengeParticipation)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ChallengesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'challenges'
+
+    def ready(self):
+        import challenges.signals
@@ -0,0 +1,378 @@
+import json
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from redis.exceptions import RedisError
+from leaderboards.boards import get_redis
+from .models import Challenge, ChallengeParticipation
+
+logger = logging.getLogger(__name__)
+
+# Keys outlive the challenge so late uploads and the last flush still find them
+KEY_GRACE = timedelta(days=30)
+
+# Marks a user's challenge set as loaded even when the user is in no challenge
+LOADED_MARKER = "-"
+
+FLUSH_BATCH_SIZE = 1000
+
+# INCRBY of several counters, never restarting one from 0. KEYS: the counters. ARGV: per counter
+# the increment, the expiry (epoch seconds) and the value to seed a missing counter with, or '' to
+# leave it alone. Returns the new totals, -1 for a counter that is missing and was not seeded.
+SEEDED_INCRBY_SCRIPT = """
+local totals = {}
+for index, key in ipairs(KEYS) do
+    local seed = ARGV[index * 3]
+    if redis.call('EXISTS', key) == 1 then
+        totals[index] = redis.call('INCRBY', key, ARGV[index * 3 - 2])
+    elseif seed ~= '' then
+        redis.call('SET', key, seed, 'EXAT', ARGV[index * 3 - 1])
+        totals[index] = redis.call('INCRBY', key, ARGV[index * 3 - 2])
+    else
+        totals[index] = -1
+    end
+end
+return totals
+"""
+
+
+def _prefix():
+    return f"{settings.CACHES['default'].get('KEY_PREFIX', '')}:challenge"
+
+
+def meta_key(challenge_uid):
+    return f"{_prefix()}:{challenge_uid}:meta"
+
+
+def counter_key(challenge_uid, user_id):
+    return f"{_prefix()}:{challenge_uid}:progress:{user_id}"
+
+
+def completed_key(challenge_uid):
+    return f"{_prefix()}:{challenge_uid}:completed"
+
+
+def user_challenges_key(user_id):
+    return f"{_prefix()}:user:{user_id}"
+
+
+def dirty_key():
+    return f"{_prefix()}:dirty"
+
+
+def challenge_meta(challenge):
+    return {
+        "id": challenge.id,
+        "metric": challenge.metric,
+        "exercise_id": challenge.exercise_id,
+        "target": challenge.target,
+        "starts_at": challenge.starts_at.timestamp(),
+        "ends_at": challenge.ends_at.timestamp(),
+    }
+
+
+def _expire_at(meta):
+    return int(meta["ends_at"] + KEY_GRACE.total_seconds())
+
+
+def _store_meta(pipe, challenge_uid, meta):
+    pipe.set(meta_key(challenge_uid), json.dumps(meta), exat=_expire_at(meta))
+
+
+def forget_challenge(challenge_uid):
+    """
+    Drop the cached definition so the next read picks up the edited (or deleted) challenge.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(meta_key(challenge_uid))
+    except RedisError:
+        logger.exception("Could not drop cached challenge %s", challenge_uid)
+
+
+def _load_user(client, user_id):
+    """
+    Cold path, after a Redis restart or eviction: rebuild the user's challenge set, the definitions
+    and seed the counters from the last flushed progress. SET NX never overwrites a live counter.
+    """
+    participations = list(
+        ChallengeParticipation.objects.filter(user_id=user_id, challenge__ends_at__gte=timezone.now() - KEY_GRACE)
+        .select_related('challenge')
+    )
+    pipe = client.pipeline(transaction=False)
+    metas = {}
+    for participation in participations:
+        challenge = participation.challenge
+        meta = challenge_meta(challenge)
+        metas[str(challenge.unique_id)] = meta
+        _store_meta(pipe, challenge.unique_id, meta)
+        pipe.set(counter_key(challenge.unique_id, user_id), participation.progress, nx=True, exat=_expire_at(meta))
+        if participation.completed_at:
+            pipe.hsetnx(completed_key(challenge.unique_id), user_id, participation.completed_at.timestamp())
+    pipe.sadd(user_challenges_key(user_id), LOADED_MARKER, *metas.keys())
+    pipe.execute()
+    return metas
+
+
+def _load_metas(client, challenge_uids):
+    """
+    Definitions of the given challenges, from Redis and for the missing ones from the database.
+    """
+    cached = client.mget([meta_key(uid) for uid in challenge_uids]) if challenge_uids else []
+    metas = {uid: json.loads(raw) for uid, raw in zip(challenge_uids, cached) if raw}
+
+    missing = [uid for uid in challenge_uids if uid not in metas]
+    if missing:
+        pipe = client.pipeline(transaction=False)
+        for challenge in Challenge.objects.filter(unique_id__in=missing):
+            meta = challenge_meta(challenge)
+            metas[str(challenge.unique_id)] = meta
+            _store_meta(pipe, challenge.unique_id, meta)
+        pipe.execute()
+    return metas
+
+
+def user_challenges(client, user_id):
+    """
+    {challenge unique_id: definition} for every challenge the user is in.
+    """
+    members = client.smembers(user_challenges_key(user_id))
+    if not members:
+        return _load_user(client, user_id)
+
+    challenge_uids = [member.decode() for member in members if member.decode() != LOADED_MARKER]
+    metas = _load_metas(client, challenge_uids)
+
+    now = timezone.now().timestamp()
+    stale = [uid for uid in challenge_uids if uid not in metas or metas[uid]["ends_at"] + KEY_GRACE.total_seconds() < now]
+    if stale:
+        # Deleted or long finished challenges
+        client.srem(user_challenges_key(user_id), *stale)
+    return {uid: meta for uid, meta in metas.items() if uid not in stale}
+
+
+def contribution(meta, sessions, set_logs):
+    """
+    How much a batch of ingested activity adds to one challenge. Only activity performed
+    inside the challenge window counts, volume is rounded to whole kilograms.
+    """
+    starts_at, ends_at = meta["starts_at"], meta["ends_at"]
+
+    if meta["metric"] == 'sessions':
+        return sum(1 for session in sessions if starts_at <= session.started_at.timestamp() <= ends_at)
+
+    total = Decimal(0)
+    for set_log in set_logs:
+        if meta["exercise_id"] and set_log.exercise_id != meta["exercise_id"]:
+            continue
+        if not starts_at <= set_log.performed_at.timestamp() <= ends_at:
+            continue
+        if meta["metric"] == 'repetitions':
+            total += set_log.repetitions
+        elif meta["metric"] == 'volume':
+            total += Decimal(set_log.weight) * set_log.repetitions
+        else:
+            total += 1
+    return int(total.to_integral_value())
+
+
+def _record_in_db(user, sessions, set_logs):
+    """
+    Without Redis (e.g. local memory cache in development) progress is written straight to the rows.
+    """
+    now = timezone.now()
+    participations = ChallengeParticipation.objects.filter(user=user, challenge__ends_at__gte=now - KEY_GRACE).select_related('challenge')
+    for participation in participations:
+        added = contribution(challenge_meta(participation.challenge), sessions, set_logs)
+        if not added:
+            continue
+        ChallengeParticipation.objects.filter(pk=participation.pk).update(progress=F('progress') + added)
+        if not participation.completed_at and participation.progress + added >= participation.challenge.target:
+            ChallengeParticipation.objects.filter(pk=participation.pk, completed_at__isnull=True).update(completed_at=now)
+
+
+def _increment(client, user_id, increments, metas, seeds=None):
+    """
+    {challenge unique_id: new total} after adding `increments`. Counters that are missing (evicted,
+    expired) are seeded from `seeds`; without a seed they are left out.
+    """
+    seeds = seeds or {}
+    args = []
+    for uid, added in increments.items():
+        seed = seeds.get(uid)
+        args.extend([added, _expire_at(metas[uid]), '' if seed is None else seed])
+    totals = client.register_script(SEEDED_INCRBY_SCRIPT)(
+        keys=[counter_key(uid, user_id) for uid in increments], args=args,
+    )
+    return {uid: total for uid, total in zip(increments, totals) if total >= 0}
+
+
+def record_progress(user, sessions, set_logs):
+    """
+    Add a batch of ingested activity to the user's challenges.
+
+    Hot path: one SMEMBERS + one MGET to find the active challenges, then one script call doing an
+    INCRBY per challenge. INCRBY is atomic, so any number of participants can log at the same time
+    without touching a database row. A counter that went missing on its own (evicted while the
+    user's challenge set survived) is seeded from the last flushed progress in the same script, so it
+    never restarts from 0. The new totals are compared to the cached target, a crossing is recorded
+    with HSETNX so a participant completes exactly once. Touched counters are marked dirty and
+    written to Postgres later by `flush_progress`.
+    """
+    client = get_redis()
+    if client is None:
+        _record_in_db(user, sessions, set_logs)
+        return
+
+    try:
+        metas = user_challenges(client, user.id)
+        increments = {uid: contribution(meta, sessions, set_logs) for uid, meta in metas.items()}
+        increments = {uid: added for uid, added in increments.items() if added}
+        if not increments:
+            return
+
+        totals = _increment(client, user.id, increments, metas)
+        missing = {uid: added for uid, added in increments.items() if uid not in totals}
+        if missing:
+            # Cold path, seed from the database. A participation deleted meanwhile isn't counted.
+            seeds = {
+                str(uid): progress
+                for uid, progress in ChallengeParticipation.objects.filter(user=user, challenge__unique_id__in=missing)
+                .values_list('challenge__unique_id', 'progress')
+            }
+            totals.update(_increment(client, user.id, missing, metas, seeds))
+        if not totals:
+            return
+
+        now = timezone.now().timestamp()
+        pipe = client.pipeline(transaction=False)
+        pipe.sadd(dirty_key(), *(f"{uid}:{user.id}" for uid in totals))
+        for uid, total in totals.items():
+            added = increments[uid]
+            target = metas[uid]["target"]
+            if total - added < target <= total:
+                pipe.hsetnx(completed_key(uid), user.id, now)
+                pipe.expireat(completed_key(uid), _expire_at(metas[uid]))
+        pipe.execute()
+    except RedisError:
+        logger.exception("Could not update challenge progress for user %s", user.id)
+
+
+def join(challenge, user):
+    """
+    Add the user to a challenge. The Redis side is only touched once the row is committed.
+    """
+    participation, created = ChallengeParticipation.objects.get_or_create(challenge=challenge, user=user)
+    if created:
+        transaction.on_commit(lambda: _register(challenge, user.id))
+    return participation, created
+
+
+def _register(challenge, user_id):
+    client = get_redis()
+    if client is None:
+        return
+    meta = challenge_meta(challenge)
+    try:
+        pipe = client.pipeline(transaction=False)
+        _store_meta(pipe, challenge.unique_id, meta)
+        pipe.set(counter_key(challenge.unique_id, user_id), 0, nx=True, exat=_expire_at(meta))
+        pipe.execute()
+        # A set that is not loaded yet is rebuilt from the database on first use, this row included
+        if client.exists(user_challenges_key(user_id)):
+            client.sadd(user_challenges_key(user_id), str(challenge.unique_id))
+    except RedisError:
+        logger.exception("Could not register user %s in challenge %s", user_id, challenge.unique_id)
+
+
+def progress(challenge_uid, user_id):
+    """
+    The user's live progress in a challenge, read from Redis only:
+    {"progress", "target", "completed_at"}, or None when the user is not in the challenge.
+    Returns False when Redis can't answer (not configured or the keys are gone) and the caller
+    has to fall back to the database.
+    """
+    client = get_redis()
+    if client is None:
+        return False
+
+    challenge_uid = str(challenge_uid)
+    pipe = client.pipeline(transaction=False)
+    pipe.get(counter_key(challenge_uid, user_id))
+    pipe.get(meta_key(challenge_uid))
+    pipe.hget(completed_key(challenge_uid), user_id)
+    pipe.sismember(user_challenges_key(user_id), challenge_uid)
+    pipe.exists(user_challenges_key(user_id))
+    counter, meta, completed_at, is_member, loaded = pipe.execute()
+
+    if counter is None or meta is None:
+        if loaded and not is_member:
+            return None
+        return False
+
+    return {
+        "progress": int(counter),
+        "target": json.loads(meta)["target"],
+        "completed_at": datetime.fromtimestamp(float(completed_at), tz=dt_timezone.utc) if completed_at else None,
+    }
+
+
+def flush_progress(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Write-behind: copy dirty counters to ChallengeParticipation in batches. Each batch is one SPOP,
+    one pipelined read of the counters, one SELECT and one bulk UPDATE, so the database sees a
+    write per participant per flush instead of one per upload. A failed batch is put back as dirty.
+    Returns the number of participations written.
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+
+    written = 0
+    while True:
+        members = [member.decode() for member in client.spop(dirty_key(), batch_size) or []]
+        if not members:
+            return written
+
+        try:
+            pairs = [member.rsplit(":", 1) for member in members]
+            pipe = client.pipeline(transaction=False)
+            for uid, user_id in pairs:
+                pipe.get(counter_key(uid, user_id))
+                pipe.hget(completed_key(uid), user_id)
+            values = pipe.execute()
+
+            state = {}
+            for index, (uid, user_id) in enumerate(pairs):
+                counter, completed_at = values[2 * index], values[2 * index + 1]
+                if counter is not None:
+                    state[(uid, int(user_id))] = (int(counter), float(completed_at) if completed_at else None)
+
+            participations = ChallengeParticipation.objects.filter(
+                challenge__unique_id__in={uid for uid, _ in state},
+                user_id__in={user_id for _, user_id in state},
+            ).select_related('challenge').only('id', 'progress', 'completed_at', 'user_id', 'challenge__unique_id')
+
+            changed = []
+            for participation in participations:
+                entry = state.get((str(participation.challenge.unique_id), participation.user_id))
+                if entry is None:
+                    continue
+                counter, completed_at = entry
+                # Counters only grow, never let a counter rebuilt from a stale value move progress back
+                participation.progress = max(participation.progress, counter)
+                if completed_at and not participation.completed_at:
+                    participation.completed_at = datetime.fromtimestamp(completed_at, tz=dt_timezone.utc)
+                changed.append(participation)
+
+            ChallengeParticipation.objects.bulk_update(changed, ['progress', 'completed_at'], batch_size=batch_size)
+            written += len(changed)
+        except Exception:
+            client.sadd(dirty_key(), *members)
+            raise
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from challenges.counters import FLUSH_BATCH_SIZE, flush_progress
+from leaderboards.boards import get_redis
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the Redis challenge counters touched since the last run to the database. "
+        "Schedule it every minute or so, it is the write-behind half of challenge progress."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=FLUSH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if get_redis() is None:
+            raise CommandError("The default cache is not Redis, challenge progress is written directly.")
+
+        written = flush_progress(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Flushed progress of {written} participations."))
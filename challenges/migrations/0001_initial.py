@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:33
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('exercises', '0003_exercise_updated_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Challenge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unique_id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('metric', models.CharField(choices=[('repetitions', 'Repetitions'), ('volume', 'Volume (kg x reps)'), ('sets', 'Sets'), ('sessions', 'Sessions')], max_length=20)),
+                ('target', models.PositiveIntegerField()),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='created_challenges', to=settings.AUTH_USER_MODEL)),
+                ('exercise', models.ForeignKey(blank=True, help_text='Only count sets of this exercise, leave empty to count every exercise', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='challenges', to='exercises.exercise')),
+            ],
+            options={
+                'verbose_name_plural': 'Challenges',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChallengeParticipation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('progress', models.PositiveBigIntegerField(default=0)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='challenges.challenge')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='challenge_participations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Challenge Participations',
+                'constraints': [models.UniqueConstraint(fields=('challenge', 'user'), name='unique_challenge_participation')],
+            },
+        ),
+    ]
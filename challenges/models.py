@@ -0,0 +1,59 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+import uuid
+from users.models import User
+from exercises.models import Exercise
+
+
+class Challenge(models.Model):
+    """
+    A time boxed goal set by a trainer, e.g. "10,000 push-ups in October".
+    """
+
+    METRIC_CHOICES = [
+        ('repetitions', 'Repetitions'),
+        ('volume', 'Volume (kg x reps)'),
+        ('sets', 'Sets'),
+        ('sessions', 'Sessions'),
+    ]
+
+    unique_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, db_index=True)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_challenges')
+    title = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    exercise = models.ForeignKey(
+        Exercise, on_delete=models.SET_NULL, blank=True, null=True, related_name='challenges',
+        help_text="Only count sets of this exercise, leave empty to count every exercise"
+    )
+    target = models.PositiveIntegerField()
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = _("Challenges")
+
+    def __str__(self):
+        return f"Challenge: {self.title}"
+
+
+class ChallengeParticipation(models.Model):
+    """
+    A user taking part in a challenge. `progress` is the last value flushed from the Redis counter.
+    """
+
+    challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name='participations')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='challenge_participations')
+    progress = models.PositiveBigIntegerField(default=0)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = _("Challenge Participations")
+        constraints = [
+            models.UniqueConstraint(fields=['challenge', 'user'], name='unique_challenge_participation'),
+        ]
+
+    def __str__(self):
+        return f"User {self.user_id} in challenge {self.challenge_id}: {self.progress}"
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from exercises.models import Exercise
+from .models import Challenge, ChallengeParticipation
+
+
+class ChallengeSerializer(serializers.ModelSerializer):
+
+    exercise = serializers.SlugRelatedField(
+        slug_field='unique_id', queryset=Exercise.objects.all(), required=False, allow_null=True
+    )
+    created_by = serializers.CharField(source='created_by.unique_id', read_only=True)
+
+    class Meta:
+        model = Challenge
+        fields = ['unique_id', 'title', 'description', 'metric', 'exercise', 'target', 'starts_at', 'ends_at', 'created_by', 'created_at']
+        read_only_fields = ['unique_id', 'created_by', 'created_at']
+
+    def validate_target(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Target must be greater than 0.")
+        return value
+
+    def validate(self, attrs):
+        starts_at = attrs.get('starts_at', getattr(self.instance, 'starts_at', None))
+        ends_at = attrs.get('ends_at', getattr(self.instance, 'ends_at', None))
+        if starts_at and ends_at and ends_at <= starts_at:
+            raise serializers.ValidationError({"ends_at": "The challenge must end after it starts."})
+
+        metric = attrs.get('metric', getattr(self.instance, 'metric', None))
+        exercise = attrs.get('exercise', getattr(self.instance, 'exercise', None))
+        if metric == 'sessions' and exercise:
+            raise serializers.ValidationError({"exercise": "Session challenges can't be limited to an exercise."})
+        return attrs
+
+
+class ChallengeParticipationSerializer(serializers.ModelSerializer):
+
+    challenge = ChallengeSerializer(read_only=True)
+
+    class Meta:
+        model = ChallengeParticipation
+        fields = ['challenge', 'progress', 'completed_at', 'joined_at']
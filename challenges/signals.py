@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from workout_sessions.signals import workout_data_ingested
+from .counters import record_progress, forget_challenge
+from .models import Challenge
+
+
+@receiver(workout_data_ingested)
+def update_challenge_progress(sender, user, sessions, set_logs, **kwargs):
+    """
+    Bump the Redis counters once the ingest transaction commits, never inside it.
+    """
+    transaction.on_commit(lambda: record_progress(user, sessions, set_logs))
+
+
+@receiver(post_save, sender=Challenge)
+@receiver(post_delete, sender=Challenge)
+def forget_cached_challenge(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_challenge(instance.unique_id))
@@ -0,0 +1,10 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import ChallengeViewSet
+
+router = DefaultRouter()
+router.register(r'', ChallengeViewSet, basename='challenges')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,159 @@
+from uuid import UUID
+from django.utils import timezone
+from rest_framework.viewsets import ReadOnlyModelViewSet
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
+from exercises.permissions import IsTrainer
+from .models import Challenge, ChallengeParticipation
+from .serializers import ChallengeSerializer, ChallengeParticipationSerializer
+from . import counters
+
+
+class ChallengePagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ChallengeViewSet(ReadOnlyModelViewSet):
+    """
+    Challenges created by trainers. Anyone can browse and join them, only the creator can edit or delete one.
+    Progress is counted in Redis as sets are logged and flushed to the database by `flush_challenge_progress`.
+    """
+    queryset = Challenge.objects.all().select_related('created_by', 'exercise').order_by('-starts_at', '-id')
+    serializer_class = ChallengeSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = 'unique_id'
+    pagination_class = ChallengePagination
+
+    def get_permissions(self):
+        """
+        Trainers manage challenges, every authenticated user can read and join them.
+        """
+        if self.request.method in ['GET', 'HEAD', 'OPTIONS'] or self.action == 'join':
+            return [permission() for permission in [IsAuthenticated]]
+        return [permission() for permission in [IsAuthenticated, IsTrainer]]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in ['GET', 'HEAD', 'OPTIONS'] and self.action != 'join':
+            queryset = queryset.filter(created_by=self.request.user)
+        if self.action == 'list' and self.request.query_params.get('active') == 'true':
+            now = timezone.now()
+            queryset = queryset.filter(starts_at__lte=now, ends_at__gte=now)
+        return queryset
+
+    def get_object(self):
+        unique_id = self.kwargs.get(self.lookup_field)
+        try:
+            UUID(unique_id, version=4)
+        except ValueError:
+            raise NotFound({"detail": "The provided unique ID is not in a valid format. Please check and try again."})
+
+        try:
+            return self.get_queryset().get(unique_id=unique_id)
+        except Challenge.DoesNotExist:
+            raise NotFound({"detail": "The requested challenge does not exist or you do not have permission to access it."})
+
+    @action(detail=False, methods=['post'], url_path='create', url_name='create')
+    def create_challenge(self, request, *args, **kwargs):
+        """
+        Handle the creation of a challenge.
+        """
+        serializer = self.get_serializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(created_by=request.user)
+            detail = {
+                "message": "Challenge created successfully",
+                "data": serializer.data
+            }
+            return Response(detail, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=['patch'], url_path='update', url_name='update')
+    def update_challenge(self, request, unique_id=None, *args, **kwargs):
+        """
+        Custom route for updating a specific challenge.
+        """
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(
+                {"message": "Challenge updated successfully", "data": serializer.data},
+                status=status.HTTP_200_OK
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=['delete'], url_path='delete', url_name='delete')
+    def delete_challenge(self, request, unique_id=None, *args, **kwargs):
+        """
+        Custom route for deleting a specific challenge.
+        """
+        instance = self.get_object()
+        instance.delete()
+        return Response({"detail": "Challenge deleted successfully."}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'], url_path='join', url_name='join')
+    def join(self, request, unique_id=None, *args, **kwargs):
+        """
+        Join a challenge that has not ended yet.
+        """
+        challenge = self.get_object()
+        if challenge.ends_at < timezone.now():
+            return Response({"detail": "This challenge has already ended."}, status=status.HTTP_400_BAD_REQUEST)
+
+        participation, created = counters.join(challenge, request.user)
+        if not created:
+            return Response({"detail": "You are already taking part in this challenge."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {"message": "Joined the challenge", "data": ChallengeParticipationSerializer(participation).data},
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=True, methods=['get'], url_path='progress', url_name='progress')
+    def progress(self, request, unique_id=None, *args, **kwargs):
+        """
+        Live progress of the current user, read from the Redis counters without touching the database.
+        Falls back to the last flushed value when Redis is not available.
+        """
+        try:
+            UUID(unique_id, version=4)
+        except ValueError:
+            raise NotFound({"detail": "The provided unique ID is not in a valid format. Please check and try again."})
+
+        data = counters.progress(unique_id, request.user.id)
+        if data is False:
+            participation = (
+                ChallengeParticipation.objects.filter(challenge__unique_id=unique_id, user=request.user)
+                .select_related('challenge').first()
+            )
+            data = participation and {
+                "progress": participation.progress,
+                "target": participation.challenge.target,
+                "completed_at": participation.completed_at,
+            }
+        if data is None:
+            return Response({"detail": "You are not taking part in this challenge."}, status=status.HTTP_404_NOT_FOUND)
+
+        data["completed"] = data["completed_at"] is not None
+        data["percent"] = round(min(data["progress"] / data["target"], 1.0) * 100, 2)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='mine', url_name='mine')
+    def my_challenges(self, request, *args, **kwargs):
+        """
+        Challenges the current user takes part in, with the last flushed progress.
+        """
+        participations = (
+            ChallengeParticipation.objects.filter(user=request.user)
+            .select_related('challenge__created_by', 'challenge__exercise')
+            .order_by('-joined_at')
+        )
+        page = self.paginate_queryset(participations)
+        serializer = ChallengeParticipationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
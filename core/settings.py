@@ -40,6 +40,19 @@ INSTALLED_APPS = [
     "exercises.apps.ExercisesConfig",
     "workout_management.apps.WorkoutManagementConfig",
     "plan_recommendations.apps.PlanRecommendationsConfig",
+    "sync.apps.SyncConfig",
+    "workout_sessions.apps.WorkoutSessionsConfig",
+    "body_metrics.apps.BodyMetricsConfig",
+    "leaderboards.apps.LeaderboardsConfig",
+    "challenges.apps.ChallengesConfig",
+    "analytics.apps.AnalyticsConfig",
+    "feed.apps.FeedConfig",
+    "profiling.apps.ProfilingConfig",
+    "metrics.apps.MetricsConfig",
+    "benchmarks.apps.BenchmarksConfig",
+    "caching.apps.CachingConfig",
+    "throttling.apps.ThrottlingConfig",
+    "encoding.apps.EncodingConfig",
 
     # for api
     'rest_framework',
@@ -55,6 +68,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+
+    # request metrics exported on /metrics, outermost so the latency covers the other middleware
+    'metrics.middleware.MetricsMiddleware',
+
+    # brotli/gzip of the API responses, see COMPRESSION below
+    'encoding.middleware.CompressionMiddleware',
+
     'django.contrib.sessions.middleware.SessionMiddleware',
 
     "corsheaders.middleware.CorsMiddleware",
@@ -69,8 +89,10 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
-    # for silk 
-    'silk.middleware.SilkyMiddleware',
+    # sampled silk recording, see PROFILING below
+    'profiling.middleware.SampledProfilingMiddleware',
+    # N+1 and slow query reports, see PROFILING['QUERY_INSPECTION']
+    'profiling.middleware.QueryInspectionMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -109,6 +131,45 @@ REST_FRAMEWORK = {
     ),
 
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+
+    # orjson, with the output of DRF's JSONRenderer (see encoding.renderers)
+    'DEFAULT_RENDERER_CLASSES': [
+        'encoding.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'encoding.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
+    # Rates per scope, see throttling.throttles.RateLimitThrottle. Relax them (or set them empty to
+    # disable the scope) on instances used for load tests, where all virtual users share one IP.
+    'DEFAULT_THROTTLE_CLASSES': ['throttling.throttles.RateLimitThrottle'],
+    'DEFAULT_THROTTLE_RATES': {
+        'user': os.environ.get('USER_THROTTLE_RATE', '600/minute'),
+        'anon': os.environ.get('ANON_THROTTLE_RATE', '60/minute'),
+        'ip': os.environ.get('IP_THROTTLE_RATE', '1200/minute'),
+        'login': os.environ.get('LOGIN_THROTTLE_RATE', '5/minute'),
+        'register': os.environ.get('REGISTER_THROTTLE_RATE', '10/hour'),
+    },
+}
+
+THROTTLING = {
+    # django-redis cache whose Redis holds the counters
+    'CACHE_ALIAS': 'default',
+    # Keys kept by the in-process fallback (no Redis, or Redis unavailable)
+    'LOCAL_MAX_KEYS': 10000,
+}
+
+# Response compression (encoding.middleware.CompressionMiddleware)
+COMPRESSION = {
+    # Smaller bodies fit in a packet or two anyway
+    'MIN_SIZE': int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+    'CONTENT_TYPES': ('application/json', 'text/'),
+    # Low levels: nearly the ratio of the highest ones for a fraction of the CPU on dynamic responses
+    'BROTLI_QUALITY': 4,
+    'GZIP_LEVEL': 5,
 }
 
 SPECTACULAR_SETTINGS = {
@@ -158,16 +219,64 @@ DATABASES = {
 
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        # django_redis.cache.RedisCache counting hits and misses for /metrics, with a per-process
+        # LRU in front of it for the hot response caches (see caching.backends)
+        'BACKEND': 'caching.backends.TieredRedisCache',
         'LOCATION': 'redis://127.0.0.1:6379/1',  # Redis server location and database index
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Seconds, a stalled Redis must not hang requests (raise them for commands sending large pipelines)
+            'SOCKET_CONNECT_TIMEOUT': float(os.environ.get('CACHE_CONNECT_TIMEOUT', 0.2)),
+            'SOCKET_TIMEOUT': float(os.environ.get('CACHE_SOCKET_TIMEOUT', 0.3)),
+            # After this many failed calls in a row Redis is skipped for COOLDOWN seconds (local tier only)
+            'CIRCUIT_BREAKER': {
+                'FAILURE_THRESHOLD': 5,
+                'COOLDOWN': 10,
+            },
+            'LOCAL_CACHE': {
+                'KEY_PREFIXES': ('user_detail_', 'user_profile_', 'recommendations_user_'),
+                'MAX_ENTRIES': 2000,
+                # Upper bound of how stale a local entry can be when an invalidation message is late
+                'TIMEOUT': 5,
+            },
         },
         'KEY_PREFIX': 'fitness_track_api_pref'  # Prefix for cache keys to avoid collisions
     }
 }
 
 
+# Delta sync: tombstones older than this are pruned and tokens older than this are rejected
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+
+# Profiling: a sample of the requests (plus every slow one) is recorded into silk's tables by a background writer
+PROFILING = {
+    'DEFAULT_SAMPLE_RATE': float(os.environ.get('PROFILING_SAMPLE_RATE', 0.01)),
+    'SAMPLE_RATES': {},
+    'SLOW_REQUEST_MS': int(os.environ.get('PROFILING_SLOW_REQUEST_MS', 1000)),
+    'HEADER': 'X-Profile',
+    'HEADER_TOKEN': os.environ.get('PROFILING_HEADER_TOKEN'),
+    # 'warn' logs N+1 patterns and slow queries, 'raise' (tests) fails the request on an N+1
+    'QUERY_INSPECTION': os.environ.get('QUERY_INSPECTION', 'warn'),
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SLOW_QUERY_MS': int(os.environ.get('SLOW_QUERY_MS', 200)),
+}
+
+# Retention cap of the recordings, and the silk UI is for staff only
+SILKY_MAX_RECORDED_REQUESTS = 10000
+SILKY_AUTHENTICATION = True
+SILKY_AUTHORISATION = True
+
+# /metrics is readable by staff users and by scrapers sending the X-Metrics-Token header.
+# Under gunicorn set PROMETHEUS_MULTIPROC_DIR (an empty directory, wiped on deploy) so the workers' metrics are summed.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Cache key prefixes with their own hit/miss series
+METRICS_CACHE_NAMESPACES = ('user_detail_', 'user_profile_', 'recommendations_user_', 'recommendation_version_')
+
+# Columnar analytics snapshot (memory-mapped NumPy arrays), rebuilt by build_analytics_snapshot
+ANALYTICS_SNAPSHOT_DIR = BASE_DIR / 'analytics_snapshot'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,48 @@
+"""
+Settings for the test suite: SQLite, an in-process cache and fakeredis, so it runs without Postgres
+or Redis.
+
+    python manage.py test --settings=core.settings_test
+"""
+import fakeredis
+from .settings import *
+
+SECRET_KEY = 'insecure-test-secret-key'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_db.sqlite3',
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'metrics.cache.LocMemCache',
+    },
+    # Rate limiter counters, in a Redis emulated in process (runs the Lua scripts through lupa)
+    'throttling': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://localhost:6379/0',
+        'KEY_PREFIX': 'test',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'CONNECTION_POOL_KWARGS': {'connection_class': fakeredis.FakeConnection},
+        },
+    },
+}
+
+THROTTLING = {**THROTTLING, 'CACHE_ALIAS': 'throttling'}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# No silk recordings or EXPLAINs inside the measured requests, and an N+1 fails the test
+PROFILING = {
+    **PROFILING,
+    'DEFAULT_SAMPLE_RATE': 0,
+    'HEADER_TOKEN': None,
+    'SLOW_REQUEST_MS': 10 ** 9,
+    'ASYNC': False,
+    'QUERY_INSPECTION': 'raise',
+    'SLOW_QUERY_MS': 10 ** 9,
+}
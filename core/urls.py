@@ -15,8 +15,16 @@ urlpatterns = [
     path('exercises/', include("exercises.urls")),
     path('workout_management/', include("workout_management.urls")),
     path('user_recommendations/', include("plan_recommendations.urls")),
+    path('sync/', include("sync.urls")),
+    path('workout_sessions/', include("workout_sessions.urls")),
+    path('body_metrics/', include("body_metrics.urls")),
+    path('leaderboards/', include("leaderboards.urls")),
+    path('challenges/', include("challenges.urls")),
+    path('analytics/', include("analytics.urls")),
+    path('feed/', include("feed.urls")),
 
     path('silk/', include('silk.urls', namespace='silk')),
+    path('metrics', include("metrics.urls")),
 
     # YOUR PATTERNS
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
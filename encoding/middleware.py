@@ -0,0 +1,95 @@
+try:
+    import brotli
+except ImportError:
+    brotli = None
+import gzip
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+_accept_encoding_re = _lazy_re_compile(r'^\s*([^\s;]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+def accepted_encodings(header):
+    """
+    {coding: q} of an Accept-Encoding header, without the codings the client refuses (q=0).
+    """
+    encodings = {}
+    for item in header.split(','):
+        match = _accept_encoding_re.match(item)
+        if not match:
+            continue
+        try:
+            q = float(match[2]) if match[2] else 1.0
+        except ValueError:
+            continue
+        encodings[match[1].lower()] = q
+    return encodings
+
+
+def choose_encoding(header, available):
+    """
+    The coding of `available` (in order of preference) the client accepts with the highest q, or None.
+    """
+    encodings = accepted_encodings(header)
+    best, best_q = None, 0
+    for coding in available:
+        q = encodings.get(coding, encodings.get('*', 0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Brotli or gzip compression of responses, negotiated with Accept-Encoding (brotli preferred when
+    both are accepted and the brotli package is installed), see settings.COMPRESSION.
+
+    Left alone: responses under MIN_SIZE bytes (compression would cost more than it saves), other
+    content types than CONTENT_TYPES, streaming responses (the exports gzip themselves), responses
+    already encoded, and responses setting cookies. The latter carry JWTs (login, register, token
+    refresh), and compressing a secret next to reflected input is what BREACH exploits.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        conf = settings.COMPRESSION
+        self.min_size = conf['MIN_SIZE']
+        self.content_types = tuple(conf['CONTENT_TYPES'])
+        self.brotli_quality = conf['BROTLI_QUALITY']
+        self.gzip_level = conf['GZIP_LEVEL']
+        self.available = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or response.cookies
+            or len(response.content) < self.min_size
+            or not response.get('Content-Type', '').startswith(self.content_types)
+        ):
+            return response
+
+        coding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.available)
+        if coding is None:
+            return response
+        content = self.compress(response.content, coding)
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = coding
+        # The compressed body differs byte for byte, as in Django's GZipMiddleware
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def compress(self, content, coding):
+        if coding == 'br':
+            return brotli.compress(content, quality=self.brotli_quality)
+        return gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
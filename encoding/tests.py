@@ -0,0 +1,99 @@
+import brotli
+import gzip
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from utils.query_budget import QueryBudgetTestCase
+from .middleware import choose_encoding
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+
+
+class ORJSONTests(SimpleTestCase):
+    """
+    ORJSONRenderer renders what JSONRenderer does, ORJSONParser parses like JSONParser.
+    """
+
+    def test_same_output_as_json_renderer(self):
+        data = {
+            'id': uuid.uuid4(),
+            'height': Decimal('1.80'),
+            'end_date': date(2026, 1, 31),
+            'created_at': datetime(2026, 1, 31, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            'starts_at': time(7, 30),
+            'rest_time': timedelta(seconds=90),
+            'tags': ('Strength', 'Flexibility'),
+            'by_goal': {1: 'Weight Loss'},
+            'note': 'line\u2028separator',
+            'nested': [{'weight': Decimal('80.5'), 'empty': None}],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(json.loads(rendered), {'a': 1})
+        self.assertIn(b'\n', rendered)
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_parse(self):
+        parsed = ORJSONParser().parse(io.BytesIO('{"name": "Squat é", "sets": [1, 2]}'.encode()))
+        self.assertEqual(parsed, {'name': 'Squat é', 'sets': [1, 2]})
+
+    def test_parse_errors(self):
+        for body in (b'{"a": ', b'{"a": NaN}', b'\xff'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+class CompressionTests(QueryBudgetTestCase):
+    """
+    Accept-Encoding negotiation of CompressionMiddleware on the plan list.
+    """
+
+    def get_plans(self, accept_encoding):
+        self.authenticate(self.user)
+        return self.client.get('/workout_management/workout_plan/?page_size=100', HTTP_ACCEPT_ENCODING=accept_encoding)
+
+    def test_choose_encoding(self):
+        available = ('br', 'gzip')
+        self.assertEqual(choose_encoding('gzip, deflate, br', available), 'br')
+        self.assertEqual(choose_encoding('br;q=0.5, gzip', available), 'gzip')
+        self.assertEqual(choose_encoding('br;q=0, *', available), 'gzip')
+        self.assertIsNone(choose_encoding('identity', available))
+        self.assertIsNone(choose_encoding('', available))
+
+    def test_brotli(self):
+        response = self.get_plans('gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(brotli.decompress(response.content))['results']), 15)
+
+    def test_gzip(self):
+        response = self.get_plans('gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 15)
+
+    def test_identity(self):
+        response = self.get_plans('identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(len(response.json()['results']), 15)
+
+    def test_small_response_not_compressed(self):
+        self.authenticate(self.user)
+        response = self.client.get('/users/current_user/streak/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertLess(len(response.content), 1024)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_responses_setting_cookies_not_compressed(self):
+        payload = {"email": self.user.email, "password": "Strong-pass-123"}
+        response = self.client.post('/users/login/', payload, format='json', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,192 @@
+import csv
+import json
+from django.db import transaction
+from workout_sessions.training_load import invalidate_exercises as invalidate_training_load
+from .models import Exercise
+from .serializers import CreateExerciseSerializer
+
+IMPORT_FORMATS = ('ndjson', 'csv')
+CONFLICT_MODES = ('update', 'skip')
+DEFAULT_CHUNK_SIZE = 500
+
+UPDATE_FIELDS = ['category', 'description', 'equipment', 'repetitions', 'sets', 'muscle_group', 'updated_at']
+
+
+def format_from_content_type(content_type):
+    """
+    Map a request content type to one of IMPORT_FORMATS, or None if unsupported.
+    """
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('application/x-ndjson', 'application/jsonl', 'application/ndjson'):
+        return 'ndjson'
+    if content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    return None
+
+
+def _decode_lines(lines):
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        yield line
+
+
+def _parse_equipment(value):
+    """
+    CSV cells carry equipment either as a JSON list or as a ';' separated string.
+    """
+    value = (value or '').strip()
+    if not value:
+        return []
+    if value.startswith('['):
+        return json.loads(value)
+    return [item.strip() for item in value.split(';') if item.strip()]
+
+
+def iter_rows(lines, import_format):
+    """
+    Lazily turn an iterable of lines (bytes or str) into (row_number, data, error) tuples.
+    Only one line is held in memory at a time.
+    """
+    lines = _decode_lines(lines)
+
+    if import_format == 'ndjson':
+        row_number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield row_number, None, "Invalid JSON."
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "Each line must be a JSON object."
+                continue
+            yield row_number, data, None
+
+    elif import_format == 'csv':
+        reader = csv.DictReader(lines)
+        for row_number, row in enumerate(reader, start=1):
+            # Empty cells fall back to the model defaults
+            data = {key: value for key, value in row.items() if key and value not in (None, '')}
+            try:
+                if 'equipment' in data:
+                    data['equipment'] = _parse_equipment(data['equipment'])
+            except ValueError:
+                yield row_number, None, "Equipment must be a JSON list or a ';' separated string."
+                continue
+            yield row_number, data, None
+
+    else:
+        raise ValueError(f"Unsupported import format: {import_format}")
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _import_chunk(chunk, user, on_conflict):
+    results = []
+    to_write = {}
+
+    for row_number, data, error in chunk:
+        if error:
+            results.append({"row": row_number, "status": "error", "errors": {"detail": error}})
+            continue
+
+        serializer = CreateExerciseSerializer(data=data)
+        if not serializer.is_valid():
+            results.append({"row": row_number, "name": data.get('name'), "status": "error", "errors": serializer.errors})
+            continue
+
+        validated_data = serializer.validated_data
+        name = validated_data['name']
+        if name in to_write:
+            results.append({
+                "row": row_number,
+                "name": name,
+                "status": "error",
+                "errors": {"name": f"Duplicate of row {to_write[name][0]} in the same chunk."},
+            })
+            continue
+
+        to_write[name] = (row_number, Exercise(
+            name=name,
+            created_by=user,
+            category=validated_data['category'],
+            description=validated_data['description'],
+            equipment=validated_data.get('equipment', []),
+            repetitions=validated_data.get('repetitions', 0),
+            sets=validated_data.get('sets', 0),
+            muscle_group=validated_data['muscle_group'],
+        ))
+
+    if to_write:
+        with transaction.atomic():
+            existing = {
+                name: (exercise_id, muscle_group)
+                for name, exercise_id, muscle_group in Exercise.objects.filter(created_by=user, name__in=to_write.keys())
+                .values_list('name', 'id', 'muscle_group')
+            }
+            exercises = [exercise for _, exercise in to_write.values()]
+
+            if on_conflict == 'update':
+                Exercise.objects.bulk_create(
+                    exercises,
+                    update_conflicts=True,
+                    unique_fields=['name', 'created_by'],
+                    update_fields=UPDATE_FIELDS,
+                )
+                # bulk_create sends no post_save, drop the training loads grouped by the old muscle group
+                # like workout_sessions.signals does
+                regrouped = [
+                    existing[name][0] for name, (_, exercise) in to_write.items()
+                    if name in existing and existing[name][1] != exercise.muscle_group
+                ]
+                if regrouped:
+                    transaction.on_commit(lambda: invalidate_training_load(regrouped))
+            else:
+                Exercise.objects.bulk_create(exercises, ignore_conflicts=True)
+
+        for name, (row_number, _) in to_write.items():
+            if name not in existing:
+                row_status = "created"
+            elif on_conflict == 'update':
+                row_status = "updated"
+            else:
+                row_status = "skipped"
+            results.append({"row": row_number, "name": name, "status": row_status})
+
+    results.sort(key=lambda result: result["row"])
+    return results
+
+
+def import_exercises(lines, user, import_format, on_conflict='update', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream exercises from NDJSON/CSV lines into the database for `user`.
+
+    Rows are validated and written one chunk at a time, each chunk with a single
+    bulk_create. Name collisions with the user's existing exercises are either
+    updated in place or skipped, depending on `on_conflict`. Yields one result dict
+    per input row, followed by a final {"summary": {...}} dict.
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"Unsupported conflict mode: {on_conflict}")
+
+    summary = {"created": 0, "updated": 0, "skipped": 0, "error": 0}
+
+    for chunk in _chunks(iter_rows(lines, import_format), chunk_size):
+        for result in _import_chunk(chunk, user, on_conflict):
+            summary[result["status"]] += 1
+            yield result
+
+    yield {"summary": summary}
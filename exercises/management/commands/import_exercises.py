@@ -0,0 +1,35 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from users.models import User
+from exercises.importers import import_exercises, IMPORT_FORMATS, CONFLICT_MODES, DEFAULT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Stream exercises from a NDJSON or CSV file into the catalogue of a trainer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to the NDJSON or CSV file.")
+        parser.add_argument('--trainer', required=True, help="Email of the trainer that will own the exercises.")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help="File format, guessed from the extension if omitted.")
+        parser.add_argument('--on-conflict', choices=CONFLICT_MODES, default='update')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--report', action='store_true', help="Print one result line per row, not only the summary.")
+
+    def handle(self, *args, **options):
+        try:
+            trainer = User.objects.get(email=options['trainer'])
+        except User.DoesNotExist:
+            raise CommandError(f"User with email {options['trainer']} does not exist.")
+        if not trainer.is_trainer:
+            raise CommandError(f"User {trainer.email} is not a trainer.")
+
+        import_format = options['format']
+        if import_format is None:
+            import_format = 'csv' if options['path'].lower().endswith('.csv') else 'ndjson'
+
+        with open(options['path'], encoding='utf-8', newline='') as lines:
+            for result in import_exercises(lines, trainer, import_format, options['on_conflict'], options['chunk_size']):
+                if 'summary' in result:
+                    self.stdout.write(self.style.SUCCESS(json.dumps(result['summary'])))
+                elif options['report'] or result['status'] == 'error':
+                    self.stdout.write(json.dumps(result))
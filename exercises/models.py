@@ -24,10 +24,22 @@ class Exercise(models.Model):
     repetitions = models.PositiveIntegerField(default=0)
     sets = models.PositiveIntegerField(default=0)
     muscle_group = models.CharField(max_length=50)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = _("Exercises")
         unique_together = ('name', 'created_by')
+        indexes = [
+            # cursor for the sync change feed
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared on save to tell a muscle group edit (caches group logged sets by it)
+        instance.loaded_muscle_group = instance.__dict__.get('muscle_group')
+        return instance
 
     def __str__(self):
         return f"exercise name: {self.name}"
\ No newline at end of file
@@ -0,0 +1,48 @@
+from utils.query_budget import QueryBudgetTestCase
+
+
+class ExerciseQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets of the exercise endpoints.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.exercise = self.exercises[0]
+
+    def test_list(self):
+        self.request_within_budget(3, 'get', '/exercises/', user=self.user)
+        self.request_within_budget(3, 'get', '/exercises/?page_size=100&category=Strength', user=self.user)
+
+    def test_retrieve(self):
+        self.request_within_budget(2, 'get', f'/exercises/{self.exercise.unique_id}/', user=self.user)
+
+    def test_create(self):
+        payload = {"name": "Lunge", "description": "Lunge", "category": "Strength", "equipment": [], "repetitions": 10, "sets": 3, "muscle_group": "legs"}
+        self.request_within_budget(2, 'post', '/exercises/create/', user=self.trainer, data=payload, status_code=201)
+
+    def test_bulk_create(self):
+        payload = {"exercises": [
+            {"name": f"Bulk {index}", "description": "Bulk", "category": "Cardio", "equipment": [], "repetitions": 10, "sets": 3, "muscle_group": "full body"}
+            for index in range(10)
+        ]}
+        self.request_within_budget(4, 'post', '/exercises/bulk-create/', user=self.trainer, data=payload, status_code=201)
+
+    def test_import(self):
+        body = "\n".join(
+            f'{{"name": "Imported {index}", "description": "Imported", "category": "Yoga", "muscle_group": "core"}}'
+            for index in range(10)
+        )
+        self.request_within_budget(
+            5, 'post', '/exercises/import/', user=self.trainer, data=body, format=None, content_type='application/x-ndjson',
+        )
+
+    def test_export(self):
+        self.request_within_budget(2, 'get', '/exercises/export/', user=self.trainer)
+
+    def test_update(self):
+        url = f'/exercises/{self.exercise.unique_id}/update/'
+        self.request_within_budget(3, 'patch', url, user=self.trainer, data={"sets": 4})
+
+    def test_delete(self):
+        self.request_within_budget(15, 'delete', f'/exercises/{self.exercise.unique_id}/delete/', user=self.trainer)
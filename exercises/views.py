@@ -9,6 +9,10 @@ from rest_framework.exceptions import NotFound
 from django.utils.translation import gettext_lazy as _
 from uuid import UUID
 from .permissions import IsTrainer
+from .importers import import_exercises, format_from_content_type, IMPORT_FORMATS, CONFLICT_MODES, DEFAULT_CHUNK_SIZE
+from django.http import StreamingHttpResponse
+import json
+from utils.streaming_export import get_export_options, build_export_response, EXPORT_FORMATS, EXPORT_CHUNK_SIZE
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter
@@ -40,6 +44,8 @@ class ExerciseViewSet(ModelViewSet):
         """
         Dynamically assign permissions based on request method.
         """
+        if self.action == 'export_exercises':
+            return [permission() for permission in [IsAuthenticated, IsTrainer]]
         if self.request.method in ['GET', "RETRIEVE", 'HEAD', 'OPTIONS']:
             return [permission() for permission in [IsAuthenticated]]
         return [permission() for permission in [IsAuthenticated, IsTrainer]]
@@ -111,6 +117,68 @@ class ExerciseViewSet(ModelViewSet):
         return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
     
+    @action(detail=False, methods=['post'], url_path='import', url_name='import')
+    def stream_import_exercises(self, request, *args, **kwargs):
+        """
+        Stream a NDJSON or CSV body of exercises into the database chunk by chunk.
+        The body is never loaded into memory at once and the response is a streamed
+        NDJSON report with one line per input row.
+
+        Query params:
+        - on_conflict: 'update' (default) overwrites exercises with the same name, 'skip' keeps them.
+        - chunk_size: number of rows validated and written per batch.
+        """
+        import_format = format_from_content_type(request.content_type)
+        if import_format is None:
+            return Response(
+                {"detail": f"Unsupported content type. Send one of: {', '.join(IMPORT_FORMATS)} (application/x-ndjson or text/csv)."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+
+        on_conflict = request.query_params.get('on_conflict', 'update')
+        if on_conflict not in CONFLICT_MODES:
+            return Response(
+                {"detail": f"on_conflict must be one of: {', '.join(CONFLICT_MODES)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            chunk_size = min(max(int(request.query_params.get('chunk_size', DEFAULT_CHUNK_SIZE)), 1), 5000)
+        except ValueError:
+            return Response({"detail": "chunk_size must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Read straight from the underlying Django request so the body is consumed lazily
+        results = import_exercises(request._request, request.user, import_format, on_conflict, chunk_size)
+        report = (json.dumps(result) + "\n" for result in results)
+
+        return StreamingHttpResponse(report, content_type='application/x-ndjson', status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='export', url_name='export')
+    def export_exercises(self, request, *args, **kwargs):
+        """
+        Stream every exercise created by the current trainer as NDJSON (default) or CSV.
+
+        Query params:
+        - export_format: 'ndjson' or 'csv'.
+        - gzip: 'true' to gzip the stream on the fly.
+        """
+        export_format, use_gzip = get_export_options(request)
+        if export_format is None:
+            return Response(
+                {"detail": f"export_format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fieldnames = ['unique_id', 'name', 'category', 'description', 'equipment', 'repetitions', 'sets', 'muscle_group']
+        rows = (
+            Exercise.objects.filter(created_by=request.user)
+            .order_by('id')
+            .values(*fieldnames)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+        return build_export_response(rows, fieldnames, export_format, "exercises", use_gzip)
+
     @action(detail=True, methods=['patch'], url_path='update', url_name='update')
     def update_exercise(self, request, unique_id=None, *args, **kwargs):
         """
@@ -0,0 +1,5 @@
+from django.contrib import admin
+from .models import Follow
+# Register your models here.
+
+admin.site.register(Follow)
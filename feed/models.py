@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from users.models import User
+
+
+class Follow(models.Model):
+    """
+    `follower` sees the sessions, personal records and new plans of `followee` in their feed.
+    """
+
+    follower = models.ForeignKey(User, on_delete=models.CASCADE, related_name='following')
+    followee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='followers')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = _("Follows")
+        constraints = [
+            models.UniqueConstraint(fields=['follower', 'followee'], name='unique_follow'),
+            models.CheckConstraint(condition=~models.Q(follower=models.F('followee')), name='no_self_follow'),
+        ]
+        indexes = [
+            models.Index(fields=['followee', 'follower']),
+        ]
+
+    def __str__(self):
+        return f"User {self.follower_id} follows user {self.followee_id}"
@@ -0,0 +1,67 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from workout_management.models import WorkoutPlan
+from workout_sessions.models import PersonalRecord
+from workout_sessions.signals import workout_data_ingested, personal_records_improved
+from .timeline import publish
+
+# An offline device can upload weeks of sessions at once, only the newest ones make it to the feed
+SESSIONS_PER_UPLOAD = 5
+
+
+@receiver(workout_data_ingested)
+def publish_sessions(sender, user, sessions, set_logs, **kwargs):
+    if not sessions:
+        return
+
+    sets, volume = defaultdict(int), defaultdict(Decimal)
+    for set_log in set_logs:
+        sets[set_log.session_id] += 1
+        volume[set_log.session_id] += set_log.weight * set_log.repetitions
+
+    newest = sorted(sessions, key=lambda session: session.started_at, reverse=True)[:SESSIONS_PER_UPLOAD]
+    events = [
+        {
+            "type": "session_completed",
+            "session": str(session.unique_id),
+            "started_at": session.started_at,
+            "ended_at": session.ended_at,
+            "sets": sets[session.id],
+            "volume": volume[session.id],
+        }
+        for session in reversed(newest)
+    ]
+    transaction.on_commit(lambda: publish(user, events))
+
+
+@receiver(personal_records_improved)
+def publish_personal_records(sender, user, improvements, **kwargs):
+    records = PersonalRecord.objects.filter(user=user, exercise_id__in=improvements.keys()).select_related('exercise')
+    event = {
+        "type": "personal_record",
+        "records": [
+            {
+                "exercise": str(record.exercise.unique_id),
+                "name": record.exercise.name,
+                "improved": {field: getattr(record, field) for field in improvements[record.exercise_id]},
+            }
+            for record in records
+        ],
+    }
+    transaction.on_commit(lambda: publish(user, [event]))
+
+
+@receiver(post_save, sender=WorkoutPlan)
+def publish_new_plan(sender, instance, created, **kwargs):
+    if not created:
+        return
+    event = {
+        "type": "plan_created",
+        "workout_plan": str(instance.unique_id),
+        "title": instance.title,
+        "difficulty_level": instance.difficulty_level,
+    }
+    transaction.on_commit(lambda: publish(instance.created_by, [event]))
@@ -0,0 +1,172 @@
+import heapq
+import json
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from redis.exceptions import RedisError
+from leaderboards.boards import get_redis
+from .models import Follow
+
+logger = logging.getLogger(__name__)
+
+# Entries kept per timeline and per outbox, older ones are trimmed on write
+TIMELINE_SIZE = 500
+
+# Actors with more followers than this are not fanned out on write,
+# their followers merge the actor's outbox into the feed at read time instead
+FANOUT_LIMIT = 1000
+
+# Event bodies are stored once and shared by every timeline that points at them
+EVENT_TTL = int(timedelta(days=30).total_seconds())
+
+FANOUT_BATCH_SIZE = 500
+
+# Entries copied into a timeline when the user starts following someone
+FOLLOW_BACKFILL = 50
+
+
+def _prefix():
+    return f"{settings.CACHES['default'].get('KEY_PREFIX', '')}:feed"
+
+
+def timeline_key(user_id):
+    return f"{_prefix()}:timeline:{user_id}"
+
+
+def outbox_key(user_id):
+    return f"{_prefix()}:outbox:{user_id}"
+
+
+def event_key(event_id):
+    return f"{_prefix()}:event:{event_id}"
+
+
+def hot_actors_key():
+    return f"{_prefix()}:hot_actors"
+
+
+def sequence_key():
+    return f"{_prefix()}:sequence"
+
+
+def actor_card(user):
+    return {
+        "unique_id": str(user.unique_id),
+        "name": f"{user.first_name} {user.last_name}".strip(),
+        "is_trainer": user.is_trainer,
+    }
+
+
+def _add(pipe, key, entries):
+    pipe.zadd(key, entries)
+    pipe.zremrangebyrank(key, 0, -TIMELINE_SIZE - 1)
+
+
+def publish(actor, events):
+    """
+    Store events of `actor` and push them to the timelines of the actor and their followers.
+
+    Each event gets an id from a Redis counter, used both as the sorted set score and as the
+    pagination cursor. The body is written once; timelines only hold ids and are trimmed to
+    TIMELINE_SIZE. Actors above FANOUT_LIMIT followers only write to their outbox, which their
+    followers merge in when reading. Redis errors are logged, a feed is best effort.
+    """
+    client = get_redis()
+    if client is None or not events:
+        return
+
+    try:
+        first_id = client.incrby(sequence_key(), len(events)) - len(events) + 1
+        entries = {}
+        pipe = client.pipeline(transaction=False)
+        for offset, event in enumerate(events):
+            event_id = first_id + offset
+            body = {"id": event_id, "actor": actor_card(actor), "created_at": timezone.now().isoformat(), **event}
+            pipe.set(event_key(event_id), json.dumps(body, cls=DjangoJSONEncoder), ex=EVENT_TTL)
+            entries[event_id] = event_id
+        _add(pipe, outbox_key(actor.id), entries)
+        _add(pipe, timeline_key(actor.id), entries)
+
+        followers = Follow.objects.filter(followee=actor).values_list('follower_id', flat=True)
+        if followers[:FANOUT_LIMIT + 1].count() > FANOUT_LIMIT:
+            pipe.sadd(hot_actors_key(), actor.id)
+            pipe.execute()
+            return
+        pipe.srem(hot_actors_key(), actor.id)
+        pipe.execute()
+
+        pipe = client.pipeline(transaction=False)
+        for index, follower_id in enumerate(followers.iterator(chunk_size=FANOUT_BATCH_SIZE), start=1):
+            _add(pipe, timeline_key(follower_id), entries)
+            if index % FANOUT_BATCH_SIZE == 0:
+                pipe.execute()
+        pipe.execute()
+    except RedisError:
+        logger.exception("Could not publish feed events of user %s", actor.id)
+
+
+def follow(follower_id, followee_id):
+    """
+    Copy the followee's recent events into the follower's timeline, so the feed isn't empty until they post again.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        if client.sismember(hot_actors_key(), followee_id):
+            return
+        recent = client.zrevrange(outbox_key(followee_id), 0, FOLLOW_BACKFILL - 1, withscores=True)
+        if recent:
+            pipe = client.pipeline(transaction=False)
+            _add(pipe, timeline_key(follower_id), {member: score for member, score in recent})
+            pipe.execute()
+    except RedisError:
+        logger.exception("Could not backfill the feed of user %s", follower_id)
+
+
+def unfollow(follower_id, followee_id):
+    """
+    Drop the followee's events from the follower's timeline. Only the outbox ids can still be there, so this is bounded.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        event_ids = client.zrange(outbox_key(followee_id), 0, -1)
+        if event_ids:
+            client.zrem(timeline_key(follower_id), *event_ids)
+    except RedisError:
+        logger.exception("Could not clean the feed of user %s", follower_id)
+
+
+def read(user_id, cursor=None, limit=20):
+    """
+    A page of the user's feed, newest first: (events, next cursor). `cursor` is the id of the last event
+    of the previous page. The fanned out timeline is merged with the outboxes of the followed
+    high-follower actors, each read with one ZREVRANGEBYSCORE bounded by `limit`.
+    """
+    client = get_redis()
+
+    followed = list(Follow.objects.filter(follower_id=user_id).values_list('followee_id', flat=True))
+    hot = [actor_id for actor_id, is_hot in zip(followed, client.smismember(hot_actors_key(), followed)) if is_hot] if followed else []
+
+    pipe = client.pipeline(transaction=False)
+    for key in [timeline_key(user_id)] + [outbox_key(actor_id) for actor_id in hot]:
+        upper = f"({cursor}" if cursor else "+inf"
+        pipe.zrevrangebyscore(key, upper, "-inf", start=0, num=limit, withscores=True)
+    pages = [[int(score) for _, score in rows] for rows in pipe.execute()]
+
+    event_ids = []
+    for event_id in heapq.merge(*pages, reverse=True):
+        if event_ids and event_ids[-1] == event_id:
+            continue
+        event_ids.append(event_id)
+        if len(event_ids) == limit:
+            break
+
+    bodies = client.mget([event_key(event_id) for event_id in event_ids]) if event_ids else []
+    events = [json.loads(body) for body in bodies if body]
+    next_cursor = event_ids[-1] if len(event_ids) == limit else None
+    return events, next_cursor
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import FeedView, FollowView
+
+urlpatterns = [
+    path('', FeedView.as_view(), name='feed'),
+    path('follow/<str:unique_id>/', FollowView.as_view(), name='feed_follow'),
+]
@@ -0,0 +1,82 @@
+from uuid import UUID
+from django.db import transaction, IntegrityError
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from redis.exceptions import RedisError
+from users.models import User
+from leaderboards.boards import get_redis
+from .models import Follow
+from . import timeline
+
+
+class FeedView(APIView):
+    """
+    Home feed of the current user: sessions, personal records and new plans of the people they follow, newest first.
+
+    Query params:
+    - cursor: `next_cursor` of the previous page.
+    - limit: events per page (default 20, max 50).
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def get(self, request):
+        try:
+            cursor = int(request.query_params['cursor']) if request.query_params.get('cursor') else None
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        except ValueError:
+            return Response({"detail": "cursor and limit must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if get_redis() is None:
+            return Response({"detail": "The feed is not available."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        try:
+            events, next_cursor = timeline.read(request.user.id, cursor, limit)
+        except RedisError:
+            return Response({"detail": "The feed is not available."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"events": events, "next_cursor": next_cursor}, status=status.HTTP_200_OK)
+
+
+class FollowView(APIView):
+    """
+    POST follows the user, DELETE unfollows them.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def get_followee(self, request, unique_id):
+        try:
+            UUID(unique_id, version=4)
+            followee = User.objects.get(unique_id=unique_id)
+        except (ValueError, User.DoesNotExist):
+            return None, Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
+        if followee.id == request.user.id:
+            return None, Response({"detail": "You can't follow yourself."}, status=status.HTTP_400_BAD_REQUEST)
+        return followee, None
+
+    def post(self, request, unique_id):
+        followee, error = self.get_followee(request, unique_id)
+        if error:
+            return error
+
+        try:
+            with transaction.atomic():
+                Follow.objects.create(follower=request.user, followee=followee)
+        except IntegrityError:
+            return Response({"detail": "You already follow this user."}, status=status.HTTP_400_BAD_REQUEST)
+
+        transaction.on_commit(lambda: timeline.follow(request.user.id, followee.id))
+        return Response({"message": "User followed"}, status=status.HTTP_201_CREATED)
+
+    def delete(self, request, unique_id):
+        followee, error = self.get_followee(request, unique_id)
+        if error:
+            return error
+
+        deleted, _ = Follow.objects.filter(follower=request.user, followee=followee).delete()
+        if not deleted:
+            return Response({"detail": "You don't follow this user."}, status=status.HTTP_404_NOT_FOUND)
+
+        transaction.on_commit(lambda: timeline.unfollow(request.user.id, followee.id))
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,25 @@
+from datetime import date, timedelta
+from utils.query_budget import QueryBudgetTestCase
+
+
+class FitnessGoalQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets of the fitness goal endpoints.
+    """
+
+    def test_list(self):
+        self.request_within_budget(2, 'get', '/fitness_goal/', user=self.user)
+
+    def test_retrieve(self):
+        self.request_within_budget(2, 'get', f'/fitness_goal/{self.goal.unique_id}/', user=self.user)
+
+    def test_create(self):
+        payload = {"goal_type": "Flexibility", "end_date": str(date.today() + timedelta(days=10)), "description": "Stretch"}
+        self.request_within_budget(2, 'post', '/fitness_goal/create/', user=self.user, data=payload, status_code=201)
+
+    def test_update(self):
+        url = f'/fitness_goal/{self.goal.unique_id}/update/'
+        self.request_within_budget(4, 'patch', url, user=self.user, data={"description": "Updated"})
+
+    def test_delete(self):
+        self.request_within_budget(5, 'delete', f'/fitness_goal/{self.goal.unique_id}/delete/', user=self.user)
@@ -0,0 +1,133 @@
+import json
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# board name -> whether the board restarts every ISO week
+BOARDS = {
+    'weekly_volume': True,
+    'sessions': False,
+    'streak': False,
+}
+
+GLOBAL_SCOPE = 'global'
+
+# weekly boards stay readable for a few weeks after they close
+WEEKLY_BOARD_TTL = int(timedelta(days=35).total_seconds())
+
+
+def get_redis():
+    """
+    Raw Redis client behind the default cache, None when the cache is not Redis (e.g. local memory in development).
+    """
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _prefix():
+    return f"{settings.CACHES['default'].get('KEY_PREFIX', '')}:leaderboard"
+
+
+def week_label(moment=None):
+    year, week, _ = timezone.localtime(moment or timezone.now()).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def board_key(board, scope=GLOBAL_SCOPE, week=None):
+    if BOARDS[board]:
+        return f"{_prefix()}:{board}:{week or week_label()}:{scope}"
+    return f"{_prefix()}:{board}:{scope}"
+
+
+def users_key():
+    return f"{_prefix()}:users"
+
+
+def built_key():
+    return f"{_prefix()}:built"
+
+
+def goal_scope(goal_type):
+    return f"goal:{goal_type}"
+
+
+def scopes_for(goal_types):
+    return [GLOBAL_SCOPE] + [goal_scope(goal_type) for goal_type in sorted(set(goal_types))]
+
+
+def user_card(user):
+    return json.dumps({
+        "unique_id": str(user.unique_id),
+        "name": f"{user.first_name} {user.last_name[:1]}.".strip(),
+    })
+
+
+def record_activity(user, goal_types, sessions=0, volume_by_week=None, streak=None):
+    """
+    Apply one ingest to every board the user is on: ZINCRBY for counters and ZADD for the streak,
+    O(log n) each, sent in one pipelined round trip. Redis errors are logged, never raised,
+    the periodic reconciliation repairs anything missed.
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    scopes = scopes_for(goal_types)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(users_key(), user.id, user_card(user))
+        for scope in scopes:
+            if sessions:
+                pipe.zincrby(board_key('sessions', scope), sessions, user.id)
+            for week, volume in (volume_by_week or {}).items():
+                if volume:
+                    key = board_key('weekly_volume', scope, week)
+                    pipe.zincrby(key, float(volume), user.id)
+                    pipe.expire(key, WEEKLY_BOARD_TTL)
+            if streak is not None:
+                pipe.zadd(board_key('streak', scope), {user.id: streak})
+        pipe.execute()
+    except RedisError:
+        logger.exception("Could not update leaderboards for user %s", user.id)
+
+
+def _entries(client, rows, start_rank):
+    cards = client.hmget(users_key(), [member for member, _ in rows]) if rows else []
+    entries = []
+    for offset, ((member, score), card) in enumerate(zip(rows, cards)):
+        card = json.loads(card) if card else {"unique_id": None, "name": None}
+        entries.append({"rank": start_rank + offset, "score": score, **card})
+    return entries
+
+
+def top(client, board, scope=GLOBAL_SCOPE, offset=0, limit=10):
+    key = board_key(board, scope)
+    rows = client.zrevrange(key, offset, offset + limit - 1, withscores=True)
+    return {
+        "total": client.zcard(key),
+        "entries": _entries(client, [(member.decode(), score) for member, score in rows], offset + 1),
+    }
+
+
+def around(client, board, user_id, scope=GLOBAL_SCOPE, radius=5):
+    """
+    The user's rank plus `radius` neighbours on each side, or None when the user is not on the board.
+    """
+    key = board_key(board, scope)
+    rank = client.zrevrank(key, user_id)
+    if rank is None:
+        return None
+    start = max(rank - radius, 0)
+    rows = client.zrevrange(key, start, rank + radius, withscores=True)
+    return {
+        "rank": rank + 1,
+        "total": client.zcard(key),
+        "entries": _entries(client, [(member.decode(), score) for member, score in rows], start + 1),
+    }
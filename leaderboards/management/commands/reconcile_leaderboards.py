@@ -0,0 +1,145 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Max, Sum, F
+from django.utils import timezone
+from users.models import User, FitnessGoal
+from workout_sessions.models import WorkoutSession, SetLog, UserStreak
+from workout_sessions.streaks import local_today
+from leaderboards.boards import (
+    BOARDS, GLOBAL_SCOPE, WEEKLY_BOARD_TTL, get_redis, board_key, users_key, built_key, goal_scope, user_card,
+)
+
+# Rows younger than this may belong to an ingest transaction that has not committed yet, like in
+# analytics.aggregation: they are left out of the snapshot and replayed before the swap
+SETTLE_DELAY = timedelta(minutes=2)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the Redis leaderboards from the database and swap them in atomically. "
+        "Schedule it periodically (e.g. nightly), and with --if-missing every few minutes to recover from a cache flush."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--if-missing', action='store_true', help="Only rebuild when the boards are not built (after a flush).")
+
+    def handle(self, *args, **options):
+        client = get_redis()
+        if client is None:
+            raise CommandError("The default cache is not Redis, leaderboards are disabled.")
+
+        if options['if_missing'] and client.exists(built_key()):
+            self.stdout.write("Leaderboards are present, nothing to do.")
+            return
+
+        today = timezone.localdate()
+        week_start = timezone.make_aware(datetime.combine(today - timedelta(days=today.weekday()), time.min))
+
+        # Rows up to these ids are aggregated now. Activity ingested while the boards are built goes
+        # to the live keys, which the swap overwrites, so the later rows are replayed into the
+        # staged boards right before it
+        settled = timezone.now() - SETTLE_DELAY
+        last_ids = {
+            'sessions': WorkoutSession.objects.filter(created_at__lt=settled).aggregate(last=Max('id'))['last'] or 0,
+            'sets': SetLog.objects.filter(created_at__lt=settled).aggregate(last=Max('id'))['last'] or 0,
+        }
+        scores = self.aggregate(today, week_start, last_ids, 'lte')
+        goal_types = self.goal_types()
+        ranked_users = set().union(*(board_scores.keys() for board_scores in scores.values()))
+
+        # Build under temporary names, then RENAME so readers never see a half built board
+        suffix = uuid.uuid4().hex
+        staged = {}
+        weekly_keys = set()
+        self.stage(client, scores, goal_types, staged, weekly_keys, suffix)
+        cards_key = f"{users_key()}:staging:{suffix}"
+        self.stage_cards(client, cards_key, ranked_users)
+
+        replayed = self.aggregate(today, week_start, last_ids, 'gt')
+        replayed_users = set().union(*(board_scores.keys() for board_scores in replayed.values()))
+        goal_types.update(self.goal_types(replayed_users))
+        self.stage(client, replayed, goal_types, staged, weekly_keys, suffix)
+        self.stage_cards(client, cards_key, replayed_users - ranked_users)
+        ranked = ranked_users | replayed_users
+
+        pipe = client.pipeline(transaction=True)
+        # Boards with nobody on them anymore are dropped
+        for board in BOARDS:
+            for key in client.scan_iter(match=board_key(board, '*')):
+                key = key.decode()
+                if ':staging:' not in key and key not in staged:
+                    pipe.delete(key)
+        for key, staging_key in staged.items():
+            pipe.rename(staging_key, key)
+            if key in weekly_keys:
+                pipe.expire(key, WEEKLY_BOARD_TTL)
+        if ranked:
+            pipe.rename(cards_key, users_key())
+        pipe.set(built_key(), timezone.now().isoformat())
+        pipe.execute()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(staged)} leaderboards for {len(ranked)} users."))
+
+    def aggregate(self, today, week_start, last_ids, lookup):
+        """
+        {board: {user_id: score}} of the sessions and sets with an id `lookup` ('lte' or 'gt') `last_ids`.
+        """
+        scores = {board: defaultdict(float) for board in BOARDS}
+        sessions = WorkoutSession.objects.filter(**{f'id__{lookup}': last_ids['sessions']})
+        for row in sessions.values('user_id').annotate(total=Count('id')).iterator():
+            scores['sessions'][row['user_id']] = row['total']
+        for row in (
+            SetLog.objects.filter(performed_at__gte=week_start, **{f'id__{lookup}': last_ids['sets']})
+            .values('user_id')
+            .annotate(total=Sum(F('weight') * F('repetitions')))
+            .iterator()
+        ):
+            scores['weekly_volume'][row['user_id']] = float(row['total'] or 0)
+
+        # Only users active since yesterday can have a running streak, two days back covers every time zone
+        streaks = UserStreak.objects.filter(last_active_day__gte=today - timedelta(days=2)).select_related('user')
+        if lookup == 'gt':
+            # Streaks are not counters, only the ones the replayed sessions moved are read again
+            streaks = streaks.filter(user_id__in=list(scores['sessions']))
+        for state in streaks.iterator():
+            scores['streak'][state.user_id] = state.current_streak(local_today(state.user))
+        return scores
+
+    def goal_types(self, user_ids=None):
+        goals = FitnessGoal.objects.filter(is_active=True)
+        if user_ids is not None:
+            goals = goals.filter(user_id__in=list(user_ids))
+        goal_types = defaultdict(set)
+        for user_id, goal_type in goals.values_list('user_id', 'goal_type').iterator():
+            goal_types[user_id].add(goal_type)
+        return goal_types
+
+    def stage(self, client, scores, goal_types, staged, weekly_keys, suffix):
+        """
+        Add `scores` to the staging keys of their boards (ZINCRBY, so the replay adds onto the snapshot).
+        """
+        pipe = client.pipeline(transaction=False)
+        for board, board_scores in scores.items():
+            for user_id, score in board_scores.items():
+                if not score:
+                    continue
+                for scope in [GLOBAL_SCOPE] + [goal_scope(goal_type) for goal_type in goal_types[user_id]]:
+                    key = board_key(board, scope)
+                    staged.setdefault(key, f"{key}:staging:{suffix}")
+                    if BOARDS[board]:
+                        weekly_keys.add(key)
+                    if board == 'streak':
+                        pipe.zadd(staged[key], {user_id: score})
+                    else:
+                        pipe.zincrby(staged[key], score, user_id)
+        pipe.execute()
+
+    def stage_cards(self, client, cards_key, user_ids):
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), 1000):
+            users = User.objects.filter(id__in=user_ids[start:start + 1000]).only('id', 'unique_id', 'first_name', 'last_name')
+            mapping = {user.id: user_card(user) for user in users}
+            if mapping:
+                client.hset(cards_key, mapping=mapping)
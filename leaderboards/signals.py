@@ -0,0 +1,30 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.dispatch import receiver
+from users.models import FitnessGoal
+from workout_sessions.signals import workout_data_ingested
+from workout_sessions.models import UserStreak
+from workout_sessions.streaks import local_today
+from .boards import record_activity, week_label
+
+
+@receiver(workout_data_ingested)
+def update_leaderboards(sender, user, sessions, set_logs, **kwargs):
+    """
+    Push the ingested activity to the Redis boards once the ingest transaction commits.
+    """
+    volume_by_week = defaultdict(Decimal)
+    for set_log in set_logs:
+        volume_by_week[week_label(set_log.performed_at)] += set_log.weight * set_log.repetitions
+
+    goal_types = list(FitnessGoal.objects.filter(user=user, is_active=True).values_list('goal_type', flat=True))
+    streak = None
+    if sessions:
+        # Advanced earlier in the same transaction by the workout_sessions receiver
+        state = UserStreak.objects.filter(user=user).first()
+        streak = state.current_streak(local_today(user)) if state else 0
+
+    transaction.on_commit(lambda: record_activity(
+        user, goal_types, sessions=len(sessions), volume_by_week=volume_by_week, streak=streak,
+    ))
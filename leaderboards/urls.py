@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import LeaderboardView, LeaderboardAroundMeView
+
+urlpatterns = [
+    path('<str:board>/', LeaderboardView.as_view(), name='leaderboard'),
+    path('<str:board>/me/', LeaderboardAroundMeView.as_view(), name='leaderboard_around_me'),
+]
@@ -0,0 +1,94 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from redis.exceptions import RedisError
+from users.models import FitnessGoal
+from .boards import BOARDS, GLOBAL_SCOPE, get_redis, goal_scope, top, around
+
+
+class LeaderboardMixin:
+    """
+    Shared parsing of the board name and `scope` query param ('global' or a goal type).
+    Returns (client, scope, error response).
+    """
+
+    def resolve(self, request, board):
+        if board not in BOARDS:
+            return None, None, Response(
+                {"detail": f"Unknown leaderboard. Choose one of: {', '.join(BOARDS)}."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        scope = request.query_params.get('scope', GLOBAL_SCOPE)
+        if scope != GLOBAL_SCOPE:
+            if scope not in dict(FitnessGoal.GOAL_CHOICES):
+                return None, None, Response(
+                    {"detail": "scope must be 'global' or one of the fitness goal types."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            scope = goal_scope(scope)
+
+        client = get_redis()
+        if client is None:
+            return None, None, Response({"detail": "Leaderboards are not available."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return client, scope, None
+
+
+class LeaderboardView(LeaderboardMixin, APIView):
+    """
+    Top of a leaderboard, served from a Redis sorted set.
+
+    Query params:
+    - scope: 'global' (default) or a fitness goal type.
+    - offset / limit: paging over ranks (limit max 100).
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def get(self, request, board):
+        client, scope, error = self.resolve(request, board)
+        if error:
+            return error
+
+        try:
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            return Response({"detail": "offset and limit must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            data = top(client, board, scope, offset, limit)
+        except RedisError:
+            return Response({"detail": "Leaderboards are not available."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"board": board, "scope": scope, **data}, status=status.HTTP_200_OK)
+
+
+class LeaderboardAroundMeView(LeaderboardMixin, APIView):
+    """
+    Rank of the current user on a leaderboard and the users right above and below.
+
+    Query params:
+    - scope: 'global' (default) or a fitness goal type.
+    - radius: neighbours on each side (default 5, max 25).
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def get(self, request, board):
+        client, scope, error = self.resolve(request, board)
+        if error:
+            return error
+
+        try:
+            radius = min(max(int(request.query_params.get('radius', 5)), 0), 25)
+        except ValueError:
+            return Response({"detail": "radius must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            data = around(client, board, request.user.id, scope, radius)
+        except RedisError:
+            return Response({"detail": "Leaderboards are not available."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if data is None:
+            return Response({"detail": "You are not on this leaderboard yet."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"board": board, "scope": scope, **data}, status=status.HTTP_200_OK)
@@ -0,0 +1,31 @@
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django_redis.cache import RedisCache as BaseRedisCache
+from .registry import CACHE_REQUESTS, cache_namespace
+
+_missing = object()
+
+
+class InstrumentedCacheMixin:
+    """
+    Count hits and misses of get() and get_many() per key namespace (settings.METRICS_CACHE_NAMESPACES).
+    """
+
+    def get(self, key, default=None, version=None, **kwargs):
+        value = super().get(key, _missing, version=version, **kwargs)
+        hit = value is not _missing
+        CACHE_REQUESTS.labels(cache_namespace(key), 'hit' if hit else 'miss').inc()
+        return value if hit else default
+
+    def get_many(self, keys, version=None, **kwargs):
+        values = super().get_many(keys, version=version, **kwargs)
+        for key in keys:
+            CACHE_REQUESTS.labels(cache_namespace(key), 'hit' if key in values else 'miss').inc()
+        return values
+
+
+class RedisCache(InstrumentedCacheMixin, BaseRedisCache):
+    pass
+
+
+class LocMemCache(InstrumentedCacheMixin, BaseLocMemCache):
+    pass
@@ -0,0 +1,31 @@
+import time
+from rest_framework.serializers import BaseSerializer
+from .registry import current_stats
+
+
+def _timed(func):
+    def wrapper(self, *args, **kwargs):
+        stats = current_stats()
+        # Outside a request, or a serializer used inside another one (counted by the outer one)
+        if stats is None or stats.serializer_depth:
+            return func(self, *args, **kwargs)
+        stats.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            stats.serializer_seconds += time.perf_counter() - started
+            stats.serializer_depth -= 1
+    wrapper.instrumented = True
+    return wrapper
+
+
+def instrument_serializers():
+    """
+    Time BaseSerializer.data and is_valid, the entry points views call on a top-level serializer.
+    Serializer and ListSerializer reach them through super(), nested fields don't go through them at all.
+    """
+    if getattr(BaseSerializer.is_valid, 'instrumented', False):
+        return
+    BaseSerializer.data = property(_timed(BaseSerializer.data.fget))
+    BaseSerializer.is_valid = _timed(BaseSerializer.is_valid)
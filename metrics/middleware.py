@@ -0,0 +1,52 @@
+import time
+from django.db import connection
+from .registry import (
+    REQUEST_LATENCY, REQUEST_QUERIES, DB_QUERIES, DB_QUERY_SECONDS, SERIALIZER_SECONDS, start_request, end_request,
+)
+
+
+def view_labels(view_func, method):
+    """
+    ('app.ViewClass', action) of a resolved view. The action is the ViewSet action, or the HTTP method for other views.
+    """
+    method = method.lower()
+    cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if cls is None:
+        return f"{view_func.__module__.split('.')[0]}.{view_func.__name__}", method
+    actions = getattr(view_func, 'actions', None) or {}
+    return f"{cls.__module__.split('.')[0]}.{cls.__name__}", actions.get(method, method)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, SQL query count and time and serializer time of every request, labelled by view and action.
+    Requests that don't resolve to a view are labelled 'unmatched'. For streaming responses the latency
+    stops when the response starts.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats, token = start_request()
+        # Kept on the request for whoever wants this request's numbers (the query budget tests)
+        request.metrics_stats = stats
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+        finally:
+            end_request(token)
+        elapsed = time.perf_counter() - started
+
+        view, action = getattr(request, 'metrics_view', ('unmatched', ''))
+        REQUEST_LATENCY.labels(view, action, request.method, f"{response.status_code // 100}xx").observe(elapsed)
+        REQUEST_QUERIES.labels(view, action).observe(stats.queries)
+        DB_QUERIES.labels(view, action).inc(stats.queries)
+        DB_QUERY_SECONDS.labels(view, action).inc(stats.query_seconds)
+        SERIALIZER_SECONDS.labels(view, action).observe(stats.serializer_seconds)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view = view_labels(view_func, request.method)
+        return None
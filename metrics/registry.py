@@ -0,0 +1,77 @@
+import contextvars
+import time
+from django.conf import settings
+from prometheus_client import Counter, Gauge, Histogram
+
+# Key prefixes reported as their own cache namespace, every other key is counted as 'other'
+DEFAULT_CACHE_NAMESPACES = ('user_detail_', 'user_profile_', 'recommendations_user_', 'recommendation_version_')
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by view and action', ['view', 'action', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL queries per request', ['view', 'action'], buckets=QUERY_COUNT_BUCKETS,
+)
+DB_QUERIES = Counter('db_queries', 'SQL queries executed', ['view', 'action'])
+DB_QUERY_SECONDS = Counter('db_query_seconds', 'Time spent executing SQL', ['view', 'action'])
+SERIALIZER_SECONDS = Histogram(
+    'http_request_serializer_seconds', 'Serializer time per request (data and is_valid)', ['view', 'action'],
+)
+CACHE_REQUESTS = Counter('cache_requests', 'Cache lookups by key namespace', ['namespace', 'result'])
+CACHE_ERRORS = Counter('cache_errors', 'Cache calls that failed with a Redis error or timeout', ['operation'])
+CACHE_DEGRADED_CALLS = Counter(
+    'cache_degraded_calls', 'Cache calls served by the local tier because Redis was unavailable', ['operation'],
+)
+# Highest state over the worker processes in multiprocess mode
+CACHE_BREAKER_STATE = Gauge(
+    'cache_circuit_breaker_state', 'Cache circuit breaker: 0 closed, 1 half open, 2 open', multiprocess_mode='max',
+)
+CACHE_BREAKER_TRANSITIONS = Counter('cache_circuit_breaker_transitions', 'Cache circuit breaker state changes', ['state'])
+
+_current = contextvars.ContextVar('metrics_request_stats', default=None)
+
+
+class RequestStats:
+    """
+    Totals of the request being served, filled by the query hook and the serializer instrumentation.
+    """
+
+    __slots__ = ('queries', 'query_seconds', 'serializer_seconds', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_seconds += time.perf_counter() - started
+
+
+def start_request():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_stats():
+    return _current.get()
+
+
+def cache_namespace(key):
+    key = str(key)
+    for prefix in getattr(settings, 'METRICS_CACHE_NAMESPACES', DEFAULT_CACHE_NAMESPACES):
+        if key.startswith(prefix):
+            return prefix.rstrip('_')
+    return 'other'
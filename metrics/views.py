@@ -0,0 +1,28 @@
+import hmac
+import os
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from prometheus_client import CollectorRegistry, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+
+
+def _authorized(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and hmac.compare_digest(request.headers.get('X-Metrics-Token', ''), token):
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition. Under gunicorn, PROMETHEUS_MULTIPROC_DIR makes every worker write its samples
+    to that directory and this view sums them, so any worker can answer the scrape.
+    """
+    if not _authorized(request):
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
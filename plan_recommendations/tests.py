@@ -0,0 +1,24 @@
+from utils.query_budget import QueryBudgetTestCase
+
+
+class RecommendationQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets of the recommendations endpoint.
+    """
+
+    def test_cache_miss_then_hit(self):
+        self.request_within_budget(7, 'get', '/user_recommendations/recommendations/', user=self.user)
+        self.request_within_budget(1, 'get', '/user_recommendations/recommendations/', user=self.user)
+
+    def test_equivalent_pages_share_cache_entry(self):
+        self.request_within_budget(7, 'get', '/user_recommendations/recommendations/?page=1&page_size=10', user=self.user)
+        self.request_within_budget(1, 'get', '/user_recommendations/recommendations/', user=self.user)
+        self.request_within_budget(1, 'get', '/user_recommendations/recommendations/?page=01&page_size=', user=self.user)
+
+    def test_cache_is_invalidated_by_goal_changes(self):
+        self.request_within_budget(7, 'get', '/user_recommendations/recommendations/', user=self.user)
+        self.goal.save()
+        self.request_within_budget(7, 'get', '/user_recommendations/recommendations/', user=self.user)
+
+    def test_without_active_goals(self):
+        self.request_within_budget(2, 'get', '/user_recommendations/recommendations/', user=self.trainer, status_code=404)
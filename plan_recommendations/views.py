@@ -6,6 +6,7 @@ from users.models import FitnessGoal
 from workout_management.models import WorkoutPlan
 from workout_management.serializers import WorkoutPlanDetailSerializer
 from django.core.cache import cache
+from caching.compute import get_or_compute
 
 from rest_framework.pagination import PageNumberPagination
 
@@ -24,15 +25,31 @@ class RecommendationView(APIView):
     def get(self, request):
         user = request.user
 
-        # Cache key and version
-        cache_key = f"recommendations_user_{user.id}"
+        # Cache key and version, one entry per page. The page and its size are normalized first, so
+        # "?page=01" or an empty "?page_size=" share the entry of the page they resolve to
         version = cache.get(f"recommendation_version_{user.id}", 1)  # Default version is 1
+        paginator = self.pagination_class()
+        page_number = request.query_params.get(paginator.page_query_param, 1)
+        try:
+            page_number = int(page_number)
+        except ValueError:
+            # 'last', anything else is a 404 and never stored
+            pass
+        page_size = paginator.get_page_size(request)
+        cache_key = f"recommendations_user_{user.id}_{page_number}_{page_size}"
 
-        # Try to fetch recommendations from the cache
-        cached_data = cache.get(cache_key, version=version)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
+        response_data = get_or_compute(cache_key, lambda: self.build_recommendations(request, user), timeout=3600, version=version)
+        if response_data is None:
+            return Response(
+                {"detail": "You don't have any active fitness goals."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(response_data, status=status.HTTP_200_OK)
 
+    def build_recommendations(self, request, user):
+        """
+        The response data, None when the user has no active goals (cached too, a goal change bumps the version).
+        """
         # Use values_list to fetch only relevant data for active goals
         active_goals = list(
             FitnessGoal.objects.filter(user=user, is_active=True)
@@ -40,15 +57,12 @@ class RecommendationView(APIView):
         )
 
         if not active_goals:
-            return Response(
-                {"detail": "You don't have any active fitness goals."},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            return None
 
         # Fetch distinct workout plans related to active goals with prefetch
         recommended_plans = WorkoutPlan.objects.filter(
             goalworkoutmapping__goal_type__in=active_goals
-        ).distinct().select_related('created_by').prefetch_related("workout_exercises__exercise")
+        ).distinct().select_related('created_by').prefetch_related("workout_exercises__exercise__created_by")
 
         # Manually instantiate the paginator
         paginator = self.pagination_class()
@@ -57,15 +71,7 @@ class RecommendationView(APIView):
         page = paginator.paginate_queryset(recommended_plans, request)
         if page is not None:
             serializer = WorkoutPlanDetailSerializer(page, many=True)
-            paginated_data = paginator.get_paginated_response(serializer.data).data
-            # Cache the paginated response
-            cache.set(cache_key, paginated_data, timeout=3600, version=version)
-            return Response(paginated_data, status=status.HTTP_200_OK)
+            return paginator.get_paginated_response(serializer.data).data
 
         serializer = WorkoutPlanDetailSerializer(recommended_plans, many=True)
-        response_data = serializer.data
-
-        # Cache the full response
-        cache.set(cache_key, response_data, timeout=3600, version=version)
-
-        return Response(response_data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return serializer.data
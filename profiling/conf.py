@@ -0,0 +1,36 @@
+from django.conf import settings
+
+DEFAULTS = {
+    # Share of requests recorded, per URL name (e.g. 'workout_plan-list') with a default for the rest
+    'DEFAULT_SAMPLE_RATE': 0.01,
+    'SAMPLE_RATES': {},
+    # Requests slower than this are always recorded
+    'SLOW_REQUEST_MS': 1000,
+    # Sending this header with the token forces a recording, no header trigger without a token
+    'HEADER': 'X-Profile',
+    'HEADER_TOKEN': None,
+    'IGNORE_PATH_PREFIXES': ('/silk/', '/admin/', '/static/'),
+    'MAX_QUERIES_PER_REQUEST': 200,
+    'MAX_BODY_SIZE': 4096,
+    # In-memory buffer between requests and the writer thread, recordings are dropped when it is full
+    'BUFFER_SIZE': 1000,
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,
+    # Oldest recordings beyond SILKY_MAX_RECORDED_REQUESTS are deleted every this many batches
+    'GARBAGE_COLLECT_EVERY': 10,
+    # Write from a background thread, False writes inline (tests)
+    'ASYNC': True,
+    # N+1 and slow query inspection of every request: 'warn' logs, 'raise' raises NPlusOneError (tests), 'off'
+    'QUERY_INSPECTION': 'warn',
+    # A request running the same SELECT shape this many times is reported as N+1
+    'N_PLUS_ONE_THRESHOLD': 5,
+    # Queries slower than this are logged with their EXPLAIN plan
+    'SLOW_QUERY_MS': 200,
+    'EXPLAIN_SLOW_QUERIES': True,
+    # Frames of the project's own code shown with a report
+    'STACK_DEPTH': 8,
+}
+
+
+def get(name):
+    return getattr(settings, 'PROFILING', {}).get(name, DEFAULTS[name])
@@ -0,0 +1,162 @@
+import json
+import random
+import time
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from . import conf, recorder
+from .queries import inspect_queries
+
+HIDDEN_HEADERS = {'authorization', 'cookie', 'set-cookie', 'x-profile'}
+
+TEXT_CONTENT_TYPES = ('application/json', 'text/', 'application/x-www-form-urlencoded')
+
+# JSON body keys whose values are never stored (login passwords, issued tokens), matched as substrings
+SENSITIVE_KEYS = ('password', 'token', 'access', 'refresh', 'secret', 'key')
+
+
+class QueryCollector:
+    """
+    connection.execute_wrapper hook: timestamps every query of the request. Cheap enough to run on every
+    request, so a request that turns out slow can still be recorded with its SQL.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.count = 0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = timezone.now()
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            if len(self.queries) < self.limit:
+                elapsed = time.perf_counter() - started
+                self.queries.append({
+                    'sql': sql,
+                    'start_time': start,
+                    'end_time': start + timedelta(seconds=elapsed),
+                    'time_taken': elapsed * 1000,
+                })
+
+
+def _headers(headers):
+    return json.dumps({key: value for key, value in headers.items() if key.lower() not in HIDDEN_HEADERS})
+
+
+def _mask(value):
+    if isinstance(value, dict):
+        return {key: '********' if any(word in key.lower() for word in SENSITIVE_KEYS) else _mask(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_mask(item) for item in value]
+    return value
+
+
+def _text(content, content_type):
+    if not content or not content_type.startswith(TEXT_CONTENT_TYPES):
+        return ''
+    if content_type.startswith('application/json'):
+        try:
+            content = json.dumps(_mask(json.loads(content))).encode()
+        except ValueError:
+            return ''
+    elif content_type.startswith('application/x-www-form-urlencoded'):
+        # Form posts can carry passwords as well and are not worth parsing here
+        return ''
+    return content[:conf.get('MAX_BODY_SIZE')].decode('utf-8', errors='replace')
+
+
+class SampledProfilingMiddleware:
+    """
+    Replacement for silk.middleware.SilkyMiddleware that only records a sample of the traffic.
+
+    A request is recorded when its view is sampled (PROFILING['SAMPLE_RATES'] by URL name, else
+    'DEFAULT_SAMPLE_RATE'), when it is slower than 'SLOW_REQUEST_MS', or when it carries the
+    'HEADER' with the configured token. The decision is made after the response, the only per
+    request cost otherwise is a timer and the query hook. Recordings go to a buffer written by a
+    background thread (see profiling.recorder), never in the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith(tuple(conf.get('IGNORE_PATH_PREFIXES'))):
+            return self.get_response(request)
+
+        token = conf.get('HEADER_TOKEN')
+        request.profiling_forced = bool(token) and request.headers.get(conf.get('HEADER')) == token
+        request.profiling_sampled = request.profiling_forced
+
+        collector = QueryCollector(conf.get('MAX_QUERIES_PER_REQUEST'))
+        start_time = timezone.now()
+        started = time.perf_counter()
+        with connection.execute_wrapper(collector):
+            response = self.get_response(request)
+        time_taken = (time.perf_counter() - started) * 1000
+
+        if request.profiling_sampled or time_taken >= conf.get('SLOW_REQUEST_MS'):
+            recorder.record(self.build_recording(request, response, collector, start_time, time_taken))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not hasattr(request, 'profiling_sampled'):
+            # Ignored path
+            return None
+        if request.profiling_sampled:
+            self._cache_body(request)
+            return None
+
+        rates = conf.get('SAMPLE_RATES')
+        rate = rates.get(request.resolver_match.view_name, conf.get('DEFAULT_SAMPLE_RATE'))
+        request.profiling_sampled = random.random() < rate
+        if request.profiling_sampled:
+            self._cache_body(request)
+        return None
+
+    def _cache_body(self, request):
+        # Read small bodies before the view consumes the stream, streaming uploads are left alone
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return
+        if 0 < length <= conf.get('MAX_BODY_SIZE'):
+            request.body
+
+    def build_recording(self, request, response, collector, start_time, time_taken):
+        request_body = getattr(request, '_body', b'')
+        response_body = b'' if response.streaming else response.content
+        return {
+            'path': request.path,
+            'query_params': json.dumps(request.GET.dict()),
+            'method': request.method,
+            'view_name': request.resolver_match.view_name if request.resolver_match else '',
+            'start_time': start_time,
+            'end_time': start_time + timedelta(milliseconds=time_taken),
+            'time_taken': time_taken,
+            'request_headers': _headers(request.headers),
+            'request_body': _text(request_body, request.content_type or ''),
+            'status_code': response.status_code,
+            'response_headers': _headers(response.headers),
+            'response_body': _text(response_body, response.get('Content-Type', '')),
+            'num_queries': collector.count,
+            'queries': collector.queries,
+        }
+
+
+class QueryInspectionMiddleware:
+    """
+    Check every request for N+1 query patterns and slow queries, see profiling.queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith(tuple(conf.get('IGNORE_PATH_PREFIXES'))):
+            return self.get_response(request)
+        with inspect_queries(f"{request.method} {request.path}"):
+            return self.get_response(request)
@@ -0,0 +1,156 @@
+import logging
+import re
+import time
+import sys
+from collections import Counter
+from contextlib import contextmanager, ExitStack
+from pathlib import Path
+from django.conf import settings
+from django.db import connections, transaction, DatabaseError
+from . import conf
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+class NPlusOneError(Exception):
+    """
+    Raised in 'raise' mode when a request repeats the same query shape N_PLUS_ONE_THRESHOLD times.
+    """
+
+
+def fingerprint(sql):
+    """
+    The shape of a query: literals replaced by ?, IN lists of any length collapsed, whitespace normalized.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+# Frames never worth showing: the query machinery itself and this instrumentation
+_SKIPPED_FRAMES = re.compile(r"[/\\](?:django[/\\]db|profiling|metrics)[/\\]|[/\\](?:contextlib|threading)\.py$")
+
+
+def query_stack():
+    """
+    The frames that led to the current query, innermost last: the STACK_DEPTH innermost frames outside
+    the ORM, each tagged with the class of its `self` (which serializer or field was rendering), plus
+    the innermost frame of the project's own code when it falls outside that window.
+    """
+    base_dir = str(Path(settings.BASE_DIR))
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None:
+        if not _SKIPPED_FRAMES.search(frame.f_code.co_filename):
+            frames.append(frame)
+        frame = frame.f_back
+
+    shown = frames[:conf.get('STACK_DEPTH')]
+    own = next((frame for frame in frames if frame.f_code.co_filename.startswith(base_dir) and 'site-packages' not in frame.f_code.co_filename), None)
+    if own is not None and own not in shown:
+        shown.append(own)
+
+    lines = []
+    for frame in reversed(shown):
+        owner = frame.f_locals.get('self')
+        owner = f" ({type(owner).__name__})" if owner is not None else ''
+        lines.append(f'  File "{frame.f_code.co_filename}", line {frame.f_lineno}, in {frame.f_code.co_name}{owner}\n')
+    return ''.join(lines)
+
+
+class QueryInspector:
+    """
+    connection.execute_wrapper hook that counts SELECTs per fingerprint and times every query.
+
+    The first time a fingerprint reaches N_PLUS_ONE_THRESHOLD the stack is captured, so the report
+    points at the loop that issued it. Queries slower than SLOW_QUERY_MS are logged right away with
+    their EXPLAIN plan (SELECTs only, in a savepoint so a failing EXPLAIN can't break the transaction).
+    """
+
+    def __init__(self, label=''):
+        self.label = label
+        self.threshold = conf.get('N_PLUS_ONE_THRESHOLD')
+        self.slow_ms = conf.get('SLOW_QUERY_MS')
+        self.counts = Counter()
+        self.stacks = {}
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        is_select = sql.lstrip()[:6].upper() in ('SELECT', 'WITH')
+        if is_select and not many:
+            shape = fingerprint(sql)
+            self.counts[shape] += 1
+            if self.counts[shape] == self.threshold:
+                self.stacks[shape] = query_stack()
+
+        if elapsed_ms >= self.slow_ms:
+            plan = self.explain(context['connection'], sql, params) if is_select and not many else ''
+            logger.warning(
+                "Slow query (%.1f ms)%s: %s\nPlan:\n%s\nStack:\n%s",
+                elapsed_ms, f" in {self.label}" if self.label else '', sql, plan or '-', query_stack(),
+            )
+        return result
+
+    def explain(self, connection, sql, params):
+        if not conf.get('EXPLAIN_SLOW_QUERIES'):
+            return ''
+        self.explaining = True
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+        except DatabaseError as error:
+            return f"EXPLAIN failed: {error}"
+        finally:
+            self.explaining = False
+
+    def n_plus_one(self):
+        """
+        [(fingerprint, count, stack)] of the query shapes repeated at least N_PLUS_ONE_THRESHOLD times.
+        """
+        return [(shape, self.counts[shape], stack) for shape, stack in self.stacks.items()]
+
+    def report(self, mode):
+        findings = self.n_plus_one()
+        if not findings:
+            return
+        message = '\n\n'.join(
+            f"N+1 query{f' in {self.label}' if self.label else ''}: executed {count} times: {shape}\nStack:\n{stack}"
+            for shape, count, stack in findings
+        )
+        if mode == 'raise':
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+@contextmanager
+def inspect_queries(label='', mode=None, using=None):
+    """
+    Inspect the queries run inside the block on every database (or only `using`) and report N+1
+    patterns on exit. `mode` is 'warn', 'raise' or 'off', PROFILING['QUERY_INSPECTION'] by default.
+    Tests can wrap any code in it with mode='raise'.
+    """
+    mode = mode or conf.get('QUERY_INSPECTION')
+    if mode == 'off':
+        yield None
+        return
+
+    inspector = QueryInspector(label)
+    with ExitStack() as stack:
+        for alias in [using] if using else connections:
+            stack.enter_context(connections[alias].execute_wrapper(inspector))
+        yield inspector
+    inspector.report(mode)
@@ -0,0 +1,138 @@
+import atexit
+import logging
+import queue
+import threading
+from django.db import transaction, close_old_connections
+from silk.models import Request, Response, SQLQuery
+from . import conf
+
+logger = logging.getLogger(__name__)
+
+_buffer = None
+_writer = None
+_lock = threading.Lock()
+_batches = 0
+dropped = 0
+
+
+def _get_buffer():
+    global _buffer
+    if _buffer is None:
+        _buffer = queue.Queue(maxsize=conf.get('BUFFER_SIZE'))
+    return _buffer
+
+
+def record(recording):
+    """
+    Hand a finished recording to the writer. Never blocks the request: when the buffer is full the recording is dropped.
+    """
+    global dropped
+    if not conf.get('ASYNC'):
+        write([recording])
+        return
+
+    _ensure_writer()
+    try:
+        _get_buffer().put_nowait(recording)
+    except queue.Full:
+        dropped += 1
+
+
+def _ensure_writer():
+    """
+    Start the writer lazily, so each worker process (forked after import) gets its own thread.
+    """
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_run, name='profiling-writer', daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+
+def _drain(first=None):
+    batch = [first] if first is not None else []
+    buffer = _get_buffer()
+    while len(batch) < conf.get('BATCH_SIZE'):
+        try:
+            batch.append(buffer.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _run():
+    while True:
+        try:
+            first = _get_buffer().get(timeout=conf.get('FLUSH_INTERVAL'))
+        except queue.Empty:
+            continue
+        try:
+            write(_drain(first))
+        except Exception:
+            logger.exception("Could not write profiling recordings")
+        finally:
+            close_old_connections()
+
+
+def flush():
+    """
+    Write everything still buffered, used at exit.
+    """
+    while True:
+        batch = _drain()
+        if not batch:
+            return
+        write(batch)
+
+
+def write(batch):
+    """
+    Store a batch of recordings in Silk's tables with three bulk inserts, so the Silk UI shows them as usual.
+    """
+    global _batches
+    requests, responses, queries = [], [], []
+    for recording in batch:
+        silk_request = Request(
+            path=recording['path'][:190],
+            query_params=recording['query_params'],
+            body=recording['request_body'],
+            method=recording['method'],
+            start_time=recording['start_time'],
+            end_time=recording['end_time'],
+            time_taken=recording['time_taken'],
+            view_name=(recording['view_name'] or '')[:190],
+            encoded_headers=recording['request_headers'],
+            num_sql_queries=recording['num_queries'],
+            meta_num_queries=0,
+            meta_time_spent_queries=0,
+        )
+        requests.append(silk_request)
+        responses.append(Response(
+            request=silk_request,
+            status_code=recording['status_code'],
+            body=recording['response_body'],
+            encoded_headers=recording['response_headers'],
+        ))
+        for query in recording['queries']:
+            queries.append(SQLQuery(
+                request=silk_request,
+                query=query['sql'],
+                start_time=query['start_time'],
+                end_time=query['end_time'],
+                time_taken=query['time_taken'],
+                traceback='',
+            ))
+
+    with transaction.atomic():
+        Request.objects.bulk_create(requests)
+        Response.objects.bulk_create(responses)
+        # The base manager skips SQLQueryManager.bulk_create, which saves the request once per query
+        SQLQuery._base_manager.bulk_create(queries)
+
+    _batches += 1
+    if _batches % conf.get('GARBAGE_COLLECT_EVERY') == 0:
+        # Retention cap: keeps the newest SILKY_MAX_RECORDED_REQUESTS
+        Request.garbage_collect(force=True)
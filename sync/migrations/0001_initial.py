@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(choices=[('exercises', 'exercises'), ('workout_plans', 'workout_plans'), ('workout_exercises', 'workout_exercises'), ('fitness_goals', 'fitness_goals')], max_length=30)),
+                ('object_id', models.CharField(max_length=64)),
+                ('owner_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Tombstones',
+                'indexes': [models.Index(fields=['owner_id', 'id'], name='sync_tombst_owner_i_a7079c_idx')],
+            },
+        ),
+    ]
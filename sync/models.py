@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Tombstone(models.Model):
+    """
+    Marker left behind when a synced row is deleted, so offline clients can drop it too.
+    """
+
+    RESOURCE_CHOICES = [
+        ('exercises', 'exercises'),
+        ('workout_plans', 'workout_plans'),
+        ('workout_exercises', 'workout_exercises'),
+        ('fitness_goals', 'fitness_goals'),
+    ]
+
+    resource = models.CharField(max_length=30, choices=RESOURCE_CHOICES)
+    # unique_id for models that have one, primary key otherwise
+    object_id = models.CharField(max_length=64)
+    # set for rows only visible to one user (fitness goals), null for shared rows.
+    # Not a foreign key so deleting a user does not fight with its own tombstones.
+    owner_id = models.BigIntegerField(blank=True, null=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name_plural = _("Tombstones")
+        indexes = [
+            models.Index(fields=['owner_id', 'id']),
+        ]
+
+    def __str__(self):
+        return f"deleted {self.resource}: {self.object_id}"
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+from workout_management.models import WorkoutPlan, WorkoutExercise
+
+
+class SyncWorkoutPlanSerializer(serializers.ModelSerializer):
+    created_by = serializers.SlugRelatedField(read_only=True, slug_field='unique_id')
+
+    class Meta:
+        model = WorkoutPlan
+        fields = ('unique_id', 'created_by', 'title', 'description', 'difficulty_level', 'workout_banner', 'tags', 'created_at', 'updated_at')
+
+
+class SyncWorkoutExerciseSerializer(serializers.ModelSerializer):
+    workout_plan = serializers.SlugRelatedField(read_only=True, slug_field='unique_id')
+    exercise = serializers.SlugRelatedField(read_only=True, slug_field='unique_id')
+
+    class Meta:
+        model = WorkoutExercise
+        fields = ('id', 'workout_plan', 'exercise', 'order', 'repetitions', 'sets', 'rest_time', 'updated_at')
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from users.models import FitnessGoal
+from exercises.models import Exercise
+from workout_management.models import WorkoutPlan, WorkoutExercise
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Exercise)
+def exercise_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(resource='exercises', object_id=str(instance.unique_id))
+
+
+@receiver(post_delete, sender=WorkoutPlan)
+def workout_plan_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(resource='workout_plans', object_id=str(instance.unique_id))
+
+
+@receiver(post_delete, sender=WorkoutExercise)
+def workout_exercise_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(resource='workout_exercises', object_id=str(instance.pk))
+
+
+@receiver(post_delete, sender=FitnessGoal)
+def fitness_goal_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(resource='fitness_goals', object_id=str(instance.unique_id), owner_id=instance.user_id)
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from users.models import FitnessGoal
+from exercises.models import Exercise
+from exercises.serializers import ListExerciseSerializer
+from fitness_goal.serializers import ListFitnessGoalSerializer
+from workout_management.models import WorkoutPlan, WorkoutExercise
+from .models import Tombstone
+from .serializers import SyncWorkoutPlanSerializer, SyncWorkoutExerciseSerializer
+
+TOKEN_SALT = 'sync.token'
+
+# Rows changed more recently are left for the next call. updated_at (and a tombstone's id) is taken
+# when the row is saved, not when its transaction commits, so a cursor past a row whose transaction
+# was still open would skip it for good. Waiting this long lets such transactions commit first.
+SETTLE_DELAY = timedelta(minutes=1)
+
+
+class SyncView(APIView):
+    """
+    Change feed for offline clients.
+
+    GET /sync/ returns the first batch of every resource, GET /sync/?since=<token>
+    returns only rows changed or deleted after the token was issued. Keep calling
+    with `next_token` while `has_more` is true. The token is opaque and signed.
+    Changes show up once they are SETTLE_DELAY old, in exchange no change is ever skipped.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 1000
+
+    def get_resources(self, user):
+        """
+        Resource name -> (queryset, serializer class). Every queryset is ordered by the (updated_at, id) cursor.
+        """
+        return {
+            'exercises': (
+                Exercise.objects.select_related('created_by'),
+                ListExerciseSerializer,
+            ),
+            'workout_plans': (
+                WorkoutPlan.objects.select_related('created_by'),
+                SyncWorkoutPlanSerializer,
+            ),
+            'workout_exercises': (
+                WorkoutExercise.objects.select_related('workout_plan', 'exercise'),
+                SyncWorkoutExerciseSerializer,
+            ),
+            'fitness_goals': (
+                FitnessGoal.objects.filter(user=user),
+                ListFitnessGoalSerializer,
+            ),
+        }
+
+    def get(self, request):
+        user = request.user
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.DEFAULT_LIMIT)), 1), self.MAX_LIMIT)
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        token = request.query_params.get('since')
+        state = {"cursors": {}, "tombstone": 0}
+        if token:
+            try:
+                state = signing.loads(token, salt=TOKEN_SALT)
+            except signing.BadSignature:
+                return Response({"detail": "The sync token is invalid."}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Tombstones older than the retention window are pruned, a client that has been
+            # away for longer may have missed deletes
+            retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+            if datetime.fromtimestamp(state["issued"], tz=dt_timezone.utc) < timezone.now() - retention:
+                return Response(
+                    {"detail": "The sync token has expired. Drop local data and sync again without a token."},
+                    status=status.HTTP_410_GONE
+                )
+
+        has_more = False
+        changes = {}
+        cursors = dict(state["cursors"])
+        settled = timezone.now() - SETTLE_DELAY
+
+        for resource, (queryset, serializer_class) in self.get_resources(user).items():
+            queryset = queryset.filter(updated_at__lt=settled)
+            cursor = cursors.get(resource)
+            if cursor:
+                updated_at = datetime.fromisoformat(cursor[0])
+                queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=cursor[1]))
+
+            rows = list(queryset.order_by('updated_at', 'id')[:limit + 1])
+            if len(rows) > limit:
+                has_more = True
+                rows = rows[:limit]
+
+            changes[resource] = serializer_class(rows, many=True).data
+            if rows:
+                cursors[resource] = [rows[-1].updated_at.isoformat(), rows[-1].id]
+
+        tombstones = list(
+            Tombstone.objects.filter(Q(owner_id__isnull=True) | Q(owner_id=user.id), id__gt=state["tombstone"], deleted_at__lt=settled)
+            .order_by('id')
+            .values('id', 'resource', 'object_id')[:limit + 1]
+        )
+        if len(tombstones) > limit:
+            has_more = True
+            tombstones = tombstones[:limit]
+
+        next_state = {
+            "cursors": cursors,
+            "tombstone": tombstones[-1]['id'] if tombstones else state["tombstone"],
+            "issued": timezone.now().timestamp(),
+        }
+
+        return Response({
+            "changes": changes,
+            "deleted": [{"resource": item['resource'], "id": item['object_id']} for item in tombstones],
+            "has_more": has_more,
+            "next_token": signing.dumps(next_state, salt=TOKEN_SALT, compress=True),
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from django.conf import settings
+from django.core.cache import caches
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from caching.backends import CacheUnavailable
+
+logger = logging.getLogger(__name__)
+
+# `count` requests per `period` seconds counted under `key`
+Limit = namedtuple('Limit', ['key', 'count', 'period'])
+
+# GCRA (generic cell rate algorithm) over several limits at once. Each key holds one number, the
+# "theoretical arrival time" (TAT) of the next request, so memory per key is constant whatever the
+# rate. A limit of N per period allows a burst of N, then one request every period / N.
+# KEYS: one per limit. ARGV: emission interval and period of each limit, in microseconds.
+# The request is counted against every limit only when all of them allow it. Returns 0 when
+# allowed, else the microseconds to wait. Redis' clock is used, so workers never disagree.
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local new_tats = {}
+local wait = 0
+for index, key in ipairs(KEYS) do
+    local interval = tonumber(ARGV[index * 2 - 1])
+    local period = tonumber(ARGV[index * 2])
+    local tat = math.max(tonumber(redis.call('GET', key) or now), now)
+    new_tats[index] = tat + interval
+    wait = math.max(wait, new_tats[index] - period - now)
+end
+if wait > 0 then
+    return wait
+end
+for index, key in ipairs(KEYS) do
+    redis.call('SET', key, new_tats[index], 'PX', math.ceil((new_tats[index] - now) / 1000))
+end
+return 0
+"""
+
+
+def _microseconds(limit):
+    period = int(limit.period * 1000000)
+    return period // limit.count, period
+
+
+class RedisLimiter:
+    """
+    Runs GCRA_SCRIPT, one round trip per request whatever the number of limits.
+    """
+
+    def __init__(self, client):
+        self.script = client.register_script(GCRA_SCRIPT)
+
+    def hit(self, limits):
+        """
+        Count a request against `limits`: 0 when it is allowed, else the seconds to wait.
+        """
+        args = []
+        for limit in limits:
+            args.extend(_microseconds(limit))
+        return self.script(keys=[limit.key for limit in limits], args=args) / 1000000
+
+
+class LocalLimiter:
+    """
+    The same algorithm in process memory, for a cache that is not Redis and while Redis is
+    unavailable. Limits then apply per process. Keys beyond `max_keys` are dropped oldest first.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._tats = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, limits):
+        now = int(time.time() * 1000000)
+        with self._lock:
+            new_tats = {}
+            wait = 0
+            for limit in limits:
+                interval, period = _microseconds(limit)
+                new_tats[limit.key] = max(self._tats.get(limit.key, now), now) + interval
+                wait = max(wait, new_tats[limit.key] - period - now)
+            if wait > 0:
+                return wait / 1000000
+            for key, tat in new_tats.items():
+                self._tats[key] = tat
+                self._tats.move_to_end(key)
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+        return 0
+
+
+class Limiter:
+    """
+    Rate limiter over the Redis of a django-redis cache (settings.THROTTLING['CACHE_ALIAS']).
+    With the tiered cache the calls share its circuit breaker. Without Redis, or when it fails,
+    requests are counted by the LocalLimiter instead: a Redis outage loosens limits, it never
+    blocks the API.
+    """
+
+    def __init__(self, alias, max_local_keys):
+        self.cache = caches[alias]
+        self.local = LocalLimiter(max_local_keys)
+        try:
+            self.redis = RedisLimiter(get_redis_connection(alias))
+        except NotImplementedError:
+            self.redis = None
+
+    def hit(self, limits):
+        if self.redis is None:
+            return self.local.hit(limits)
+        try:
+            if hasattr(self.cache, 'redis_call'):
+                return self.cache.redis_call('throttle', self.redis.hit, limits)
+            return self.redis.hit(limits)
+        except CacheUnavailable:
+            return self.local.hit(limits)
+        except RedisError:
+            logger.warning("Rate limiter could not reach Redis, counting locally", exc_info=True)
+            return self.local.hit(limits)
+
+
+_limiter = None
+_lock = threading.Lock()
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        with _lock:
+            if _limiter is None:
+                conf = getattr(settings, 'THROTTLING', {})
+                _limiter = Limiter(conf.get('CACHE_ALIAS', 'default'), conf.get('LOCAL_MAX_KEYS', 10000))
+    return _limiter
+
+
+def key_prefix():
+    conf = getattr(settings, 'THROTTLING', {})
+    return f"{settings.CACHES[conf.get('CACHE_ALIAS', 'default')].get('KEY_PREFIX', '')}:throttle"
+
+
+def parse_rate(rate):
+    """
+    "<count>/<period>" as in DRF ('5/minute', '100/hour'), or "<count>/<seconds>s" ('10/30s').
+    Returns (count, seconds) or None for an empty rate (scope not limited).
+    """
+    if not rate:
+        return None
+    count, _, period = rate.partition('/')
+    if period.endswith('s') and period[:-1].isdigit():
+        seconds = int(period[:-1])
+    else:
+        seconds = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return int(count), seconds
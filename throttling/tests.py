@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from django_redis import get_redis_connection
+from rest_framework.test import APITestCase
+from users.models import User
+from .limiter import Limit, LocalLimiter, RedisLimiter, parse_rate
+
+
+def limited_rates(**rates):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+class LimiterTests(SimpleTestCase):
+    """
+    The GCRA script against fakeredis, and the in-process fallback.
+    """
+
+    def setUp(self):
+        self.redis = get_redis_connection(settings.THROTTLING['CACHE_ALIAS'])
+        self.redis.flushdb()
+
+    def assert_burst_then_wait(self, limiter):
+        limits = [Limit('test:a', 3, 60)]
+        self.assertEqual([limiter.hit(limits) for _ in range(3)], [0, 0, 0])
+        wait = limiter.hit(limits)
+        self.assertGreater(wait, 19)
+        self.assertLessEqual(wait, 20)
+
+    def test_redis_burst_then_wait(self):
+        self.assert_burst_then_wait(RedisLimiter(self.redis))
+
+    def test_local_burst_then_wait(self):
+        self.assert_burst_then_wait(LocalLimiter(100))
+
+    def test_redis_keeps_one_key_per_limit(self):
+        limiter = RedisLimiter(self.redis)
+        for _ in range(10):
+            limiter.hit([Limit('test:a', 100, 60)])
+        self.assertEqual(self.redis.keys('*'), [b'test:a'])
+        self.assertLessEqual(self.redis.pttl('test:a'), 6000)
+
+    def test_refused_request_counts_against_no_limit(self):
+        limiter = RedisLimiter(self.redis)
+        strict, loose = Limit('test:strict', 1, 60), Limit('test:loose', 2, 60)
+        self.assertEqual(limiter.hit([strict, loose]), 0)
+        self.assertGreater(limiter.hit([strict, loose]), 0)
+        # The refused request did not use up the loose limit
+        self.assertEqual(limiter.hit([loose]), 0)
+
+    def test_local_drops_oldest_keys(self):
+        limiter = LocalLimiter(2)
+        for key in ('a', 'b', 'c'):
+            limiter.hit([Limit(key, 1, 60)])
+        self.assertEqual(limiter.hit([Limit('a', 1, 60)]), 0)
+        self.assertGreater(limiter.hit([Limit('c', 1, 60)]), 0)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/minute'), (5, 60))
+        self.assertEqual(parse_rate('100/hour'), (100, 3600))
+        self.assertEqual(parse_rate('10/30s'), (10, 30))
+        self.assertIsNone(parse_rate(''))
+        self.assertIsNone(parse_rate(None))
+
+
+class RateLimitThrottleTests(APITestCase):
+    """
+    Scopes of RateLimitThrottle on real endpoints.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="throttled@example.com", password="Strong-pass-123", first_name="Test", last_name="User", height=1.80, weight=80,
+        )
+
+    def setUp(self):
+        caches[settings.THROTTLING['CACHE_ALIAS']].clear()
+
+    @limited_rates(login='2/minute')
+    def test_login_scope(self):
+        payload = {"email": self.user.email, "password": "Strong-pass-123"}
+        for _ in range(2):
+            self.assertEqual(self.client.post('/users/login/', payload, format='json').status_code, 200)
+        response = self.client.post('/users/login/', payload, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("too many login attempts", response.data['message'])
+        self.assertIn('Retry-After', response)
+
+    @limited_rates(user='2/minute')
+    def test_user_scope_is_per_user(self):
+        other = User.objects.create_user(
+            email="other@example.com", password="Strong-pass-123", first_name="Test", last_name="User", height=1.80, weight=80,
+        )
+        self.client.force_authenticate(self.user)
+        for _ in range(2):
+            self.assertEqual(self.client.get('/users/current_user/').status_code, 200)
+        self.assertEqual(self.client.get('/users/current_user/').status_code, 429)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get('/users/current_user/').status_code, 200)
+
+    @limited_rates(ip='1/minute')
+    def test_ip_scope_covers_authenticated_requests(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/users/current_user/').status_code, 200)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post('/users/login/', {}, format='json').status_code, 429)
@@ -0,0 +1,45 @@
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from .limiter import Limit, get_limiter, key_prefix, parse_rate
+
+
+class RateLimitThrottle(BaseThrottle):
+    """
+    Rate limits of every scope in one atomic Redis call (see throttling.limiter):
+
+    - 'user': per authenticated user
+    - 'anon': per IP for unauthenticated requests
+    - 'ip': per IP for all requests, authenticated or not
+    - the view's `throttle_scope` (e.g. 'login'): per user, or per IP when unauthenticated
+
+    Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']; a scope without a rate isn't limited.
+    """
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_limits(self, request, view):
+        ip = self.get_ident(request)
+        authenticated = bool(request.user and request.user.is_authenticated)
+        ident = f"user:{request.user.pk}" if authenticated else f"ip:{ip}"
+        scopes = [('user' if authenticated else 'anon', ident), ('ip', f"ip:{ip}")]
+        endpoint = getattr(view, 'throttle_scope', None)
+        if endpoint:
+            scopes.append((endpoint, ident))
+
+        limits = []
+        for scope, scope_ident in scopes:
+            rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+            if rate:
+                limits.append(Limit(f"{key_prefix()}:{scope}:{scope_ident}", *rate))
+        return limits
+
+    def allow_request(self, request, view):
+        limits = self.get_limits(request, view)
+        if not limits:
+            return True
+        self.retry_after = get_limiter().hit(limits)
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_alter_fitnessgoal_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fitnessgoal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='fitnessgoal',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='users_fitne_user_id_aee942_idx'),
+        ),
+    ]
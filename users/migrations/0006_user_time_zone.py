@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_fitnessgoal_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='time_zone',
+            field=models.CharField(default='UTC', help_text='IANA time zone of the user (e.g. Europe/Berlin), decides which calendar day a workout counts for.', max_length=63),
+        ),
+    ]
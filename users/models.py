@@ -4,7 +4,9 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from datetime import date
 import uuid
 from django.db.models import Manager
+from django.utils import timezone
 from decimal import Decimal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from django.utils.translation import gettext_lazy as _
 
@@ -75,6 +77,11 @@ class User(AbstractUser):
     )
 
 
+    time_zone = models.CharField(
+        max_length=63, default='UTC',
+        help_text="IANA time zone of the user (e.g. Europe/Berlin), decides which calendar day a workout counts for."
+    )
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
@@ -99,6 +106,13 @@ class User(AbstractUser):
             )
         
         return "You didn't fill date_of_birth field"
+
+    @property
+    def zone_info(self):
+        try:
+            return ZoneInfo(self.time_zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            return ZoneInfo('UTC')
     
     class Meta:
         verbose_name_plural = _("Users")
@@ -111,7 +125,7 @@ class User(AbstractUser):
 class FitnessGoalManager(Manager):
     def deactivate_expired(self, user):
         today = date.today()
-        return self.filter(end_date__lte=today, is_active=True, user=user).update(is_active=False)
+        return self.filter(end_date__lte=today, is_active=True, user=user).update(is_active=False, updated_at=timezone.now())
 
 class FitnessGoal(models.Model):
     GOAL_CHOICES = [
@@ -130,11 +144,16 @@ class FitnessGoal(models.Model):
     end_date = models.DateField(blank=True, null=True, help_text="Optional deadline for the goal")
     description = models.TextField(blank=True, help_text="Additional details about the goal")
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = FitnessGoalManager()
 
     class Meta:
         verbose_name_plural = _("Fitness Goals")
+        indexes = [
+            # cursor for the sync change feed
+            models.Index(fields=['user', 'updated_at', 'id']),
+        ]
 
     def __str__(self):
         return f"is active: {self.is_active}, goals: {self.goal_type}."
\ No newline at end of file
@@ -1,10 +1,15 @@
 from rest_framework import serializers
 from .models import User
 from datetime import date
+from zoneinfo import available_timezones
 from rest_framework.exceptions import ValidationError
 from rest_framework import status
 from django.contrib.auth import authenticate
 from fitness_goal.serializers import ListFitnessGoalSerializer
+from django.utils import timezone
+from django.db import transaction
+from body_metrics.rollups import record_samples, PROFILE_METRICS
+from workout_sessions.streaks import rebuild_streaks, rebuild_adherence
 
 class RegisterUserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
@@ -65,7 +70,7 @@ class UpdateUserProfileSerializer(serializers.ModelSerializer):
         model = User
         fields = [
             'first_name', 'last_name', 'gender', 'date_of_birth', 
-            'avatar', 'height', 'weight'
+            'avatar', 'height', 'weight', 'time_zone'
         ]
 
     def validate_date_of_birth(self, value):
@@ -74,6 +79,37 @@ class UpdateUserProfileSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Date of birth cannot be in the future.")
         return value
 
+    def validate_time_zone(self, value):
+        if value not in available_timezones():
+            raise serializers.ValidationError("Unknown time zone, use an IANA name like 'Europe/Berlin'.")
+        return value
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        # Keep the history of weight/height changes instead of only overwriting the profile
+        now = timezone.now()
+        samples = [
+            {'metric': metric, 'value': validated_data[metric], 'measured_at': now}
+            for metric in PROFILE_METRICS
+            if validated_data.get(metric) is not None and validated_data[metric] != getattr(instance, metric)
+        ]
+
+        time_zone_changed = 'time_zone' in validated_data and validated_data['time_zone'] != instance.time_zone
+
+        instance = super().update(instance, validated_data)
+        if samples:
+            record_samples(instance, samples, sync_profile=False)
+        if time_zone_changed:
+            # Streak and adherence days are days of the user's time zone
+            user_ids = [instance.id]
+
+            def rebuild():
+                rebuild_streaks(user_ids)
+                rebuild_adherence(user_ids)
+
+            transaction.on_commit(rebuild)
+        return instance
+
 class UserProfileSerializer(serializers.ModelSerializer):
     fitness_goals = ListFitnessGoalSerializer(many=True, read_only=True)
 
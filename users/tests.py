@@ -0,0 +1,54 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from utils.query_budget import QueryBudgetTestCase
+
+
+class UserEndpointQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets of the users endpoints.
+    """
+
+    def test_register(self):
+        payload = {
+            "email": "new@example.com", "first_name": "New", "last_name": "User", "password": "Strong-pass-123",
+            "height": "1.75", "weight": "70",
+        }
+        self.request_within_budget(3, 'post', '/users/register/', data=payload, status_code=201)
+
+    def test_login(self):
+        payload = {"email": self.user.email, "password": "Strong-pass-123"}
+        self.request_within_budget(2, 'post', '/users/login/', data=payload)
+
+    def test_logout(self):
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.user))
+        self.request_within_budget(7, 'post', '/users/logout/', user=self.user)
+
+    def test_token_refresh(self):
+        payload = {"refresh_token": str(RefreshToken.for_user(self.user))}
+        self.request_within_budget(1, 'post', '/users/token/refresh/', data=payload)
+
+    def test_current_user_cache_miss_then_hit(self):
+        self.request_within_budget(5, 'get', '/users/current_user/', user=self.user)
+        self.request_within_budget(1, 'get', '/users/current_user/', user=self.user)
+
+    def test_current_user_profile_update(self):
+        self.request_within_budget(19, 'patch', '/users/current_user/profile_update/', user=self.user, data={"weight": "81"})
+
+    def test_current_user_export(self):
+        self.request_within_budget(2, 'get', '/users/current_user/export/', user=self.user)
+        self.request_within_budget(2, 'get', '/users/current_user/export/?export_format=csv&gzip=true', user=self.user)
+
+    def test_current_user_records(self):
+        self.request_within_budget(2, 'get', '/users/current_user/records/', user=self.user)
+
+    def test_current_user_streak(self):
+        self.request_within_budget(3, 'get', '/users/current_user/streak/', user=self.user)
+
+    def test_user_profile_cache_miss_then_hit(self):
+        url = f'/users/user_profile/{self.trainer.unique_id}/'
+        self.request_within_budget(5, 'get', url, user=self.user)
+        self.request_within_budget(1, 'get', url, user=self.user)
+
+    def test_current_user_cache_is_invalidated_by_goal_changes(self):
+        self.request_within_budget(5, 'get', '/users/current_user/', user=self.user)
+        self.goal.save()
+        self.request_within_budget(5, 'get', '/users/current_user/', user=self.user)
@@ -1,4 +0,0 @@
-from rest_framework.throttling import UserRateThrottle
-
-class LoginRateThrottle(UserRateThrottle):
-    rate = '5/minute'
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.urls import path
-from .views import RegisterUser, LoginUser, LogoutUser, CurrentUserDetail, RefreshAccessTokenView, CurrentUserProfileUpdate, UserProfileView
+from .views import RegisterUser, LoginUser, LogoutUser, CurrentUserDetail, RefreshAccessTokenView, CurrentUserProfileUpdate, UserProfileView, CurrentUserDataExport
+from workout_sessions.views import PersonalRecordListView, StreakView
 
 urlpatterns = [
     path('register/', RegisterUser.as_view(), name='register'),
@@ -9,6 +10,9 @@ urlpatterns = [
     # get a current user
     path('current_user/', CurrentUserDetail.as_view(), name='current_user'),
     path('current_user/profile_update/', CurrentUserProfileUpdate.as_view(), name='current_user_profile_update'),
+    path('current_user/export/', CurrentUserDataExport.as_view(), name='current_user_export'),
+    path('current_user/records/', PersonalRecordListView.as_view(), name='current_user_records'),
+    path('current_user/streak/', StreakView.as_view(), name='current_user_streak'),
     path('user_profile/<str:unique_id>/', UserProfileView.as_view(), name='user_profile'),
 
     # refresh token
@@ -6,17 +6,19 @@ from utils.store_token import set_jwt_cookie
 from .permissions import IsNotAuthenticated
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
-from .throttling import LoginRateThrottle
 from rest_framework.exceptions import Throttled
 from .models import User, FitnessGoal
 from fitness_goal.serializers import ListFitnessGoalSerializer
 from django.db.models import Count, Q
-from django.core.cache import cache
+from caching.compute import get_or_compute
+from itertools import chain
+from utils.streaming_export import get_export_options, build_export_response, EXPORT_FORMATS, EXPORT_CHUNK_SIZE
 
 
 class RegisterUser(generics.CreateAPIView):
     serializer_class = RegisterUserSerializer
     permission_classes = [IsNotAuthenticated]
+    throttle_scope = 'register'
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -50,7 +52,7 @@ class RegisterUser(generics.CreateAPIView):
 class LoginUser(APIView):
     permission_classes = [AllowAny]
     serializer_class = LoginUserSerializer
-    throttle_classes = [LoginRateThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -83,7 +85,9 @@ class LoginUser(APIView):
                 "message": "You have made too many login attempts. Please try again later.",
                 "available_in": f"{exc.wait} seconds"
             }
-            return Response(custom_response_data, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            return Response(
+                custom_response_data, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(exc.wait)},
+            )
 
         # Handle other exceptions as usual
         return super().handle_exception(exc)
@@ -120,12 +124,10 @@ class CurrentUserDetail(APIView):
 
     def get(self, request):
         user = request.user
-        cache_key = f"user_detail_{user.id}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return Response(cached_data)
+        response_data = get_or_compute(f"user_detail_{user.id}", lambda: self.build_detail(request, user), timeout=3600)
+        return Response(response_data)
 
+    def build_detail(self, request, user):
         # Deactivate expired fitness goals
         FitnessGoal.objects.deactivate_expired(user=user)
 
@@ -159,11 +161,7 @@ class CurrentUserDetail(APIView):
             fitness_goals_queryset, many=True
         ).data
         response_data['metadata_for_goals'] = metadata
-
-        # Cache the data for 1 hour
-        cache.set(cache_key, response_data, timeout=3600)
-
-        return Response(response_data)
+        return response_data
 
 
 class UserProfileView(generics.RetrieveAPIView):
@@ -180,12 +178,10 @@ class UserProfileView(generics.RetrieveAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         unique_id = self.kwargs.get('unique_id')
-        cache_key = f"user_profile_{unique_id}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return Response(cached_data)
+        response_data = get_or_compute(f"user_profile_{unique_id}", lambda: self.build_profile(request), timeout=3600)
+        return Response(response_data)
 
+    def build_profile(self, request):
         # Fetch the user profile
         instance = self.get_object()
 
@@ -212,11 +208,7 @@ class UserProfileView(generics.RetrieveAPIView):
             'active_goals': active_goals,
             'inactive_goals': inactive_goals,
         }
-
-        # Cache the data for 1 hour
-        cache.set(cache_key, response_data, timeout=3600)
-
-        return Response(response_data)
+        return response_data
 
 
 class CurrentUserProfileUpdate(APIView):
@@ -236,6 +228,47 @@ class CurrentUserProfileUpdate(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CurrentUserDataExport(APIView):
+    """
+    Stream the current user's profile followed by all of their fitness goals,
+    as NDJSON (default) or CSV. Every row carries a record_type column.
+
+    Query params:
+    - export_format: 'ndjson' or 'csv'.
+    - gzip: 'true' to gzip the stream on the fly.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    PROFILE_FIELDS = ['unique_id', 'email', 'first_name', 'last_name', 'gender', 'date_of_birth', 'height', 'weight', 'is_trainer', 'date_joined']
+    GOAL_FIELDS = ['unique_id', 'goal_type', 'start_date', 'end_date', 'description', 'is_active']
+
+    def get(self, request):
+        export_format, use_gzip = get_export_options(request)
+        if export_format is None:
+            return Response(
+                {"detail": f"export_format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = request.user
+        profile = {'record_type': 'profile'}
+        profile.update({field: getattr(user, field) for field in self.PROFILE_FIELDS})
+
+        goals = (
+            {'record_type': 'fitness_goal', **goal}
+            for goal in FitnessGoal.objects.filter(user=user)
+            .order_by('id')
+            .values(*self.GOAL_FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+        fieldnames = ['record_type'] + self.PROFILE_FIELDS + [field for field in self.GOAL_FIELDS if field not in self.PROFILE_FIELDS]
+        rows = chain([profile], goals)
+
+        return build_export_response(rows, fieldnames, export_format, "user_data", use_gzip)
+
+
 class RefreshAccessTokenView(APIView):
     permission_classes = [AllowAny]
     serializer_class = None
@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.cache import cache, caches
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User, FitnessGoal
+from exercises.models import Exercise
+from workout_management.models import WorkoutPlan, WorkoutExercise
+from plan_recommendations.models import GoalWorkoutMapping
+
+# Sizes of the seeded data: more rows than a page, so list endpoints that loop per row show up as extra queries
+TRAINERS = 3
+EXERCISES_PER_TRAINER = 8
+PLANS_PER_TRAINER = 5
+EXERCISES_PER_PLAN = 6
+USERS = 4
+
+
+def make_user(email, is_trainer=False):
+    return User.objects.create_user(
+        email=email, password="Strong-pass-123", first_name="Test", last_name="User", height=1.80, weight=80, is_trainer=is_trainer,
+    )
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    Base class of the per-endpoint query budget tests.
+
+    The data is seeded once per class. request_within_budget() sends a request authenticated the way
+    clients do (a JWT in the Authorization header, so the user lookup is part of the budget) and
+    asserts the exact number of queries and an upper bound of the serializer time measured by
+    metrics.middleware. When an endpoint legitimately needs more or fewer queries, update its budget
+    in the same change.
+    """
+
+    # Generous: the point is catching serializers that suddenly do per-row work, not timing noise
+    SERIALIZER_BUDGET_MS = 250
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.trainers = [make_user(f"trainer{index}@example.com", is_trainer=True) for index in range(TRAINERS)]
+        cls.trainer = cls.trainers[0]
+        cls.users = [make_user(f"user{index}@example.com") for index in range(USERS)]
+        cls.user = cls.users[0]
+
+        cls.exercises = Exercise.objects.bulk_create([
+            Exercise(
+                created_by=trainer,
+                name=f"Exercise {trainer.id}-{index}",
+                description="Seeded exercise",
+                category=Exercise.EXERCISE_CATEGORIES[index % len(Exercise.EXERCISE_CATEGORIES)][0],
+                equipment=["Dumbbell"],
+                repetitions=10,
+                sets=3,
+                muscle_group="legs",
+            )
+            for trainer in cls.trainers for index in range(EXERCISES_PER_TRAINER)
+        ])
+
+        goal_types = [choice for choice, _ in FitnessGoal.GOAL_CHOICES]
+        cls.plans = []
+        for trainer in cls.trainers:
+            for index in range(PLANS_PER_TRAINER):
+                cls.plans.append(WorkoutPlan.objects.create(
+                    created_by=trainer,
+                    title=f"Plan {trainer.id}-{index}",
+                    description="Seeded plan",
+                    difficulty_level="Beginner",
+                    tags=[goal_types[index % len(goal_types)]],
+                ))
+        cls.plan = cls.plans[0]
+
+        # Exercises of every trainer in every plan, so nested serializers touch many creators
+        WorkoutExercise.objects.bulk_create([
+            WorkoutExercise(
+                workout_plan=plan,
+                exercise=cls.exercises[(plan_index + offset * 4) % len(cls.exercises)],
+                order=offset + 1,
+                repetitions=10,
+                sets=3,
+                rest_time=timedelta(seconds=60),
+            )
+            for plan_index, plan in enumerate(cls.plans) for offset in range(EXERCISES_PER_PLAN)
+        ])
+        GoalWorkoutMapping.objects.bulk_create([
+            GoalWorkoutMapping(goal_type=goal_types[index % len(goal_types)], workout_plan=plan)
+            for index, plan in enumerate(cls.plans)
+        ])
+
+        today = date.today()
+        FitnessGoal.objects.bulk_create([
+            FitnessGoal(user=user, goal_type=goal_type, end_date=today + timedelta(days=30), is_active=index < 3)
+            for user in cls.users for index, goal_type in enumerate(goal_types)
+        ])
+        cls.goal = FitnessGoal.objects.filter(user=cls.user).first()
+
+    def setUp(self):
+        cache.clear()
+        # Rate limiter counters, a separate Redis in the test settings
+        caches[settings.THROTTLING['CACHE_ALIAS']].clear()
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def request_within_budget(self, queries, method, url, user=None, status_code=200, serializer_ms=None, **kwargs):
+        """
+        Send the request (and read a streaming body to the end) while counting queries.
+        """
+        self.client.credentials()
+        if user is not None:
+            self.authenticate(user)
+
+        if method != 'get':
+            kwargs.setdefault('format', 'json')
+        with self.assertNumQueries(queries):
+            response = getattr(self.client, method)(url, **kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status_code, getattr(response, 'data', None))
+        serializer_ms = serializer_ms or self.SERIALIZER_BUDGET_MS
+        self.assertLess(response.wsgi_request.metrics_stats.serializer_seconds * 1000, serializer_ms)
+        return response
@@ -0,0 +1,94 @@
+import csv
+import json
+import zlib
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class _Echo:
+    """
+    File-like object for csv.writer that hands back the written line instead of buffering it.
+    """
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    if value is None:
+        return ''
+    return value
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def csv_lines(rows, fieldnames):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fieldnames)
+    for row in rows:
+        yield writer.writerow([_csv_value(row.get(field)) for field in fieldnames])
+
+
+def gzip_stream(chunks, flush_size=64 * 1024):
+    """
+    Gzip a stream of str chunks on the fly, emitting compressed bytes roughly every `flush_size` input bytes.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    pending = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        pending += len(data)
+        compressed = compressor.compress(data)
+        if pending >= flush_size:
+            compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def get_export_options(request):
+    """
+    Read the export format and gzip flag from the query params.
+    `export_format` is used instead of `format` because DRF reserves the latter for renderer negotiation.
+    Returns (export_format, use_gzip), export_format is None when it is not supported.
+    """
+    export_format = request.query_params.get('export_format', 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        export_format = None
+
+    use_gzip = request.query_params.get('gzip', '').lower() in ('1', 'true', 'yes')
+    return export_format, use_gzip
+
+
+def build_export_response(rows, fieldnames, export_format, filename, use_gzip=False):
+    """
+    Wrap a lazy iterable of dict rows into a StreamingHttpResponse.
+    Nothing is materialised here, memory use stays constant no matter how many rows there are.
+    """
+    if export_format == 'csv':
+        chunks = csv_lines(rows, fieldnames)
+    else:
+        chunks = ndjson_lines(rows)
+
+    if use_gzip:
+        chunks = gzip_stream(chunks)
+
+    response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    if use_gzip:
+        # Transfer encoding only, clients get the plain file after decompressing
+        response['Content-Encoding'] = 'gzip'
+    return response
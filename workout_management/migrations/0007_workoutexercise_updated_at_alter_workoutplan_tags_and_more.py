@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0003_exercise_updated_at_and_more'),
+        ('workout_management', '0006_alter_workoutplan_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workoutexercise',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='workoutplan',
+            name='tags',
+            field=models.JSONField(blank=True, default=list, help_text="Tags describing the plan, e.g., ['strength', 'weight_loss']", null=True),
+        ),
+        migrations.AddIndex(
+            model_name='workoutexercise',
+            index=models.Index(fields=['updated_at', 'id'], name='workout_man_updated_9f6630_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workoutplan',
+            index=models.Index(fields=['updated_at', 'id'], name='workout_man_updated_411d83_idx'),
+        ),
+    ]
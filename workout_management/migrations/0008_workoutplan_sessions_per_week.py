@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:39
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workout_management', '0007_workoutexercise_updated_at_alter_workoutplan_tags_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workoutplan',
+            name='sessions_per_week',
+            field=models.PositiveSmallIntegerField(default=3, help_text='How many sessions a week the plan schedules, used for adherence', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(14)]),
+        ),
+    ]
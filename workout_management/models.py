@@ -5,6 +5,8 @@ from exercises.models import Exercise
 from django.utils.translation import gettext_lazy as _
 from django.db.models import F
 from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 
 class WorkoutPlan(models.Model):
     """
@@ -31,6 +33,10 @@ class WorkoutPlan(models.Model):
     title = models.CharField(max_length=100, help_text="Title of the workout plan")
     description = models.TextField(blank=True, help_text="Details about the workout plan")
     difficulty_level = models.CharField(max_length=20, choices=WORKOUT_DIFFICULTY_LEVEL)
+    sessions_per_week = models.PositiveSmallIntegerField(
+        default=3, validators=[MinValueValidator(1), MaxValueValidator(14)],
+        help_text="How many sessions a week the plan schedules, used for adherence"
+    )
     workout_banner = models.ImageField(upload_to='workout_banners/', default='workout_banners/no-img-banner.jpg',blank=True, null=True)
     tags = models.JSONField(
         default=list,
@@ -49,13 +55,21 @@ class WorkoutPlan(models.Model):
         super().clean()
 
     def delete(self, *args, **kwargs):
-        # Delete the workout banner file
-        if self.workout_banner and self.workout_banner.name != 'workout_banners/no-img-banner.jpg':
+        # Delete the workout banner file, unless a cloned plan still references it
+        if (
+            self.workout_banner
+            and self.workout_banner.name != 'workout_banners/no-img-banner.jpg'
+            and not WorkoutPlan.objects.filter(workout_banner=self.workout_banner.name).exclude(pk=self.pk).exists()
+        ):
             self.workout_banner.delete(save=False)
         super().delete(*args, **kwargs)
 
     class Meta:
         verbose_name_plural = _("Workout Plans")
+        indexes = [
+            # cursor for the sync change feed
+            models.Index(fields=['updated_at', 'id']),
+        ]
     
     def __str__(self):
         return f"Workout Plan: {self.title} by {self.created_by}"
@@ -72,11 +86,16 @@ class WorkoutExercise(models.Model):
     repetitions = models.PositiveIntegerField(default=0, help_text="Number of repetitions for this exercise")
     sets = models.PositiveIntegerField(default=0, help_text="Number of sets for this exercise")
     rest_time = models.DurationField(blank=True, null=True, help_text="Rest time after completing this exercise")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = _("Workout Exercises")
         unique_together = ('workout_plan', 'exercise', 'order')
         ordering = ['order']
+        indexes = [
+            # cursor for the sync change feed
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
     def delete(self, *args, **kwargs):
         """
@@ -93,7 +112,7 @@ class WorkoutExercise(models.Model):
         WorkoutExercise.objects.filter(
             workout_plan_id=workout_plan_id,
             order__gt=deleted_order
-        ).update(order=F("order") - 1)
+        ).update(order=F("order") - 1, updated_at=timezone.now())
 
     def __str__(self):
         return f"Workout: {self.workout_plan.title}, Exercise: {self.exercise.name}, Order: {self.order}"
\ No newline at end of file
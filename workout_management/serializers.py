@@ -4,6 +4,8 @@ from django.db.models import Q
 from exercises.serializers import ListExerciseSerializer
 from rest_framework.exceptions import ValidationError
 from plan_recommendations.models import GoalWorkoutMapping
+from exercises.models import Exercise
+from django.db import transaction, IntegrityError
 
 class CreateWorkoutPlanSerializer(serializers.ModelSerializer):
 
@@ -22,7 +24,7 @@ class CreateWorkoutPlanSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = WorkoutPlan
-        fields = ('title', 'difficulty_level', 'description', 'workout_banner', "tags")
+        fields = ('title', 'difficulty_level', 'sessions_per_week', 'description', 'workout_banner', "tags")
     
     def validate_tags(self, tags):
         print(tags)
@@ -48,6 +50,7 @@ class CreateWorkoutPlanSerializer(serializers.ModelSerializer):
                 title=validated_data['title'],
                 created_by=user,
                 difficulty_level=validated_data['difficulty_level'],
+                sessions_per_week=validated_data.get('sessions_per_week', 3),
                 description=validated_data['description'],
                 workout_banner=workout_banner,
                 tags=validated_data['tags']
@@ -57,6 +60,7 @@ class CreateWorkoutPlanSerializer(serializers.ModelSerializer):
                 title=validated_data['title'],
                 created_by=user,
                 difficulty_level=validated_data['difficulty_level'],
+                sessions_per_week=validated_data.get('sessions_per_week', 3),
                 description=validated_data['description'],
                 tags=validated_data['tags']
             )
@@ -104,6 +108,102 @@ class CreateWorkoutExerciseSerializer(serializers.ModelSerializer):
 
         return attrs
 
+class BulkWorkoutExerciseItemSerializer(serializers.Serializer):
+    """
+    A single row of a bulk create payload. No database lookups happen here,
+    the whole batch is checked at once in BulkCreateWorkoutExerciseSerializer.
+    """
+    exercise = serializers.IntegerField(min_value=1)
+    order = serializers.IntegerField(min_value=1)
+    repetitions = serializers.IntegerField(min_value=0, default=0)
+    sets = serializers.IntegerField(min_value=0, default=0)
+    rest_time = serializers.DurationField(required=False, allow_null=True)
+
+class BulkCreateWorkoutExerciseSerializer(serializers.Serializer):
+    workout_plan = serializers.PrimaryKeyRelatedField(queryset=WorkoutPlan.objects.all())
+    workout_exercises = BulkWorkoutExerciseItemSerializer(many=True)
+
+    def validate_workout_plan(self, workout_plan):
+        user = self.context['request'].user
+        if workout_plan.created_by_id != user.id:
+            raise ValidationError("The workout plan does not exist or you do not have permission to access it.")
+        return workout_plan
+
+    def validate(self, data):
+        """
+        Validate the whole batch against one fetch of the plan's existing
+        (exercise, order) pairs and one fetch of the referenced exercises.
+        Errors are returned per item, in the same order as the payload.
+        """
+        items = data.get('workout_exercises', [])
+        if not items:
+            raise ValidationError("No workout exercises provided for creation.")
+
+        workout_plan = data['workout_plan']
+
+        existing = WorkoutExercise.objects.filter(workout_plan=workout_plan).values_list('exercise_id', 'order')
+        used_exercises = set()
+        used_orders = set()
+        for exercise_id, order in existing:
+            used_exercises.add(exercise_id)
+            used_orders.add(order)
+
+        exercise_ids = {item['exercise'] for item in items}
+        found_exercises = set(Exercise.objects.filter(id__in=exercise_ids).values_list('id', flat=True))
+
+        errors = []
+        has_errors = False
+        for item in items:
+            item_errors = {}
+            exercise_id = item['exercise']
+            order = item['order']
+
+            if exercise_id not in found_exercises:
+                item_errors['exercise'] = f"Exercise with id {exercise_id} does not exist."
+            elif exercise_id in used_exercises:
+                item_errors['exercise'] = f"The exercise ({exercise_id}) already exists in the workout plan."
+
+            if order in used_orders:
+                item_errors['order'] = f"The order ({order}) already exists in the workout plan."
+
+            # Later rows in the payload collide with earlier ones as well
+            used_exercises.add(exercise_id)
+            used_orders.add(order)
+
+            if item_errors:
+                has_errors = True
+            errors.append(item_errors)
+
+        if has_errors:
+            raise ValidationError({"workout_exercises": errors})
+
+        return data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        workout_plan = validated_data['workout_plan']
+
+        workout_exercises = [
+            WorkoutExercise(
+                workout_plan=workout_plan,
+                exercise_id=item['exercise'],
+                order=item['order'],
+                repetitions=item['repetitions'],
+                sets=item['sets'],
+                rest_time=item.get('rest_time'),
+            )
+            for item in validated_data['workout_exercises']
+        ]
+
+        try:
+            WorkoutExercise.objects.bulk_create(workout_exercises)
+        except IntegrityError:
+            # Another request added a conflicting row after validation
+            raise ValidationError(
+                {"detail": "One of the orders or exercises was added to the workout plan in the meantime. Please try again."}
+            )
+        return workout_exercises
+
 class UpdateWorkoutExerciseSerializer(serializers.ModelSerializer):
     id = serializers.IntegerField()
 
@@ -142,6 +242,7 @@ class WorkoutPlanDetailSerializer(serializers.ModelSerializer):
             'title',
             'description',
             'difficulty_level',
+            'sessions_per_week',
             'workout_banner',
             'created_at',
             'updated_at',
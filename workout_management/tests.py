@@ -0,0 +1,143 @@
+from utils.query_budget import QueryBudgetTestCase
+from .models import WorkoutExercise
+
+
+class WorkoutPlanQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets of the workout plan endpoints.
+    """
+
+    def test_list(self):
+        self.request_within_budget(6, 'get', '/workout_management/workout_plan/', user=self.user)
+        self.request_within_budget(6, 'get', '/workout_management/workout_plan/?page_size=100', user=self.user)
+
+    def test_retrieve(self):
+        self.request_within_budget(5, 'get', f'/workout_management/workout_plan/{self.plan.unique_id}/', user=self.user)
+
+    def test_create(self):
+        payload = {"title": "New plan", "difficulty_level": "Advanced", "description": "New", "tags": ["Flexibility"]}
+        self.request_within_budget(6, 'post', '/workout_management/workout_plan/create/', user=self.trainer, data=payload, status_code=201)
+
+    def test_update(self):
+        url = f'/workout_management/workout_plan/{self.plan.unique_id}/update/'
+        self.request_within_budget(6, 'patch', url, user=self.trainer, data={"title": "Renamed"})
+
+    def test_export(self):
+        self.request_within_budget(3, 'get', '/workout_management/workout_plan/export/', user=self.trainer)
+
+    def test_clone(self):
+        url = f'/workout_management/workout_plan/{self.plan.unique_id}/clone/'
+        self.request_within_budget(7, 'post', url, user=self.trainer, status_code=201)
+
+    def test_delete(self):
+        url = f'/workout_management/workout_plan/{self.plan.unique_id}/delete/'
+        self.request_within_budget(20, 'delete', url, user=self.trainer)
+
+
+class WorkoutExerciseQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets of the workout exercise endpoints.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.workout_exercises = list(self.plan.workout_exercises.order_by('order'))
+
+    def test_create(self):
+        used = {workout_exercise.exercise_id for workout_exercise in self.workout_exercises}
+        exercise = next(exercise for exercise in self.exercises if exercise.id not in used)
+        payload = {"workout_plan": self.plan.id, "exercise": exercise.id, "order": 99, "repetitions": 8, "sets": 4}
+        self.request_within_budget(7, 'post', '/workout_management/workout_exercises/create/', user=self.trainer, data=payload, status_code=201)
+
+    def test_bulk_create(self):
+        used = {workout_exercise.exercise_id for workout_exercise in self.workout_exercises}
+        unused = [exercise for exercise in self.exercises if exercise.id not in used][:5]
+        payload = {
+            "workout_plan": self.plan.id,
+            "workout_exercises": [
+                {"exercise": exercise.id, "order": 100 + index, "repetitions": 8, "sets": 4}
+                for index, exercise in enumerate(unused)
+            ],
+        }
+        self.request_within_budget(
+            7, 'post', '/workout_management/workout_exercises/bulk-create/', user=self.trainer, data=payload, status_code=201,
+        )
+
+    def test_update(self):
+        url = f'/workout_management/workout_exercises/{self.workout_exercises[0].id}/update/'
+        self.request_within_budget(4, 'patch', url, user=self.trainer, data={"sets": 5})
+
+    def test_bulk_update(self):
+        payload = {"workout_exercises": [
+            {"id": workout_exercise.id, "order": len(self.workout_exercises) - index, "sets": 4}
+            for index, workout_exercise in enumerate(self.workout_exercises)
+        ]}
+        self.request_within_budget(6, 'patch', '/workout_management/workout_exercises/bulk-update/', user=self.trainer, data=payload)
+
+    def test_delete(self):
+        url = f'/workout_management/workout_exercises/{self.workout_exercises[0].id}/delete/'
+        self.request_within_budget(6, 'delete', url, user=self.trainer)
+
+    def test_list(self):
+        self.request_within_budget(2, 'get', '/workout_management/workout_exercises/', user=self.trainer)
+
+    def test_retrieve(self):
+        url = f'/workout_management/workout_exercises/{self.workout_exercises[0].id}/'
+        self.request_within_budget(2, 'get', url, user=self.trainer)
+
+
+class BulkCreateWorkoutExerciseErrorTests(QueryBudgetTestCase):
+    """
+    A bulk create with invalid items reports the errors per item, in payload order, and inserts nothing.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.workout_exercises = list(self.plan.workout_exercises.order_by('order'))
+        used = {workout_exercise.exercise_id for workout_exercise in self.workout_exercises}
+        self.unused = [exercise for exercise in self.exercises if exercise.id not in used]
+        self.authenticate(self.trainer)
+
+    def item(self, exercise_id, order):
+        return {"exercise": exercise_id, "order": order, "repetitions": 8, "sets": 4}
+
+    def assert_item_errors(self, items, expected):
+        count = WorkoutExercise.objects.count()
+        payload = {"workout_plan": self.plan.id, "workout_exercises": items}
+        response = self.client.post('/workout_management/workout_exercises/bulk-create/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']['workout_exercises']
+        self.assertEqual([sorted(item_errors) for item_errors in errors], expected)
+        self.assertEqual(WorkoutExercise.objects.count(), count)
+        return errors
+
+    def test_duplicates_in_batch(self):
+        errors = self.assert_item_errors(
+            [
+                self.item(self.unused[0].id, 100),
+                self.item(self.unused[1].id, 100),
+                self.item(self.unused[0].id, 101),
+                self.item(self.unused[2].id, 102),
+            ],
+            [[], ['order'], ['exercise'], []],
+        )
+        self.assertIn("(100)", errors[1]['order'])
+        self.assertIn(f"({self.unused[0].id})", errors[2]['exercise'])
+
+    def test_collisions_with_plan(self):
+        existing = self.workout_exercises[0]
+        self.assert_item_errors(
+            [
+                self.item(self.unused[0].id, 100),
+                self.item(existing.exercise_id, 101),
+                self.item(self.unused[1].id, existing.order),
+            ],
+            [[], ['exercise'], ['order']],
+        )
+
+    def test_unknown_exercise(self):
+        errors = self.assert_item_errors(
+            [self.item(self.unused[0].id, 100), self.item(999999, 101)],
+            [[], ['exercise']],
+        )
+        self.assertEqual(errors[1]['exercise'], "Exercise with id 999999 does not exist.")
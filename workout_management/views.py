@@ -2,14 +2,18 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
 from rest_framework import status
 from .models import WorkoutPlan, WorkoutExercise
-from .serializers import CreateWorkoutExerciseSerializer, CreateWorkoutPlanSerializer, WorkoutPlanDetailSerializer, UpdateWorkoutExerciseSerializer
+from .serializers import CreateWorkoutExerciseSerializer, CreateWorkoutPlanSerializer, WorkoutPlanDetailSerializer, UpdateWorkoutExerciseSerializer, BulkCreateWorkoutExerciseSerializer
 from rest_framework.permissions import IsAuthenticated
 from exercises.permissions import IsTrainer
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound, ValidationError
 from django.utils.translation import gettext_lazy as _
 from uuid import UUID
-from django.db import transaction, IntegrityError
+from django.utils import timezone
+from django.db import transaction, IntegrityError, connection
+from plan_recommendations.models import GoalWorkoutMapping
+from django.db.models import Prefetch
+from utils.streaming_export import get_export_options, build_export_response, EXPORT_FORMATS, EXPORT_CHUNK_SIZE
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -25,7 +29,7 @@ class WorkoutPlanViewSet(ModelViewSet):
     """
     ViewSet for managing Workout Plan.
     """
-    queryset = WorkoutPlan.objects.all().select_related("created_by").prefetch_related("workout_exercises__exercise")
+    queryset = WorkoutPlan.objects.all().select_related("created_by").prefetch_related("workout_exercises__exercise__created_by")
 
     permission_classes = [IsAuthenticated]
     lookup_field = "unique_id"
@@ -70,6 +74,8 @@ class WorkoutPlanViewSet(ModelViewSet):
         """
         Dynamically assign permissions based on request method.
         """
+        if self.action == 'export_workout_plans':
+            return [permission() for permission in [IsAuthenticated, IsTrainer]]
         if self.request.method in ['GET', "RETRIEVE", 'HEAD', 'OPTIONS']:
             return [permission() for permission in [IsAuthenticated]]
         return [permission() for permission in [IsAuthenticated, IsTrainer]]
@@ -110,6 +116,140 @@ class WorkoutPlanViewSet(ModelViewSet):
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['get'], url_path='export', url_name='export')
+    def export_workout_plans(self, request, *args, **kwargs):
+        """
+        Stream every workout plan created by the current trainer, with its exercises,
+        as NDJSON (default) or CSV. In CSV the exercises column holds a JSON list.
+
+        Query params:
+        - export_format: 'ndjson' or 'csv'.
+        - gzip: 'true' to gzip the stream on the fly.
+        """
+        export_format, use_gzip = get_export_options(request)
+        if export_format is None:
+            return Response(
+                {"detail": f"export_format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # prefetch_related runs once per chunk when combined with iterator(chunk_size=...)
+        workout_plans = (
+            WorkoutPlan.objects.filter(created_by=request.user)
+            .order_by('id')
+            .only('unique_id', 'title', 'description', 'difficulty_level', 'workout_banner', 'tags', 'created_at', 'updated_at')
+            .prefetch_related(Prefetch(
+                'workout_exercises',
+                queryset=WorkoutExercise.objects.select_related('exercise').only(
+                    'workout_plan_id', 'order', 'repetitions', 'sets', 'rest_time', 'exercise__unique_id', 'exercise__name'
+                )
+            ))
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+        fieldnames = ['unique_id', 'title', 'description', 'difficulty_level', 'workout_banner', 'tags', 'created_at', 'updated_at', 'exercises']
+        rows = (
+            {
+                'unique_id': workout_plan.unique_id,
+                'title': workout_plan.title,
+                'description': workout_plan.description,
+                'difficulty_level': workout_plan.difficulty_level,
+                'workout_banner': workout_plan.workout_banner.name if workout_plan.workout_banner else None,
+                'tags': workout_plan.tags,
+                'created_at': workout_plan.created_at,
+                'updated_at': workout_plan.updated_at,
+                'exercises': [
+                    {
+                        'exercise': workout_exercise.exercise.unique_id,
+                        'name': workout_exercise.exercise.name,
+                        'order': workout_exercise.order,
+                        'repetitions': workout_exercise.repetitions,
+                        'sets': workout_exercise.sets,
+                        'rest_time': workout_exercise.rest_time,
+                    }
+                    for workout_exercise in workout_plan.workout_exercises.all()
+                ],
+            }
+            for workout_plan in workout_plans
+        )
+
+        return build_export_response(rows, fieldnames, export_format, "workout_plans", use_gzip)
+
+    @action(detail=True, methods=['post'], url_path='clone', url_name='clone')
+    def clone_workout_plan(self, request, unique_id=None, *args, **kwargs):
+        """
+        Deep-copy a workout plan together with its goal mappings and workout exercises.
+        The banner file is referenced, not copied.
+        """
+        try:
+            UUID(unique_id, version=4)
+        except ValueError:
+            raise NotFound({"detail": _("The provided unique ID is not in a valid format. Please check and try again.")})
+
+        # Only the copied columns, the rows below the plan are copied by the database
+        try:
+            source = WorkoutPlan.objects.only(
+                "id", "title", "difficulty_level", "sessions_per_week", "description", "workout_banner", "tags",
+            ).get(unique_id=unique_id, created_by=request.user)
+        except WorkoutPlan.DoesNotExist:
+            raise NotFound({"detail": "The requested workout plan does not exist or you do not have permission to access it."})
+
+        title = request.data.get("title") or f"{source.title} (copy)"
+        max_length = WorkoutPlan._meta.get_field("title").max_length
+        if len(title) > max_length:
+            return Response(
+                {"title": f"Ensure this field has no more than {max_length} characters."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            workout_plan = WorkoutPlan.objects.create(
+                title=title,
+                created_by=request.user,
+                difficulty_level=source.difficulty_level,
+                sessions_per_week=source.sessions_per_week,
+                description=source.description,
+                workout_banner=source.workout_banner.name if source.workout_banner else None,
+                tags=source.tags,
+            )
+            self._copy_rows(GoalWorkoutMapping, ["goal_type"], source.id, workout_plan.id)
+            self._copy_rows(
+                WorkoutExercise, ["exercise_id", "order", "repetitions", "sets", "rest_time"], source.id, workout_plan.id,
+                extra_values={"updated_at": workout_plan.updated_at},
+            )
+
+        detail = {
+            "message": "Workout Plan cloned successfully",
+            "data": {
+                "id": workout_plan.id,
+                "unique_id": workout_plan.unique_id,
+                "title": workout_plan.title,
+            }
+        }
+        return Response(detail, status=status.HTTP_201_CREATED)
+
+    # util method to clone related rows
+    def _copy_rows(self, model, columns, source_plan_id, target_plan_id, extra_values=None):
+        """
+        Copy every row of `model` that belongs to the source plan with a single
+        INSERT ... SELECT, so the cost does not grow in round trips with the plan size.
+        `extra_values` maps columns to constants written instead of the copied value.
+        """
+        extra_values = extra_values or {}
+        quote = connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        plan_column = quote(model._meta.get_field("workout_plan").column)
+        column_list = ", ".join(quote(column) for column in columns)
+        extra_columns = "".join(f", {quote(column)}" for column in extra_values)
+        extra_placeholders = ", %s" * len(extra_values)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({plan_column}, {column_list}{extra_columns}) "
+                f"SELECT %s, {column_list}{extra_placeholders} FROM {table} WHERE {plan_column} = %s",
+                [target_plan_id, *extra_values.values(), source_plan_id],
+            )
+
     @action(detail=True, methods=['delete'], url_path='delete', url_name='delete')
     def delete_workout_plan(self, request, unique_id=None, *args, **kwargs):
         """
@@ -124,7 +264,7 @@ class WorkoutExerciseViewSet(ModelViewSet):
     """
     ViewSet for managing Workout Exercises.
     """
-    queryset = WorkoutExercise.objects.all().select_related("workout_plan", "exercise")
+    queryset = WorkoutExercise.objects.all().select_related("workout_plan", "exercise__created_by")
     permission_classes = [IsAuthenticated, IsTrainer]
     serializer_class = CreateWorkoutExerciseSerializer
 
@@ -155,6 +295,23 @@ class WorkoutExerciseViewSet(ModelViewSet):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'], url_path='bulk-create', url_name='bulk_create')
+    def bulk_create_workout_exercises(self, request, *args, **kwargs):
+        """
+        Handle the creation of multiple workout exercises for one workout plan at once.
+        """
+        serializer = BulkCreateWorkoutExerciseSerializer(data=request.data, context={'request': request})
+        if serializer.is_valid():
+            workout_exercises = serializer.save()
+            return Response({
+                "message": f"{len(workout_exercises)} workout exercises created successfully.",
+                "created_workout_exercises": [
+                    {"id": workout_exercise.id, "exercise": workout_exercise.exercise_id, "order": workout_exercise.order}
+                    for workout_exercise in workout_exercises
+                ],
+            }, status=status.HTTP_201_CREATED)
+        return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=['patch'], url_path='update', url_name='update')
     def update_workout_exercise(self, request, *args, **kwargs):
         """
@@ -287,8 +444,11 @@ class WorkoutExerciseViewSet(ModelViewSet):
         Batch save updated fields for all instances.
         """
         instances_to_update = []
+        # bulk_update skips auto_now, the sync feed relies on updated_at moving forward
+        updated_at = timezone.now()
         for item in instance_map.values():
             instance = item["instance"]
+            instance.updated_at = updated_at
             if item["new_order"] is not None:
                 instance.order = item["new_order"]
             if item["new_exercise_id"] is not None:
@@ -300,7 +460,7 @@ class WorkoutExerciseViewSet(ModelViewSet):
             if item["rest_time"] is not None:
                 instance.rest_time = item["rest_time"]
             instances_to_update.append(instance)
-        WorkoutExercise.objects.bulk_update(instances_to_update, ["order", "exercise_id", "repetitions", "sets", "rest_time"])
+        WorkoutExercise.objects.bulk_update(instances_to_update, ["order", "exercise_id", "repetitions", "sets", "rest_time", "updated_at"])
 
 
     @action(detail=True, methods=['delete'], url_path='delete', url_name='delete')
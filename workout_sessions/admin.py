@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import WorkoutSession, SetLog, PersonalRecord, UserStreak, PlanAdherence
+# Register your models here.
+
+admin.site.register(WorkoutSession)
+admin.site.register(SetLog)
+admin.site.register(PersonalRecord)
+admin.site.register(UserStreak)
+admin.site.register(PlanAdherence)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class WorkoutSessionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'workout_sessions'
+
+    def ready(self):
+        import workout_sessions.signals
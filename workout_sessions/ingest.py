@@ -0,0 +1,170 @@
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from exercises.models import Exercise
+from users.models import User
+from workout_management.models import WorkoutPlan, WorkoutExercise
+from .models import WorkoutSession, SetLog
+from .serializers import SessionIngestSerializer, SetIngestSerializer
+from .signals import workout_data_ingested
+
+INSERT_BATCH_SIZE = 500
+
+
+def _validate_items(serializer, items):
+    """
+    Validate every item with one serializer instance instead of building one per row.
+    Returns (list of (index, validated_data), list of per-item errors).
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, serializer.run_validation(item)))
+        except ValidationError as exc:
+            errors.append({"index": index, "errors": exc.detail})
+    return valid, errors
+
+
+def ingest_batch(user, sessions_data, sets_data):
+    """
+    Write a batch of sessions and sets uploaded by a device.
+
+    Everything is resolved with a fixed number of queries no matter the batch size:
+    references (plans, sessions, exercises, workout exercises) are looked up with one
+    `IN` query each and rows are written with bulk_create. Rows whose client_id was
+    already ingested for the user are skipped, so devices can safely retry an upload.
+    Invalid items are reported per index and do not block the rest of the batch.
+
+    Batches of one user are serialized on the user row: a retry sent while the first
+    upload is still running waits for it, then finds its rows as duplicates. So the
+    rows passed to workout_data_ingested (and counted as created) are exactly the
+    rows inserted, and receivers never count an upload twice.
+    """
+    valid_sessions, session_errors = _validate_items(SessionIngestSerializer(), sessions_data)
+    valid_sets, set_errors = _validate_items(SetIngestSerializer(), sets_data)
+
+    # Within one payload the first occurrence of a client_id wins
+    seen = set()
+    unique_sessions = []
+    for index, data in valid_sessions:
+        if data['client_id'] in seen:
+            session_errors.append({"index": index, "errors": {"client_id": "Duplicate client_id in the payload."}})
+            continue
+        seen.add(data['client_id'])
+        unique_sessions.append((index, data))
+
+    seen = set()
+    unique_sets = []
+    for index, data in valid_sets:
+        if data['client_id'] in seen:
+            set_errors.append({"index": index, "errors": {"client_id": "Duplicate client_id in the payload."}})
+            continue
+        seen.add(data['client_id'])
+        unique_sets.append((index, data))
+
+    with transaction.atomic():
+        # Held until commit, the duplicate checks below and the inserts can't interleave with another batch
+        list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+
+        # Sessions
+        plan_ids = {data['workout_plan'] for _, data in unique_sessions if data.get('workout_plan')}
+        plan_map = dict(WorkoutPlan.objects.filter(unique_id__in=plan_ids).values_list('unique_id', 'id')) if plan_ids else {}
+
+        session_client_ids = {data['client_id'] for _, data in unique_sessions}
+        existing_sessions = set(
+            WorkoutSession.objects.filter(user=user, client_id__in=session_client_ids).values_list('client_id', flat=True)
+        ) if session_client_ids else set()
+
+        new_sessions = []
+        for index, data in unique_sessions:
+            if data['client_id'] in existing_sessions:
+                continue
+            plan_unique_id = data.get('workout_plan')
+            if plan_unique_id and plan_unique_id not in plan_map:
+                session_errors.append({"index": index, "errors": {"workout_plan": "Workout plan does not exist."}})
+                continue
+            new_sessions.append(WorkoutSession(
+                client_id=data['client_id'],
+                user=user,
+                workout_plan_id=plan_map.get(plan_unique_id),
+                started_at=data['started_at'],
+                ended_at=data.get('ended_at'),
+                notes=data.get('notes', ''),
+            ))
+        WorkoutSession.objects.bulk_create(new_sessions, batch_size=INSERT_BATCH_SIZE)
+
+        # Sets may point at sessions uploaded in an earlier batch, so resolve them all at once
+        referenced_sessions = {data['session'] for _, data in unique_sets} | session_client_ids
+        session_map = dict(
+            WorkoutSession.objects.filter(user=user, client_id__in=referenced_sessions).values_list('client_id', 'id')
+        ) if referenced_sessions else {}
+        for session in new_sessions:
+            session.id = session_map.get(session.client_id)
+
+        # Sets
+        exercise_ids = {data['exercise'] for _, data in unique_sets}
+        exercise_map = dict(
+            Exercise.objects.filter(unique_id__in=exercise_ids).values_list('unique_id', 'id')
+        ) if exercise_ids else {}
+
+        workout_exercise_ids = {data['workout_exercise'] for _, data in unique_sets if data.get('workout_exercise')}
+        found_workout_exercises = set(
+            WorkoutExercise.objects.filter(id__in=workout_exercise_ids).values_list('id', flat=True)
+        ) if workout_exercise_ids else set()
+
+        set_client_ids = {data['client_id'] for _, data in unique_sets}
+        existing_sets = set(
+            SetLog.objects.filter(user=user, client_id__in=set_client_ids).values_list('client_id', flat=True)
+        ) if set_client_ids else set()
+
+        new_sets = []
+        for index, data in unique_sets:
+            if data['client_id'] in existing_sets:
+                continue
+
+            item_errors = {}
+            if data['session'] not in session_map:
+                item_errors['session'] = "Workout session does not exist."
+            if data['exercise'] not in exercise_map:
+                item_errors['exercise'] = "Exercise does not exist."
+            if data.get('workout_exercise') and data['workout_exercise'] not in found_workout_exercises:
+                item_errors['workout_exercise'] = "Workout exercise does not exist."
+            if item_errors:
+                set_errors.append({"index": index, "errors": item_errors})
+                continue
+
+            new_sets.append(SetLog(
+                client_id=data['client_id'],
+                user=user,
+                session_id=session_map[data['session']],
+                exercise_id=exercise_map[data['exercise']],
+                workout_exercise_id=data.get('workout_exercise'),
+                set_number=data['set_number'],
+                repetitions=data['repetitions'],
+                weight=data['weight'],
+                duration=data.get('duration'),
+                performed_at=data['performed_at'],
+            ))
+        SetLog.objects.bulk_create(new_sets, batch_size=INSERT_BATCH_SIZE)
+
+        if new_sessions or new_sets:
+            workout_data_ingested.send(sender=SetLog, user=user, sessions=new_sessions, set_logs=new_sets)
+
+    session_errors.sort(key=lambda error: error['index'])
+    set_errors.sort(key=lambda error: error['index'])
+
+    return {
+        "sessions": {
+            "received": len(sessions_data),
+            "created": len(new_sessions),
+            "duplicates": len(existing_sessions),
+        },
+        "sets": {
+            "received": len(sets_data),
+            "created": len(new_sets),
+            "duplicates": len(existing_sets),
+        },
+        "errors": {
+            "sessions": session_errors,
+            "sets": set_errors,
+        },
+    }
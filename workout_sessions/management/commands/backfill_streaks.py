@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from workout_sessions.streaks import rebuild_streaks, rebuild_adherence
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild streak and plan adherence state from the logged sessions. "
+        "Run once after deploying, and for a user after they change their time zone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="Only rebuild this user id (repeatable).")
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        streaks = rebuild_streaks(user_ids)
+        plans = rebuild_adherence(user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt streaks of {streaks} users and adherence of {plans} user plans."))
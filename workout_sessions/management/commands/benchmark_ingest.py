@@ -0,0 +1,118 @@
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import User
+from exercises.models import Exercise
+from workout_sessions.ingest import ingest_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the throughput of the set ingestion write path in this process. "
+        "Runs inside a transaction that is rolled back unless --keep is passed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batches', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=500, help="Sets per batch.")
+        parser.add_argument('--sets-per-session', type=int, default=25)
+        parser.add_argument('--exercises', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help="Commit the generated data.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        with transaction.atomic():
+            user, exercise_ids = self._fixtures(options['exercises'])
+            payloads = [
+                json.dumps(self._payload(rng, exercise_ids, options['batch_size'], options['sets_per_session']))
+                for _ in range(options['batches'])
+            ]
+
+            timings = []
+            total_sets = 0
+            for payload in payloads:
+                start = time.perf_counter()
+                # Decoding is part of the request cost, so it is timed as well
+                data = json.loads(payload)
+                result = ingest_batch(user, data['sessions'], data['sets'])
+                timings.append(time.perf_counter() - start)
+                total_sets += result['sets']['created']
+
+            # Second pass over the same payloads exercises the duplicate path (device retries)
+            start = time.perf_counter()
+            for payload in payloads:
+                data = json.loads(payload)
+                ingest_batch(user, data['sessions'], data['sets'])
+            retry_time = time.perf_counter() - start
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        elapsed = sum(timings)
+        timings_ms = sorted(timing * 1000 for timing in timings)
+        report = {
+            "batches": len(timings),
+            "sets_written": total_sets,
+            "sets_per_second": round(total_sets / elapsed, 1) if elapsed else None,
+            "batch_ms_p50": round(statistics.median(timings_ms), 2),
+            "batch_ms_p95": round(timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.95))], 2),
+            "batch_ms_max": round(timings_ms[-1], 2),
+            "retry_sets_per_second": round(total_sets / retry_time, 1) if retry_time else None,
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _fixtures(self, exercise_count):
+        suffix = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            email=f"benchmark-{suffix}@example.com",
+            password=None,
+            first_name="Benchmark",
+            last_name="User",
+            height=1.80,
+            weight=80,
+            is_trainer=True,
+        )
+        Exercise.objects.bulk_create([
+            Exercise(
+                created_by=user,
+                name=f"benchmark exercise {index}",
+                description="Generated by benchmark_ingest",
+                category="Strength",
+                muscle_group=f"group {index % 8}",
+            )
+            for index in range(exercise_count)
+        ])
+        exercise_ids = [str(unique_id) for unique_id in Exercise.objects.filter(created_by=user).values_list('unique_id', flat=True)]
+        return user, exercise_ids
+
+    def _payload(self, rng, exercise_ids, batch_size, sets_per_session):
+        now = timezone.now()
+        sessions, sets = [], []
+        session_count = max(1, batch_size // sets_per_session)
+        for _ in range(session_count):
+            started_at = now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440))
+            session_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            sessions.append({
+                "client_id": session_id,
+                "started_at": started_at.isoformat(),
+                "ended_at": (started_at + timedelta(minutes=60)).isoformat(),
+            })
+            for set_number in range(1, sets_per_session + 1):
+                sets.append({
+                    "client_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "session": session_id,
+                    "exercise": rng.choice(exercise_ids),
+                    "set_number": set_number,
+                    "repetitions": rng.randint(3, 15),
+                    "weight": f"{rng.uniform(0, 200):.2f}",
+                    "performed_at": (started_at + timedelta(minutes=set_number * 2)).isoformat(),
+                })
+        return {"sessions": sessions, "sets": sets[:batch_size]}
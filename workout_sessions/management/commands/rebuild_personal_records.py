@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import islice
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from workout_sessions.models import SetLog, PersonalRecord
+from workout_sessions.records import RECORD_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Rebuild the personal records read model from the set log, processing the log in vectorized chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Only rebuild the records of this user id.")
+        parser.add_argument('--chunk-size', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        set_logs = SetLog.objects.order_by('user_id', 'exercise_id', 'id')
+        if options['user']:
+            set_logs = set_logs.filter(user_id=options['user'])
+        rows = set_logs.values_list('user_id', 'exercise_id', 'weight', 'repetitions', 'performed_at').iterator(chunk_size=options['chunk_size'])
+
+        bests = {}
+        processed = 0
+        while True:
+            chunk = list(islice(rows, options['chunk_size']))
+            if not chunk:
+                break
+            processed += len(chunk)
+            self._merge(bests, self._chunk_bests(chunk))
+
+        records = [
+            PersonalRecord(
+                user_id=user_id,
+                exercise_id=exercise_id,
+                **{
+                    name: value
+                    for field, at_field in RECORD_FIELDS
+                    for name, value in zip((field, at_field), self._to_db(field, *record_bests[field]))
+                },
+            )
+            for (user_id, exercise_id), record_bests in bests.items()
+        ]
+
+        with transaction.atomic():
+            existing = PersonalRecord.objects.all()
+            if options['user']:
+                existing = existing.filter(user_id=options['user'])
+            existing.delete()
+            PersonalRecord.objects.bulk_create(records, batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(records)} personal records from {processed} sets."))
+
+    def _chunk_bests(self, chunk):
+        """
+        Best value and its earliest timestamp per (user, exercise) group for every record type.
+        """
+        users, exercises, weights, reps, performed_at = zip(*chunk)
+        users = np.fromiter(users, dtype=np.int64, count=len(chunk))
+        exercises = np.fromiter(exercises, dtype=np.int64, count=len(chunk))
+        weights = np.array(weights, dtype=np.float64)
+        reps = np.fromiter(reps, dtype=np.int64, count=len(chunk))
+        times = np.array([value.timestamp() for value in performed_at], dtype=np.float64)
+
+        # Same Epley rules as records.estimated_1rm
+        estimated_1rm = np.where(reps == 1, weights, weights * (1 + reps / 30.0))
+        estimated_1rm = np.where(reps <= 0, 0.0, estimated_1rm)
+
+        scores = {
+            'max_weight': weights,
+            'max_reps': reps.astype(np.float64),
+            'best_estimated_1rm': estimated_1rm,
+            'best_volume': weights * reps,
+        }
+
+        # Rows arrive sorted by (user, exercise), so groups are contiguous runs
+        boundaries = np.flatnonzero((np.diff(users) != 0) | (np.diff(exercises) != 0)) + 1
+        starts = np.concatenate(([0], boundaries))
+        group_ids = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(chunk))))
+
+        chunk_bests = {(int(users[start]), int(exercises[start])): {} for start in starts}
+        keys = list(chunk_bests.keys())
+        for field, values in scores.items():
+            # Highest value first, earliest time breaks ties; the first row of each group wins
+            order = np.lexsort((times, -values, group_ids))
+            first = order[np.concatenate(([True], np.diff(group_ids[order]) != 0))]
+            for group, index in zip(group_ids[first], first):
+                chunk_bests[keys[group]][field] = (float(values[index]), float(times[index]))
+        return chunk_bests
+
+    def _merge(self, bests, chunk_bests):
+        # A group can span two chunks, keep the better of both halves
+        for key, record_bests in chunk_bests.items():
+            current = bests.get(key)
+            if current is None:
+                bests[key] = record_bests
+                continue
+            for field, (value, at) in record_bests.items():
+                if value > current[field][0] or (value == current[field][0] and at < current[field][1]):
+                    current[field] = (value, at)
+
+    def _to_db(self, field, value, at):
+        if value <= 0:
+            return (0 if field == 'max_reps' else Decimal('0.00')), None
+        achieved_at = datetime.fromtimestamp(at, tz=timezone.utc)
+        if field == 'max_reps':
+            return int(value), achieved_at
+        return Decimal(f"{value:.2f}"), achieved_at
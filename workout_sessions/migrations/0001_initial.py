@@ -0,0 +1,79 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:25
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('exercises', '0003_exercise_updated_at_and_more'),
+        ('workout_management', '0007_workoutexercise_updated_at_alter_workoutplan_tags_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkoutSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unique_id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True)),
+                ('client_id', models.UUIDField()),
+                ('started_at', models.DateTimeField()),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workout_sessions', to=settings.AUTH_USER_MODEL)),
+                ('workout_plan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='workout_management.workoutplan')),
+            ],
+            options={
+                'verbose_name_plural': 'Workout Sessions',
+            },
+        ),
+        migrations.CreateModel(
+            name='SetLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_id', models.UUIDField()),
+                ('set_number', models.PositiveIntegerField(default=1)),
+                ('repetitions', models.PositiveIntegerField(default=0)),
+                ('weight', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Load in kilograms, 0 for bodyweight sets.', max_digits=6, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))])),
+                ('duration', models.DurationField(blank=True, null=True)),
+                ('performed_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='set_logs', to='exercises.exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='set_logs', to=settings.AUTH_USER_MODEL)),
+                ('workout_exercise', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='set_logs', to='workout_management.workoutexercise')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='set_logs', to='workout_sessions.workoutsession')),
+            ],
+            options={
+                'verbose_name_plural': 'Set Logs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='workoutsession',
+            index=models.Index(fields=['user', 'started_at'], name='workout_ses_user_id_e68690_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='workoutsession',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_session_client_id'),
+        ),
+        migrations.AddIndex(
+            model_name='setlog',
+            index=models.Index(fields=['user', 'performed_at'], name='workout_ses_user_id_5f2f26_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='setlog',
+            index=models.Index(fields=['user', 'exercise', 'performed_at'], name='workout_ses_user_id_f4bf3d_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='setlog',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_set_log_client_id'),
+        ),
+    ]
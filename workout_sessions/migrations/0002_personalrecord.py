@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:28
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0003_exercise_updated_at_and_more'),
+        ('workout_sessions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonalRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_weight', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=6)),
+                ('max_weight_at', models.DateTimeField(blank=True, null=True)),
+                ('max_reps', models.PositiveIntegerField(default=0)),
+                ('max_reps_at', models.DateTimeField(blank=True, null=True)),
+                ('best_estimated_1rm', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Epley estimate, weight * (1 + reps / 30)', max_digits=7)),
+                ('best_estimated_1rm_at', models.DateTimeField(blank=True, null=True)),
+                ('best_volume', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Best single set weight * reps', max_digits=10)),
+                ('best_volume_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='personal_records', to='exercises.exercise')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='personal_records', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Personal Records',
+                'constraints': [models.UniqueConstraint(fields=('user', 'exercise'), name='unique_personal_record')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_time_zone'),
+        ('workout_management', '0008_workoutplan_sessions_per_week'),
+        ('workout_sessions', '0002_personalrecord'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStreak',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='streak', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_active_day', models.DateField(blank=True, null=True)),
+                ('current_run', models.PositiveIntegerField(default=0, help_text='Consecutive active days ending on last_active_day')),
+                ('best_run', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlanAdherence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_day', models.DateField()),
+                ('last_day', models.DateField()),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='plan_adherence', to=settings.AUTH_USER_MODEL)),
+                ('workout_plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adherence', to='workout_management.workoutplan')),
+            ],
+            options={
+                'verbose_name_plural': 'Plan Adherence',
+                'constraints': [models.UniqueConstraint(fields=('user', 'workout_plan'), name='unique_plan_adherence')],
+            },
+        ),
+    ]
@@ -0,0 +1,154 @@
+from django.db import models
+from django.core.validators import MinValueValidator
+from django.utils.translation import gettext_lazy as _
+from datetime import timedelta
+from decimal import Decimal
+import uuid
+from users.models import User
+from exercises.models import Exercise
+from workout_management.models import WorkoutPlan, WorkoutExercise
+
+
+class WorkoutSession(models.Model):
+    """
+    A workout the user actually performed, optionally following a workout plan.
+    """
+
+    unique_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, db_index=True)
+    # id generated on the device, used to deduplicate offline uploads
+    client_id = models.UUIDField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='workout_sessions')
+    workout_plan = models.ForeignKey(WorkoutPlan, on_delete=models.SET_NULL, blank=True, null=True, related_name='sessions')
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField(blank=True, null=True)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = _("Workout Sessions")
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_session_client_id'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'started_at']),
+        ]
+
+    def __str__(self):
+        return f"Workout session of user {self.user_id} at {self.started_at}"
+
+
+class SetLog(models.Model):
+    """
+    One performed set of an exercise inside a workout session.
+    """
+
+    client_id = models.UUIDField()
+    # denormalized from the session so per-user reads and dedupe need no join
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='set_logs')
+    session = models.ForeignKey(WorkoutSession, on_delete=models.CASCADE, related_name='set_logs')
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='set_logs')
+    workout_exercise = models.ForeignKey(WorkoutExercise, on_delete=models.SET_NULL, blank=True, null=True, related_name='set_logs')
+    set_number = models.PositiveIntegerField(default=1)
+    repetitions = models.PositiveIntegerField(default=0)
+    weight = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        validators=[MinValueValidator(Decimal('0.00'))],
+        help_text="Load in kilograms, 0 for bodyweight sets."
+    )
+    duration = models.DurationField(blank=True, null=True)
+    performed_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = _("Set Logs")
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_set_log_client_id'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'performed_at']),
+            models.Index(fields=['user', 'exercise', 'performed_at']),
+        ]
+
+    def __str__(self):
+        return f"Set {self.set_number} of exercise {self.exercise_id}: {self.repetitions} x {self.weight}kg"
+
+
+class PersonalRecord(models.Model):
+    """
+    Read model with the current bests of a user for one exercise.
+    Kept up to date by the ingest step, rebuilt from SetLog by `rebuild_personal_records`.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='personal_records')
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='personal_records')
+    max_weight = models.DecimalField(max_digits=6, decimal_places=2, default=Decimal('0.00'))
+    max_weight_at = models.DateTimeField(blank=True, null=True)
+    max_reps = models.PositiveIntegerField(default=0)
+    max_reps_at = models.DateTimeField(blank=True, null=True)
+    best_estimated_1rm = models.DecimalField(max_digits=7, decimal_places=2, default=Decimal('0.00'), help_text="Epley estimate, weight * (1 + reps / 30)")
+    best_estimated_1rm_at = models.DateTimeField(blank=True, null=True)
+    best_volume = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'), help_text="Best single set weight * reps")
+    best_volume_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = _("Personal Records")
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'exercise'], name='unique_personal_record'),
+        ]
+
+    def __str__(self):
+        return f"Personal record of user {self.user_id} for exercise {self.exercise_id}"
+
+
+class UserStreak(models.Model):
+    """
+    Running streak state of a user, in days of the user's time zone. Advanced in O(1) by the ingest step,
+    rebuilt from WorkoutSession by `backfill_streaks`.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='streak')
+    last_active_day = models.DateField(blank=True, null=True)
+    current_run = models.PositiveIntegerField(default=0, help_text="Consecutive active days ending on last_active_day")
+    best_run = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def current_streak(self, today):
+        """
+        The run is still alive on the day after the last active day, it breaks once that day is over.
+        """
+        if self.last_active_day is None or self.last_active_day < today - timedelta(days=1):
+            return 0
+        return self.current_run
+
+    def __str__(self):
+        return f"Streak of user {self.user_id}: {self.current_run} (best {self.best_run})"
+
+
+class PlanAdherence(models.Model):
+    """
+    Sessions a user logged with a workout plan, compared with the plan's sessions_per_week for adherence.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='plan_adherence')
+    workout_plan = models.ForeignKey(WorkoutPlan, on_delete=models.CASCADE, related_name='adherence')
+    first_day = models.DateField()
+    last_day = models.DateField()
+    sessions = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = _("Plan Adherence")
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'workout_plan'], name='unique_plan_adherence'),
+        ]
+
+    def scheduled(self, today):
+        # At least the first week, also when first_day is ahead of today (a device clock running fast)
+        weeks = max(((today - self.first_day).days // 7) + 1, 1)
+        return weeks * self.workout_plan.sessions_per_week
+
+    def __str__(self):
+        return f"User {self.user_id} on plan {self.workout_plan_id}: {self.sessions} sessions"
@@ -0,0 +1,96 @@
+from decimal import Decimal
+from django.utils import timezone
+from .models import PersonalRecord
+
+# (value field, achieved at field) pairs kept on PersonalRecord
+RECORD_FIELDS = (
+    ('max_weight', 'max_weight_at'),
+    ('max_reps', 'max_reps_at'),
+    ('best_estimated_1rm', 'best_estimated_1rm_at'),
+    ('best_volume', 'best_volume_at'),
+)
+
+TWO_PLACES = Decimal('0.01')
+
+
+def estimated_1rm(weight, repetitions):
+    """
+    Epley estimate. A single rep is the 1RM itself, a set without reps estimates nothing.
+    """
+    if repetitions <= 0:
+        return Decimal('0.00')
+    if repetitions == 1:
+        return Decimal(weight).quantize(TWO_PLACES)
+    return (Decimal(weight) * (1 + Decimal(repetitions) / 30)).quantize(TWO_PLACES)
+
+
+def set_scores(set_log):
+    return {
+        'max_weight': set_log.weight,
+        'max_reps': set_log.repetitions,
+        'best_estimated_1rm': estimated_1rm(set_log.weight, set_log.repetitions),
+        'best_volume': (Decimal(set_log.weight) * set_log.repetitions).quantize(TWO_PLACES),
+    }
+
+
+def fold_bests(set_logs):
+    """
+    Best value per record type and exercise within a batch of sets: {exercise_id: {field: (value, achieved_at)}}.
+    Ties keep the earliest set.
+    """
+    bests = {}
+    for set_log in set_logs:
+        exercise_bests = bests.setdefault(set_log.exercise_id, {})
+        for field, value in set_scores(set_log).items():
+            current = exercise_bests.get(field)
+            if current is None or value > current[0] or (value == current[0] and set_log.performed_at < current[1]):
+                exercise_bests[field] = (value, set_log.performed_at)
+    return bests
+
+
+def update_personal_records(user, set_logs):
+    """
+    Fold a batch of new sets into the user's records. Only the touched records are read
+    (locked for the rest of the transaction) and compared against, history is never rescanned.
+    Returns {exercise_id: [improved record fields]} for the records that changed.
+    """
+    bests = fold_bests(set_logs)
+    if not bests:
+        return {}
+
+    records = {
+        record.exercise_id: record
+        for record in PersonalRecord.objects.select_for_update().filter(user=user, exercise_id__in=bests.keys())
+    }
+
+    missing = [exercise_id for exercise_id in bests if exercise_id not in records]
+    if missing:
+        # Insert empty rows first and lock them, so concurrent uploads of the same user serialize on the row
+        PersonalRecord.objects.bulk_create(
+            [PersonalRecord(user=user, exercise_id=exercise_id) for exercise_id in missing],
+            ignore_conflicts=True,
+        )
+        records.update({
+            record.exercise_id: record
+            for record in PersonalRecord.objects.select_for_update().filter(user=user, exercise_id__in=missing)
+        })
+
+    now = timezone.now()
+    changed, improvements = [], {}
+    for exercise_id, exercise_bests in bests.items():
+        record = records[exercise_id]
+        for field, at_field in RECORD_FIELDS:
+            value, achieved_at = exercise_bests[field]
+            if value > getattr(record, field):
+                setattr(record, field, value)
+                setattr(record, at_field, achieved_at)
+                improvements.setdefault(exercise_id, []).append(field)
+        if exercise_id in improvements:
+            record.updated_at = now
+            changed.append(record)
+
+    if changed:
+        update_fields = [name for pair in RECORD_FIELDS for name in pair] + ['updated_at']
+        PersonalRecord.objects.bulk_update(changed, update_fields)
+
+    return improvements
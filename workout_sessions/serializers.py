@@ -0,0 +1,109 @@
+from rest_framework import serializers
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from .models import PersonalRecord, PlanAdherence
+
+# How far ahead of the server clock a device may be before its timestamps are rejected
+CLOCK_SKEW = timedelta(minutes=10)
+
+# Beyond any real set. Also keeps the derived personal records (Epley 1RM, weight x reps) within
+# their columns: 1000 kg x (1 + 1000 / 30) fits best_estimated_1rm's 7 digits.
+MAX_REPETITIONS = 1000
+MAX_WEIGHT = Decimal('1000')
+
+
+def validate_not_future(value):
+    if value > timezone.now() + CLOCK_SKEW:
+        raise serializers.ValidationError("Cannot be in the future.")
+    return value
+
+
+class SessionIngestSerializer(serializers.Serializer):
+    """
+    A workout session as uploaded by a device. References are resolved in bulk by the ingest step.
+    """
+    client_id = serializers.UUIDField()
+    workout_plan = serializers.UUIDField(required=False, allow_null=True, help_text="unique_id of the workout plan")
+    started_at = serializers.DateTimeField()
+    ended_at = serializers.DateTimeField(required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate_started_at(self, value):
+        return validate_not_future(value)
+
+    def validate(self, attrs):
+        ended_at = attrs.get('ended_at')
+        if ended_at and ended_at < attrs['started_at']:
+            raise serializers.ValidationError({"ended_at": "End time must be after the start time."})
+        return attrs
+
+
+class SetIngestSerializer(serializers.Serializer):
+    """
+    A logged set as uploaded by a device. `session` is the client_id of its session.
+    """
+    client_id = serializers.UUIDField()
+    session = serializers.UUIDField(help_text="client_id of the workout session")
+    exercise = serializers.UUIDField(help_text="unique_id of the exercise")
+    workout_exercise = serializers.IntegerField(required=False, allow_null=True, min_value=1)
+    set_number = serializers.IntegerField(min_value=1, default=1)
+    repetitions = serializers.IntegerField(min_value=0, max_value=MAX_REPETITIONS, default=0)
+    weight = serializers.DecimalField(
+        max_digits=6, decimal_places=2, min_value=Decimal('0'), max_value=MAX_WEIGHT, default=Decimal('0'),
+    )
+    duration = serializers.DurationField(required=False, allow_null=True)
+    performed_at = serializers.DateTimeField()
+
+    def validate_performed_at(self, value):
+        return validate_not_future(value)
+
+
+class IngestBatchSerializer(serializers.Serializer):
+    sessions = serializers.ListField(child=serializers.DictField(), required=False, default=list, max_length=200)
+    sets = serializers.ListField(child=serializers.DictField(), required=False, default=list, max_length=2000)
+
+    def validate(self, attrs):
+        if not attrs['sessions'] and not attrs['sets']:
+            raise serializers.ValidationError("No sessions or sets provided.")
+        return attrs
+
+
+class PersonalRecordSerializer(serializers.ModelSerializer):
+    exercise = serializers.SlugRelatedField(read_only=True, slug_field='unique_id')
+    exercise_name = serializers.CharField(source='exercise.name', read_only=True)
+
+    class Meta:
+        model = PersonalRecord
+        fields = (
+            'exercise', 'exercise_name',
+            'max_weight', 'max_weight_at',
+            'max_reps', 'max_reps_at',
+            'best_estimated_1rm', 'best_estimated_1rm_at',
+            'best_volume', 'best_volume_at',
+            'updated_at',
+        )
+
+
+class PlanAdherenceSerializer(serializers.ModelSerializer):
+    workout_plan = serializers.SlugRelatedField(read_only=True, slug_field='unique_id')
+    title = serializers.CharField(source='workout_plan.title', read_only=True)
+    sessions_per_week = serializers.IntegerField(source='workout_plan.sessions_per_week', read_only=True)
+    scheduled = serializers.SerializerMethodField()
+    adherence = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PlanAdherence
+        fields = ('workout_plan', 'title', 'sessions_per_week', 'first_day', 'last_day', 'sessions', 'scheduled', 'adherence')
+
+    def get_scheduled(self, obj):
+        return obj.scheduled(self.context['today'])
+
+    def get_adherence(self, obj):
+        """
+        Share of the scheduled sessions done since the plan was first used, capped at 100%.
+        """
+        scheduled = self.get_scheduled(obj)
+        if scheduled <= 0:
+            return None
+        return round(min(obj.sessions / scheduled, 1.0) * 100, 2)
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from exercises.models import Exercise
+from .models import SetLog
+from .records import update_personal_records
+from .streaks import update_streak, update_adherence
+from .training_load import cache_key as training_load_cache_key, invalidate_exercises as invalidate_training_load
+
+# Sent inside the ingest transaction with the newly written rows only (duplicates are left out).
+# Receivers get `user`, `sessions` (list of WorkoutSession) and `set_logs` (list of SetLog).
+workout_data_ingested = Signal()
+
+# Sent inside the ingest transaction when records improved, with `user` and
+# `improvements` ({exercise_id: [improved record fields]}).
+personal_records_improved = Signal()
+
+
+@receiver(workout_data_ingested)
+def update_personal_records_on_ingest(sender, user, set_logs, **kwargs):
+    """
+    Keep the personal records read model in step with the log, in the same transaction.
+    """
+    improvements = update_personal_records(user, set_logs)
+    if improvements:
+        personal_records_improved.send(sender=sender, user=user, improvements=improvements)
+
+
+@receiver(workout_data_ingested)
+def update_streak_on_ingest(sender, user, sessions, **kwargs):
+    """
+    Advance the streak and plan adherence state, in the same transaction.
+    """
+    if sessions:
+        update_streak(user, sessions)
+        update_adherence(user, sessions)
+
+
+@receiver(post_delete, sender=SetLog)
+def invalidate_training_load_on_set_delete(sender, instance, **kwargs):
+    """
+    The cached training load only ever grows, drop it so the next read rebuilds it without the set.
+    """
+    transaction.on_commit(lambda: cache.delete(training_load_cache_key(instance.user_id)))
+
+
+@receiver(post_save, sender=Exercise)
+def invalidate_training_load_on_muscle_group_change(sender, instance, created, **kwargs):
+    """
+    The cached training load is grouped by the exercises' muscle group at the time the sets were
+    cached, drop it for every user who logged the exercise. Imports update exercises without
+    signals and do the same (exercises.importers).
+    """
+    loaded = getattr(instance, 'loaded_muscle_group', None)
+    if created or loaded is None or loaded == instance.muscle_group:
+        return
+    instance.loaded_muscle_group = instance.muscle_group
+    transaction.on_commit(lambda: invalidate_training_load([instance.id]))
@@ -0,0 +1,225 @@
+from collections import defaultdict
+from datetime import date, timedelta
+import numpy as np
+from django.db.models import Count, Min, Max, Exists, OuterRef
+from django.utils import timezone
+from users.models import User
+from .models import WorkoutSession, UserStreak, PlanAdherence
+
+BACKFILL_CHUNK_SIZE = 50000
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def local_today(user):
+    return timezone.now().astimezone(user.zone_info).date()
+
+
+def _lock_or_create(model, user, **lookup):
+    """
+    Lock the row, creating it first when missing, so concurrent uploads of the same user serialize on it.
+    """
+    row = model.objects.select_for_update().filter(user=user, **lookup).first()
+    if row is None:
+        model.objects.bulk_create([model(user=user, **lookup)], ignore_conflicts=True)
+        row = model.objects.select_for_update().get(user=user, **lookup)
+    return row
+
+
+def advance(state, days):
+    """
+    Fold sorted, distinct active days that are not older than the last active day into the state.
+    """
+    for day in days:
+        if state.last_active_day is not None and day <= state.last_active_day:
+            continue
+        if state.last_active_day is not None and day == state.last_active_day + timedelta(days=1):
+            state.current_run += 1
+        else:
+            state.current_run = 1
+        state.last_active_day = day
+        state.best_run = max(state.best_run, state.current_run)
+
+
+def update_streak(user, sessions):
+    """
+    Advance the user's streak with newly ingested sessions. A constant number of queries per upload,
+    except when a device uploads a session older than the last active day: the run then has
+    to be recounted from that user's history.
+    """
+    zone = user.zone_info
+    days = sorted({session.started_at.astimezone(zone).date() for session in sessions})
+    if not days:
+        return None
+
+    state = _lock_or_create(UserStreak, user)
+
+    if state.last_active_day is not None and days[0] < state.last_active_day:
+        rebuild_streaks(user_ids=[user.id])
+        return UserStreak.objects.get(user=user)
+
+    advance(state, days)
+    state.save(update_fields=['last_active_day', 'current_run', 'best_run', 'updated_at'])
+    return state
+
+
+def update_adherence(user, sessions):
+    """
+    Count the new sessions against the plans they were logged with.
+    """
+    zone = user.zone_info
+    by_plan = defaultdict(list)
+    for session in sessions:
+        if session.workout_plan_id:
+            by_plan[session.workout_plan_id].append(session.started_at.astimezone(zone).date())
+    if not by_plan:
+        return
+
+    PlanAdherence.objects.bulk_create(
+        [PlanAdherence(user=user, workout_plan_id=plan_id, first_day=min(days), last_day=max(days)) for plan_id, days in by_plan.items()],
+        ignore_conflicts=True,
+    )
+    rows = list(PlanAdherence.objects.select_for_update().filter(user=user, workout_plan_id__in=by_plan.keys()))
+    for row in rows:
+        days = by_plan[row.workout_plan_id]
+        row.sessions += len(days)
+        row.first_day = min(row.first_day, min(days))
+        row.last_day = max(row.last_day, max(days))
+        row.updated_at = timezone.now()
+    PlanAdherence.objects.bulk_update(rows, ['sessions', 'first_day', 'last_day', 'updated_at'])
+
+
+def day_ordinals(started_at, zone):
+    """
+    Calendar day ordinals of UTC datetimes in `zone`. Fixed-offset UTC is pure integer math, other zones
+    need the per-row UTC offset because of daylight saving time.
+    """
+    seconds = np.fromiter((moment.timestamp() for moment in started_at), dtype=np.float64, count=len(started_at))
+    if zone.key != 'UTC':
+        seconds += np.fromiter(
+            (moment.astimezone(zone).utcoffset().total_seconds() for moment in started_at), dtype=np.float64, count=len(started_at)
+        )
+    return (np.floor(seconds / 86400).astype(np.int64)) + EPOCH_ORDINAL
+
+
+def compute_runs(user_ids, days):
+    """
+    Vectorized streak state for many users at once from parallel (user id, day ordinal) arrays,
+    unsorted and with duplicates. Returns {user_id: (last_active_day, current_run, best_run)}.
+    """
+    if len(user_ids) == 0:
+        return {}
+
+    order = np.lexsort((days, user_ids))
+    user_ids, days = user_ids[order], days[order]
+    keep = np.ones(len(days), dtype=bool)
+    keep[1:] = (user_ids[1:] != user_ids[:-1]) | (days[1:] != days[:-1])
+    user_ids, days = user_ids[keep], days[keep]
+
+    # A run starts at every new user and after every gap
+    starts = np.ones(len(days), dtype=bool)
+    starts[1:] = (user_ids[1:] != user_ids[:-1]) | (days[1:] - days[:-1] != 1)
+    run_ids = np.cumsum(starts) - 1
+    run_lengths = np.bincount(run_ids)
+    run_users = user_ids[starts]
+
+    users, first_run = np.unique(run_users, return_index=True)
+    last_run = np.append(first_run[1:], len(run_users)) - 1
+    best = np.maximum.reduceat(run_lengths, first_run)
+
+    last_of_user = np.append(np.flatnonzero(user_ids[1:] != user_ids[:-1]), len(user_ids) - 1)
+    last_days = days[last_of_user]
+
+    return {
+        int(user_id): (date.fromordinal(int(last_day)), int(run_lengths[run]), int(best_run))
+        for user_id, last_day, run, best_run in zip(users, last_days, last_run, best)
+    }
+
+
+def rebuild_streaks(user_ids=None):
+    """
+    Recompute streak state from WorkoutSession, for the given users or everyone.
+    Sessions are read in chunks of whole users, days and runs are computed with NumPy.
+    Returns the number of users written.
+    """
+    users = User.objects.all() if user_ids is None else User.objects.filter(id__in=user_ids)
+    zones = {user.id: user.zone_info for user in users.only('id', 'time_zone').iterator()}
+
+    sessions = WorkoutSession.objects.order_by('user_id', 'id').values_list('user_id', 'started_at')
+    if user_ids is not None:
+        sessions = sessions.filter(user_id__in=user_ids)
+
+    written = set()
+
+    def flush(rows):
+        by_zone = defaultdict(list)
+        for user_id, started_at in rows:
+            by_zone[zones[user_id]].append((user_id, started_at))
+        chunk_users, chunk_days = [], []
+        for zone, zone_rows in by_zone.items():
+            ids, moments = zip(*zone_rows)
+            chunk_users.append(np.array(ids, dtype=np.int64))
+            chunk_days.append(day_ordinals(moments, zone))
+        runs = compute_runs(np.concatenate(chunk_users), np.concatenate(chunk_days))
+        UserStreak.objects.bulk_create(
+            [
+                UserStreak(user_id=user_id, last_active_day=last_day, current_run=current_run, best_run=best_run)
+                for user_id, (last_day, current_run, best_run) in runs.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['last_active_day', 'current_run', 'best_run', 'updated_at'],
+        )
+        written.update(runs)
+
+    rows = []
+    for row in sessions.iterator(chunk_size=BACKFILL_CHUNK_SIZE):
+        # Only cut between users, a user's history must land in one chunk
+        if len(rows) >= BACKFILL_CHUNK_SIZE and row[0] != rows[-1][0]:
+            flush(rows)
+            rows = []
+        rows.append(row)
+    if rows:
+        flush(rows)
+
+    # Users left without sessions have no streak
+    stale = UserStreak.objects.filter(~Exists(WorkoutSession.objects.filter(user_id=OuterRef('user_id'))))
+    if user_ids is not None:
+        stale = stale.filter(user_id__in=user_ids)
+    stale.delete()
+    return len(written)
+
+
+def rebuild_adherence(user_ids=None):
+    """
+    Recompute plan adherence with one grouped query per run.
+    """
+    sessions = WorkoutSession.objects.filter(workout_plan__isnull=False)
+    if user_ids is not None:
+        sessions = sessions.filter(user_id__in=user_ids)
+    rows = list(
+        sessions.values('user_id', 'workout_plan_id')
+        .annotate(sessions=Count('id'), first_at=Min('started_at'), last_at=Max('started_at'))
+    )
+
+    zones = {
+        user.id: user.zone_info
+        for user in User.objects.filter(id__in={row['user_id'] for row in rows}).only('id', 'time_zone')
+    }
+    PlanAdherence.objects.bulk_create(
+        [
+            PlanAdherence(
+                user_id=row['user_id'],
+                workout_plan_id=row['workout_plan_id'],
+                sessions=row['sessions'],
+                first_day=row['first_at'].astimezone(zones[row['user_id']]).date(),
+                last_day=row['last_at'].astimezone(zones[row['user_id']]).date(),
+            )
+            for row in rows
+        ],
+        update_conflicts=True,
+        unique_fields=['user', 'workout_plan'],
+        update_fields=['sessions', 'first_day', 'last_day', 'updated_at'],
+        batch_size=BACKFILL_CHUNK_SIZE,
+    )
+    return len(rows)
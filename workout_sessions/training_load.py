@@ -0,0 +1,188 @@
+from datetime import date, timedelta
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from .models import SetLog
+from .streaks import local_today
+
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+# Sets younger than this are read on every request instead of being cached, like in
+# analytics.aggregation: an ingest transaction that took a lower id but commits late would
+# otherwise fall behind last_id and be missed until the cache expires
+SETTLE_DELAY = timedelta(minutes=2)
+
+
+def cache_key(user_id):
+    return f"training_load_user_{user_id}"
+
+
+def invalidate_exercises(exercise_ids):
+    """
+    Drop the cached training load of every user who logged one of `exercise_ids`. The cache is
+    grouped by the exercises' muscle group at the time the sets were cached.
+    """
+    user_ids = SetLog.objects.filter(exercise_id__in=exercise_ids).values_list('user_id', flat=True).distinct()
+    cache.delete_many([cache_key(user_id) for user_id in user_ids])
+
+
+def _empty_state(user):
+    return {'time_zone': user.time_zone, 'last_id': 0, 'first_day': None, 'muscle_groups': [], 'daily': None}
+
+
+def _to_arrays(rows, zone):
+    """
+    Set rows as parallel arrays: (last id, day ordinals in `zone`, volumes, muscle groups).
+    """
+    ids, performed_at, repetitions, weights, muscle_groups = zip(*rows)
+    days = np.fromiter((value.astimezone(zone).date().toordinal() for value in performed_at), dtype=np.int64, count=len(rows))
+    # One SetLog row is one set, so sets x reps x load is reps x load here
+    volumes = np.fromiter(repetitions, dtype=np.float64, count=len(rows)) * np.array(weights, dtype=np.float64)
+    groups = np.array([(group or 'other').strip().lower() for group in muscle_groups])
+    return max(ids), days, volumes, groups
+
+
+def _load_sets(user, after_id, settled):
+    """
+    (settled, recent) sets of the user, as arrays or None: settled ones not cached yet (id > after_id)
+    and all the ones created after `settled`. One query.
+    """
+    rows = list(
+        SetLog.objects.filter(Q(id__gt=after_id, created_at__lt=settled) | Q(created_at__gte=settled), user_id=user.id)
+        .values_list('id', 'performed_at', 'repetitions', 'weight', 'exercise__muscle_group', 'created_at')
+    )
+    settled_rows = [row[:5] for row in rows if row[5] < settled]
+    recent_rows = [row[:5] for row in rows if row[5] >= settled]
+    zone = user.zone_info
+    return (
+        _to_arrays(settled_rows, zone) if settled_rows else None,
+        _to_arrays(recent_rows, zone) if recent_rows else None,
+    )
+
+
+def _extend(state, loaded):
+    last_id, days, volumes, groups = loaded
+
+    muscle_groups = list(state['muscle_groups'])
+    known = {group: index for index, group in enumerate(muscle_groups)}
+    for group in np.unique(groups):
+        if group not in known:
+            known[group] = len(muscle_groups)
+            muscle_groups.append(str(group))
+    group_index = np.array([known[group] for group in groups], dtype=np.int64)
+
+    daily = state['daily']
+    first_day = state['first_day']
+    if daily is None:
+        first_day = int(days.min())
+        daily = np.zeros((0, 0), dtype=np.float64)
+
+    # Grow the matrix to cover late arriving (older) sets, new days and new muscle groups
+    new_first = min(first_day, int(days.min()))
+    new_last = max(first_day + daily.shape[0] - 1, int(days.max()))
+    grown = np.zeros((new_last - new_first + 1, len(muscle_groups)), dtype=np.float64)
+    offset = first_day - new_first
+    grown[offset:offset + daily.shape[0], :daily.shape[1]] = daily
+
+    np.add.at(grown, (days - new_first, group_index), volumes)
+
+    return {
+        'time_zone': state['time_zone'], 'last_id': max(state['last_id'], last_id),
+        'first_day': new_first, 'muscle_groups': muscle_groups, 'daily': grown,
+    }
+
+
+def get_daily_volume(user):
+    """
+    (first_day, muscle_groups, daily matrix) for the user, rows are days of the user's time zone
+    and columns muscle groups.
+
+    The cached matrix is only extended with the settled sets logged since it was cached, so a read
+    costs one indexed query on top of the cache hit; sets younger than SETTLE_DELAY are added on
+    every read without being cached. Deleted sets and muscle group edits drop the cache (see
+    signals), a time zone change rebuilds it.
+    """
+    key = cache_key(user.id)
+    state = cache.get(key)
+    if state is None or state.get('time_zone') != user.time_zone:
+        state = _empty_state(user)
+
+    settled, recent = _load_sets(user, state['last_id'], timezone.now() - SETTLE_DELAY)
+    if settled is not None:
+        state = _extend(state, settled)
+        cache.set(key, state, timeout=CACHE_TIMEOUT)
+    if recent is not None:
+        state = _extend(state, recent)
+
+    return state['first_day'], state['muscle_groups'], state['daily']
+
+
+def _rolling_sum(values, window):
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    sums = cumulative[window:] - cumulative[:-window]
+    # The first window - 1 days only see a partial window
+    head = cumulative[1:window]
+    return np.concatenate((head, sums))[:len(values)]
+
+
+def training_load(user, days=90, today=None):
+    """
+    Daily volume per muscle group, acute:chronic workload ratio, monotony and strain
+    for the last `days` days ending today.
+
+    - ACWR: 7 day load / (28 day load / 4), None while the chronic load is 0.
+    - Monotony: mean / standard deviation of the daily load over the last 7 days.
+    - Strain: 7 day load x monotony.
+    """
+    today = today or local_today(user)
+    first_day, muscle_groups, daily = get_daily_volume(user)
+
+    end = today.toordinal()
+    # Enough history before the requested window to fill the 28 day chronic window
+    start = end - days + 1
+    history_start = start - CHRONIC_DAYS + 1
+
+    window = np.zeros((end - history_start + 1, len(muscle_groups)), dtype=np.float64)
+    if daily is not None:
+        source_start = max(first_day, history_start)
+        source_end = min(first_day + daily.shape[0] - 1, end)
+        if source_start <= source_end:
+            window[source_start - history_start:source_end - history_start + 1] = \
+                daily[source_start - first_day:source_end - first_day + 1]
+
+    total = window.sum(axis=1)
+
+    acute = _rolling_sum(total, ACUTE_DAYS)
+    chronic = _rolling_sum(total, CHRONIC_DAYS) / (CHRONIC_DAYS / ACUTE_DAYS)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        acwr = np.where(chronic > 0, acute / chronic, np.nan)
+
+    mean = _rolling_sum(total, ACUTE_DAYS) / ACUTE_DAYS
+    mean_of_squares = _rolling_sum(total ** 2, ACUTE_DAYS) / ACUTE_DAYS
+    std = np.sqrt(np.maximum(mean_of_squares - mean ** 2, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        monotony = np.where(std > 0, mean / std, np.nan)
+    strain = acute * monotony
+
+    visible = slice(CHRONIC_DAYS - 1, None)
+
+    def as_list(values):
+        values = np.round(values[visible], 2)
+        return [None if np.isnan(value) else float(value) for value in values]
+
+    return {
+        "days": [(date.fromordinal(start) + timedelta(days=offset)).isoformat() for offset in range(days)],
+        "daily_volume": {
+            "total": as_list(total),
+            "by_muscle_group": {group: as_list(window[:, index]) for index, group in enumerate(muscle_groups)},
+        },
+        "acute_load": as_list(acute),
+        "chronic_load": as_list(chronic),
+        "acwr": as_list(acwr),
+        "monotony": as_list(monotony),
+        "strain": as_list(strain),
+    }
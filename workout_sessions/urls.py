@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import IngestWorkoutDataView, TrainingLoadView
+
+urlpatterns = [
+    path('ingest/', IngestWorkoutDataView.as_view(), name='workout_sessions_ingest'),
+    path('training_load/', TrainingLoadView.as_view(), name='training_load'),
+]
@@ -0,0 +1,90 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from .serializers import IngestBatchSerializer, PersonalRecordSerializer, PlanAdherenceSerializer
+from .models import PersonalRecord, UserStreak, PlanAdherence
+from .streaks import local_today
+from .training_load import training_load
+from .ingest import ingest_batch
+
+
+class IngestWorkoutDataView(APIView):
+    """
+    Batch upload of performed workout sessions and sets, meant for offline sync from watches and phones.
+    Rows are deduplicated by their client generated ids, so a device can resend a batch safely.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = IngestBatchSerializer
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        result = ingest_batch(
+            request.user,
+            serializer.validated_data['sessions'],
+            serializer.validated_data['sets'],
+        )
+
+        has_errors = result['errors']['sessions'] or result['errors']['sets']
+        written = result['sessions']['created'] or result['sets']['created']
+        if has_errors and not written:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED if written else status.HTTP_200_OK)
+
+
+class PersonalRecordListView(APIView):
+    """
+    Personal bests of the current user for every exercise they have logged.
+    Served from the PersonalRecord read model with a single indexed query.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = PersonalRecordSerializer
+
+    def get(self, request):
+        records = PersonalRecord.objects.filter(user=request.user).select_related('exercise').order_by('exercise__name')
+        return Response(self.serializer_class(records, many=True).data, status=status.HTTP_200_OK)
+
+
+class TrainingLoadView(APIView):
+    """
+    Training load dashboard data for the current user.
+
+    Query params:
+    - days: length of the window ending today (default 90, max 730).
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def get(self, request):
+        try:
+            days = min(max(int(request.query_params.get('days', 90)), 1), 730)
+        except ValueError:
+            return Response({"detail": "days must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(training_load(request.user, days=days), status=status.HTTP_200_OK)
+
+
+class StreakView(APIView):
+    """
+    Current and longest streak of the current user, in days of their time zone, and adherence
+    to every plan they trained with. Read from the streak and adherence state, history is never scanned.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = PlanAdherenceSerializer
+
+    def get(self, request):
+        today = local_today(request.user)
+        state = UserStreak.objects.filter(user=request.user).first()
+        plans = PlanAdherence.objects.filter(user=request.user).select_related('workout_plan').order_by('-last_day')
+
+        return Response({
+            "time_zone": request.user.time_zone,
+            "today": today,
+            "current_streak": state.current_streak(today) if state else 0,
+            "best_streak": state.best_run if state else 0,
+            "last_active_day": state.last_active_day if state else None,
+            "plans": self.serializer_class(plans, many=True, context={"today": today}).data,
+        }, status=status.HTTP_200_OK)